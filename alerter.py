@@ -16,6 +16,8 @@ from datetime import datetime
 import logging
 from dotenv import load_dotenv
 
+from backend.lexicon import normalize_crop as normalize_crop_name
+
 # Load environment from .env if present
 load_dotenv()
 
@@ -138,25 +140,6 @@ CROP_ACTIVITIES = {
     },
 }
 
-def normalize_crop_name(crop: str) -> str:
-    """Normalize user-provided crop names to canonical keys."""
-    c = (crop or "").strip().lower()
-    mapping = {
-        "wheat": "wheat", "गेहूं": "wheat", "गेहुँ": "wheat", "गेहूँ": "wheat",
-        "rice": "rice", "paddy": "rice", "धान": "rice", "चावल": "rice",
-        "sugarcane": "sugarcane", "गन्ना": "sugarcane",
-        "cotton": "cotton", "कपास": "cotton",
-        "maize": "maize", "corn": "maize", "मक्का": "maize",
-        "soybean": "soybean", "सोयाबीन": "soybean",
-        "mustard": "mustard", "सरसों": "mustard",
-        "onion": "onion", "प्याज": "onion",
-        "potato": "potato", "आलू": "potato",
-        "tomato": "tomato", "टमाटर": "tomato",
-        "ragi": "ragi", "finger millet": "ragi", "mandua": "ragi", "nachni": "ragi",
-        "millet": "millet", "millets": "millet", "bajra": "millet", "pearl millet": "millet",
-    }
-    return mapping.get(c, c)
-
 def analyze_crop_alerts(user_crop):
     """Analyze crop for alerts based on current month"""
     if not user_crop:
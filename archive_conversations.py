@@ -0,0 +1,76 @@
+"""
+Archive idle conversations into compressed blobs and report the space saved.
+
+Conversations whose last message is older than --days are moved from the
+`conversations` table into `conversation_archive` (one zstd- or zlib-compressed
+JSON blob per conversation). The API keeps serving them transparently; only
+full-text search no longer covers archived messages.
+
+Usage:
+    python archive_conversations.py [--days 180] [--dry-run] [--vacuum]
+
+--vacuum rebuilds documents.db afterwards so freed pages are returned to the
+filesystem (needs exclusive access; run it while the server is stopped).
+"""
+
+import argparse
+import os
+import sys
+
+from dotenv import load_dotenv
+
+sys.path.append(os.getcwd())
+load_dotenv()
+
+from backend import database
+from backend.migrations import migrate
+
+
+def db_size_bytes() -> int:
+    paths = [str(database.DB_PATH), f"{database.DB_PATH}-wal"]
+    return sum(os.path.getsize(p) for p in paths if os.path.exists(p))
+
+
+def mb(n: int) -> str:
+    return f"{n / (1024 * 1024):.2f} MB"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=database.ARCHIVE_AFTER_DAYS)
+    parser.add_argument("--dry-run", action="store_true", help="only report what would be archived")
+    parser.add_argument("--vacuum", action="store_true", help="VACUUM the database after archiving")
+    args = parser.parse_args()
+
+    migrate()
+    size_before = db_size_bytes()
+    report = database.archive_conversations(args.days, dry_run=args.dry_run)
+    ratio = report["raw_bytes"] / report["compressed_bytes"] if report["compressed_bytes"] else 0.0
+
+    action = "Would archive" if args.dry_run else "Archived"
+    print(f"{action} {report['conversations']} conversations ({report['messages']} messages) idle > {args.days} days")
+    print(f"  codec:        {report['codec']}")
+    print(f"  raw:          {mb(report['raw_bytes'])}")
+    print(f"  compressed:   {mb(report['compressed_bytes'])} ({ratio:.1f}x)")
+    print(f"  saved:        {mb(report['bytes_saved'])}")
+
+    if args.vacuum and not args.dry_run:
+        with database.get_db_connection() as conn:
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        database.close_db_connections()
+        with database.get_db_connection() as conn:
+            conn.isolation_level = None
+            conn.execute("VACUUM")
+            # In WAL mode VACUUM writes through the log; fold it back into the main file
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        print(f"  db file:      {mb(size_before)} -> {mb(db_size_bytes())}")
+
+    totals = database.archive_stats()
+    print(
+        f"Archive total: {totals['conversations']} conversations, {totals['messages']} messages, "
+        f"{mb(totals['compressed_bytes'])} stored, {mb(totals['bytes_saved'])} saved"
+    )
+
+
+if __name__ == "__main__":
+    main()
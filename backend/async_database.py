@@ -0,0 +1,368 @@
+"""Async counterpart of ``backend/database.py`` for FastAPI handlers.
+
+The functions mirror the synchronous API (same names, arguments and return
+values) but run on a small pool of aiosqlite connections, so awaiting a query
+never blocks the event loop.  SQL, PRAGMAs, cursor helpers and the user
+lookup cache are shared with ``database.py``; schema creation stays there, and
+the synchronous functions remain the API for scripts such as ``alerter.py``
+and for worker threads (e.g. the conversation writer).
+
+Usage::
+
+    from . import async_database
+    user = await async_database.fetch_user_by_id(user_id)
+"""
+
+import asyncio
+import os
+import sqlite3
+import time
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import aiosqlite
+
+from .database import (
+    DB_PATH,
+    SQLITE_BUSY_TIMEOUT_MS,
+    SQLITE_CACHED_STATEMENTS,
+    ConversationRow,
+    _GAZETTEER_SQL,
+    _INSERT_CONVERSATION_SQL,
+    _INSERT_USER_SQL,
+    _LATEST_MANDI_PRICE_SQL,
+    _LATEST_STORED_MANDI_PRICE_SQL,
+    _MANDI_DISTRICTS_SQL,
+    _MISSING,
+    _REFRESH_SUMMARY_TITLE_SQL,
+    _RENAME_FIRST_QUESTION_SQL,
+    _UPSERT_MANDI_PRICE_SQL,
+    _UPSERT_SUMMARY_SQL,
+    _USER_AUTH_COLUMNS,
+    _USER_COLUMNS,
+    _PAGE_FIELDS,
+    _conversation_page_query,
+    _conversation_params,
+    _decode_archive,
+    _latest_mandi_dates_query,
+    _mandi_history_query,
+    _merge_messages,
+    _normalize_phone_number,
+    _page_messages,
+    _renamed_archive,
+    _search_query,
+    _split_page,
+    _summaries_page_query,
+    _users_by_id,
+    _users_by_phone,
+    connection_pragmas,
+    fts_available,
+    invalidate_user_cache,
+)
+
+ASYNC_DB_POOL_SIZE = int(os.getenv("ASYNC_DB_POOL_SIZE", "4"))
+
+_pool: Optional["asyncio.Queue[aiosqlite.Connection]"] = None
+_connections: List[aiosqlite.Connection] = []
+_pool_lock: Optional[asyncio.Lock] = None
+
+
+async def _open_connection() -> aiosqlite.Connection:
+    connection = await aiosqlite.connect(
+        str(DB_PATH),
+        timeout=SQLITE_BUSY_TIMEOUT_MS / 1000,
+        cached_statements=SQLITE_CACHED_STATEMENTS,
+    )
+    connection.row_factory = sqlite3.Row
+    for pragma in connection_pragmas():
+        await connection.execute(pragma)
+    return connection
+
+
+async def _get_pool() -> "asyncio.Queue[aiosqlite.Connection]":
+    # Opened lazily on the serving event loop so importing the module does no I/O
+    global _pool, _pool_lock
+    if _pool is not None:
+        return _pool
+    if _pool_lock is None:
+        _pool_lock = asyncio.Lock()
+    async with _pool_lock:
+        if _pool is None:
+            pool: "asyncio.Queue[aiosqlite.Connection]" = asyncio.Queue()
+            for _ in range(ASYNC_DB_POOL_SIZE):
+                connection = await _open_connection()
+                _connections.append(connection)
+                pool.put_nowait(connection)
+            _pool = pool
+    return _pool
+
+
+@asynccontextmanager
+async def get_db_connection() -> AsyncIterator[aiosqlite.Connection]:
+    """Borrow a pooled connection; the transaction is rolled back if the block raises."""
+    pool = await _get_pool()
+    connection = await pool.get()
+    try:
+        yield connection
+    except BaseException:
+        await connection.rollback()
+        raise
+    finally:
+        pool.put_nowait(connection)
+
+
+async def close_db_connections() -> None:
+    """Close the pool (called on application shutdown)."""
+    global _pool, _pool_lock
+    connections = list(_connections)
+    _connections.clear()
+    _pool = None
+    _pool_lock = None
+    for connection in connections:
+        try:
+            await connection.close()
+        except sqlite3.Error as e:
+            print(f"[AsyncDatabase] close failed: {e}")
+
+
+async def _fetch_all(sql: str, params: Any = ()) -> List[Dict[str, Any]]:
+    async with get_db_connection() as conn:
+        async with conn.execute(sql, params) as cursor:
+            return [dict(row) for row in await cursor.fetchall()]
+
+
+async def _fetch_one(sql: str, params: Any = ()) -> Optional[Dict[str, Any]]:
+    async with get_db_connection() as conn:
+        async with conn.execute(sql, params) as cursor:
+            row = await cursor.fetchone()
+            return dict(row) if row else None
+
+
+async def _load_archived(where: str, params: tuple) -> List[Dict[str, Any]]:
+    rows = await _fetch_all(f"SELECT codec, payload FROM conversation_archive WHERE {where}", params)
+    return [message for row in rows for message in _decode_archive(row)]
+
+
+# --- Conversations ---------------------------------------------------------
+
+
+async def insert_conversation(user_id: str, question: str, answer: Optional[str], conversation_id: Optional[str] = None, title: Optional[str] = None):
+    await insert_conversations([(user_id, question, answer, conversation_id, title, datetime.now())])
+
+
+async def insert_conversations(rows: List[ConversationRow]) -> None:
+    """Insert several conversation rows (and their summary updates) in one transaction."""
+    if not rows:
+        return
+    messages, summaries = _conversation_params(rows)
+    async with get_db_connection() as conn:
+        await conn.executemany(_INSERT_CONVERSATION_SQL, messages)
+        await conn.executemany(_UPSERT_SUMMARY_SQL, summaries)
+        await conn.commit()
+
+
+async def fetch_conversations(user_id: str) -> List[Dict[str, Any]]:
+    rows = await _fetch_all(
+        "SELECT question, answer, timestamp FROM conversations WHERE user_id = ? ORDER BY timestamp",
+        (user_id,),
+    )
+    archived = await _load_archived("user_id = ?", (user_id,))
+    if not archived:
+        return rows
+    return _merge_messages(archived, rows, ["question", "answer", "timestamp"])
+
+
+async def fetch_user_conversation_summaries(user_id: str) -> List[Dict[str, Any]]:
+    """Return list of {conversation_id, title, first_timestamp} for a user."""
+    return await _fetch_all(
+        "SELECT conversation_id, title, first_timestamp FROM conversation_summaries "
+        "WHERE user_id = ? ORDER BY first_timestamp DESC",
+        (user_id,),
+    )
+
+
+async def fetch_conversation_by_id(conversation_id: str) -> List[Dict[str, Any]]:
+    rows = await _fetch_all(
+        "SELECT user_id, question, answer, timestamp FROM conversations WHERE conversation_id = ? ORDER BY timestamp",
+        (conversation_id,),
+    )
+    archived = await _load_archived("conversation_id = ?", (conversation_id,))
+    if not archived:
+        return rows
+    return _merge_messages(archived, rows, ["user_id", "question", "answer", "timestamp"])
+
+
+async def fetch_user_conversation_summaries_page(
+    user_id: str,
+    limit: int,
+    cursor: Optional[str] = None,
+    since: Optional[str] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """See ``database.fetch_user_conversation_summaries_page``."""
+    sql, params, order_field = _summaries_page_query(user_id, limit, cursor, since)
+    rows = await _fetch_all(sql, params)
+    return _split_page(rows, limit, order_field, "conversation_id")
+
+
+async def fetch_conversation_page(
+    conversation_id: str,
+    limit: int,
+    cursor: Optional[str] = None,
+    since: Optional[str] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """See ``database.fetch_conversation_page``."""
+    archived = await _load_archived("conversation_id = ?", (conversation_id,))
+    if archived:
+        live = await _fetch_all(
+            "SELECT id, user_id, question, answer, timestamp FROM conversations WHERE conversation_id = ?",
+            (conversation_id,),
+        )
+        return _page_messages(_merge_messages(archived, live, _PAGE_FIELDS), limit, cursor, since)
+    sql, params = _conversation_page_query(conversation_id, limit, cursor, since)
+    rows = await _fetch_all(sql, params)
+    return _split_page(rows, limit, "timestamp", "id")
+
+
+async def search_conversations(user_id: str, text: str, limit: int = 20) -> List[Dict[str, Any]]:
+    """See ``database.search_conversations``."""
+    if not await asyncio.to_thread(fts_available):
+        raise RuntimeError("Full-text search is not available in this SQLite build")
+    query = _search_query(user_id, text, limit)
+    if query is None:
+        return []
+    return await _fetch_all(*query)
+
+
+async def delete_conversation(conversation_id: str) -> None:
+    """Delete a conversation's messages and its sidebar summary."""
+    async with get_db_connection() as conn:
+        await conn.execute("DELETE FROM conversations WHERE conversation_id = ?", (conversation_id,))
+        await conn.execute("DELETE FROM conversation_archive WHERE conversation_id = ?", (conversation_id,))
+        await conn.execute("DELETE FROM conversation_summaries WHERE conversation_id = ?", (conversation_id,))
+        await conn.commit()
+
+
+async def update_conversation_title(conversation_id: str, new_title: str) -> None:
+    """Rename a conversation by rewriting its first question, and refresh the summary."""
+    async with get_db_connection() as conn:
+        async with conn.execute(
+            "SELECT codec, payload FROM conversation_archive WHERE conversation_id = ?", (conversation_id,)
+        ) as cursor:
+            archived = await cursor.fetchone()
+        if archived:
+            payload, raw_bytes, title = _renamed_archive(archived, new_title)
+            await conn.execute(
+                "UPDATE conversation_archive SET payload = ?, raw_bytes = ? WHERE conversation_id = ?",
+                (payload, raw_bytes, conversation_id),
+            )
+            await conn.execute(
+                "UPDATE conversation_summaries SET title = ? WHERE conversation_id = ?", (title, conversation_id)
+            )
+        else:
+            await conn.execute(_RENAME_FIRST_QUESTION_SQL, (new_title, conversation_id, conversation_id))
+            await conn.execute(_REFRESH_SUMMARY_TITLE_SQL, (conversation_id, conversation_id))
+        await conn.commit()
+
+
+# --- Mandi prices ----------------------------------------------------------
+
+
+async def fetch_cached_mandi_price(district: str, commodity: str) -> Optional[Dict[str, Any]]:
+    return await _fetch_one(_LATEST_MANDI_PRICE_SQL, (district, commodity))
+
+
+async def store_mandi_price(district: str, commodity: str, arrival_date: str, price: Any, unit: str, fetched_at: Optional[float] = None) -> None:
+    async with get_db_connection() as conn:
+        await conn.execute(
+            _UPSERT_MANDI_PRICE_SQL,
+            (district, commodity, arrival_date, price, unit, time.time() if fetched_at is None else fetched_at),
+        )
+        await conn.commit()
+
+
+async def fetch_stored_mandi_price(district: str, commodity: str) -> Optional[Dict[str, Any]]:
+    return await _fetch_one(_LATEST_STORED_MANDI_PRICE_SQL, {"district": district, "commodity": commodity})
+
+
+async def latest_stored_mandi_dates(
+    district: str, commodity: str, nearby: List[str]
+) -> Tuple[Optional[str], Optional[str]]:
+    async with get_db_connection() as conn:
+        async with conn.execute(*_latest_mandi_dates_query(commodity, district, nearby)) as cursor:
+            return tuple(await cursor.fetchone())
+
+
+async def fetch_mandi_price_history(commodity: str, districts: List[str], since: str) -> List[Dict[str, Any]]:
+    if not districts:
+        return []
+    return await _fetch_all(*_mandi_history_query(commodity, districts, since))
+
+
+async def fetch_gazetteer() -> List[Dict[str, Any]]:
+    return await _fetch_all(_GAZETTEER_SQL)
+
+
+async def fetch_mandi_districts(commodity: str) -> List[str]:
+    return [row["district"] for row in await _fetch_all(_MANDI_DISTRICTS_SQL, (commodity,))]
+
+
+# --- Users -----------------------------------------------------------------
+
+
+async def insert_user(
+    name: str,
+    district: Optional[str] = None,
+    crop: Optional[str] = None,
+    state: Optional[str] = None,
+    email: Optional[str] = None,
+    password_hash: Optional[str] = None,
+    phone_number: Optional[str] = None,
+    language: Optional[str] = None,
+    user_id: Optional[str] = None,
+) -> str:
+    """Create a new user row. If user_id is not provided, generate a UUID."""
+    new_user_id = user_id or str(uuid.uuid4())
+    normalized_phone = _normalize_phone_number(phone_number)
+    async with get_db_connection() as conn:
+        await conn.execute(
+            _INSERT_USER_SQL,
+            (new_user_id, name, district, crop, state, email, password_hash, normalized_phone, language),
+        )
+        await conn.commit()
+    invalidate_user_cache(new_user_id)
+    return new_user_id
+
+
+async def fetch_users() -> List[Dict[str, Any]]:
+    return await _fetch_all(f"SELECT {_USER_COLUMNS} FROM users ORDER BY name")
+
+
+async def fetch_user_by_id(user_id: str) -> Optional[Dict[str, Any]]:
+    cached = _users_by_id.get(user_id)
+    if cached is not _MISSING:
+        return cached
+    user = await _fetch_one(f"SELECT {_USER_COLUMNS} FROM users WHERE id = ?", (user_id,))
+    _users_by_id.put(user_id, user)
+    return user
+
+
+async def fetch_user_by_email(email: str) -> Optional[Dict[str, Any]]:
+    return await _fetch_one(f"SELECT {_USER_AUTH_COLUMNS} FROM users WHERE email = ?", (email,))
+
+
+async def fetch_user_by_phone(phone_number: str) -> Optional[Dict[str, Any]]:
+    cached = _users_by_phone.get(phone_number)
+    if cached is not _MISSING:
+        return cached
+    user = None
+    # Normalize lookup to match stored canonical format
+    for probe in [_normalize_phone_number(phone_number), phone_number]:
+        if not probe:
+            continue
+        user = await _fetch_one(f"SELECT {_USER_AUTH_COLUMNS} FROM users WHERE phone_number = ?", (probe,))
+        if user:
+            break
+    _users_by_phone.put(phone_number, user)
+    return user
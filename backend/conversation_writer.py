@@ -0,0 +1,169 @@
+"""Write-behind persistence for conversation rows.
+
+Request handlers call ``enqueue_conversation`` instead of ``insert_conversation``
+and return immediately.  A single background thread drains the queue and
+writes rows in multi-row transactions, flushing when ``CONVERSATION_WRITE_BATCH``
+rows are waiting or ``CONVERSATION_WRITE_INTERVAL_MS`` has passed since the
+first queued row, whichever comes first.
+
+Reads that must see a caller's own writes (conversation history, sidebar)
+call ``conversation_writer.flush()`` first; it returns at once when nothing is
+pending.  The queue is flushed on application shutdown.  Set
+``CONVERSATION_WRITE_BEHIND=0`` to write synchronously instead.
+
+Usage::
+
+    from backend.conversation_writer import enqueue_conversation
+    enqueue_conversation(user_id, question, answer, conversation_id=conv_id)
+"""
+
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from .database import ConversationRow, insert_conversations
+
+CONVERSATION_WRITE_BEHIND = os.getenv("CONVERSATION_WRITE_BEHIND", "1").lower() in {"1", "true", "yes", "y"}
+CONVERSATION_WRITE_BATCH = int(os.getenv("CONVERSATION_WRITE_BATCH", "100"))
+CONVERSATION_WRITE_INTERVAL_MS = int(os.getenv("CONVERSATION_WRITE_INTERVAL_MS", "200"))
+
+_STOP = object()
+# Wakes the writer so a flush() does not wait out the batching interval
+_FLUSH = object()
+
+
+class ConversationWriter:
+    """Background thread that batches queued conversation rows into transactions."""
+
+    def __init__(self, batch_size: int = 100, interval_ms: int = 200):
+        self.batch_size = max(1, batch_size)
+        self.interval = interval_ms / 1000
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._pending = 0
+        self._stats = {"batches_written": 0, "rows_written": 0, "failed_rows": 0, "largest_batch": 0}
+
+    def _ensure_started(self) -> None:
+        # Started lazily so importing the module never spawns a thread
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="conversation-writer", daemon=True)
+            self._thread.start()
+
+    def enqueue(self, row: ConversationRow) -> None:
+        with self._lock:
+            self._ensure_started()
+            self._pending += 1
+        self._queue.put(row)
+
+    def _collect_batch(self) -> Tuple[List[ConversationRow], bool]:
+        """Block for the first row, then gather more until the size or time threshold."""
+        first = self._queue.get()
+        while first is _FLUSH:
+            first = self._queue.get()
+        if first is _STOP:
+            return [], True
+        batch = [first]
+        deadline = time.monotonic() + self.interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            if item is _FLUSH:
+                break
+            batch.append(item)
+        return batch, False
+
+    def _write(self, batch: List[ConversationRow]) -> None:
+        try:
+            insert_conversations(batch)
+            written, failed = len(batch), 0
+        except Exception as e:
+            # Retry row by row so one bad row (e.g. an unknown user) does not drop the batch
+            print(f"[ConversationWriter] batch of {len(batch)} failed ({e}); retrying individually")
+            written = failed = 0
+            for row in batch:
+                try:
+                    insert_conversations([row])
+                    written += 1
+                except Exception as row_error:
+                    failed += 1
+                    print(f"[ConversationWriter] dropped row for user {row[0]}: {row_error}")
+        with self._lock:
+            self._stats["batches_written"] += 1
+            self._stats["rows_written"] += written
+            self._stats["failed_rows"] += failed
+            self._stats["largest_batch"] = max(self._stats["largest_batch"], len(batch))
+            self._pending -= len(batch)
+            if self._pending == 0:
+                self._idle.notify_all()
+
+    def _run(self) -> None:
+        while True:
+            batch, stop = self._collect_batch()
+            if batch:
+                self._write(batch)
+            if stop:
+                return
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until every queued row is committed. Returns False on timeout."""
+        with self._lock:
+            if self._pending == 0:
+                return True
+        self._queue.put(_FLUSH)
+        with self._lock:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout=timeout)
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Flush outstanding rows and stop the writer thread (called on application shutdown)."""
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is None:
+            return
+        self._queue.put(_STOP)
+        thread.join(timeout=timeout)
+        if thread.is_alive():
+            print(f"[ConversationWriter] shutdown timed out with {self._pending} rows pending")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self._stats,
+                "queue_depth": self._pending,
+                "running": self._thread is not None and self._thread.is_alive(),
+                "batch_size": self.batch_size,
+                "interval_ms": int(self.interval * 1000),
+            }
+
+
+conversation_writer = ConversationWriter(
+    batch_size=CONVERSATION_WRITE_BATCH,
+    interval_ms=CONVERSATION_WRITE_INTERVAL_MS,
+)
+
+
+def enqueue_conversation(
+    user_id: str,
+    question: str,
+    answer: Optional[str],
+    conversation_id: Optional[str] = None,
+    title: Optional[str] = None,
+) -> None:
+    """Drop-in replacement for ``insert_conversation`` that does not wait for the commit."""
+    row = (user_id, question, answer, conversation_id, title, datetime.now())
+    if CONVERSATION_WRITE_BEHIND:
+        conversation_writer.enqueue(row)
+    else:
+        insert_conversations([row])
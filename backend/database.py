@@ -1,21 +1,107 @@
+import base64
+import json
+import os
+import re
 import sqlite3
-from datetime import datetime
-from typing import Optional, List, Dict, Any
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Optional, List, Dict, Any, Tuple
 import uuid
 import bcrypt
 from pathlib import Path
 
-
-def get_db_connection():
-    # Anchor the DB file to the backend directory to avoid path confusion
-    db_path = Path(__file__).resolve().parent / "documents.db"
-    connection = sqlite3.connect(str(db_path))
+try:
+    import zstandard
+except ImportError:  # optional; archives fall back to zlib
+    zstandard = None
+
+# Anchor the DB file to the backend directory to avoid path confusion
+DB_PATH = Path(os.getenv("AGRI_DB_PATH") or Path(__file__).resolve().parent / "documents.db")
+
+# Connection tuning (negative cache_size is in KiB, mmap_size in bytes)
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "16384"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(128 * 1024 * 1024)))
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+# Per-connection cache of compiled statements; only pays off because connections are reused
+SQLITE_CACHED_STATEMENTS = int(os.getenv("SQLITE_CACHED_STATEMENTS", "256"))
+
+_local = threading.local()
+_pool_lock = threading.Lock()
+_pool: List[sqlite3.Connection] = []
+# Bumped by close_db_connections() so threads drop their stale handles
+_pool_generation = 0
+
+
+def connection_pragmas() -> List[str]:
+    """PRAGMAs applied to every connection (shared with the async layer)."""
+    return [
+        # WAL lets readers proceed while a writer commits, so /ask, image analysis
+        # and voice threads no longer serialize on the rollback journal
+        "PRAGMA journal_mode = WAL",
+        "PRAGMA synchronous = NORMAL",
+        f"PRAGMA cache_size = -{SQLITE_CACHE_SIZE_KB}",
+        f"PRAGMA mmap_size = {SQLITE_MMAP_SIZE}",
+        "PRAGMA temp_store = MEMORY",
+        f"PRAGMA busy_timeout = {SQLITE_BUSY_TIMEOUT_MS}",
+        # Ensure foreign key constraints are enforced for every connection
+        "PRAGMA foreign_keys = ON",
+    ]
+
+
+def _open_connection() -> sqlite3.Connection:
+    connection = sqlite3.connect(
+        str(DB_PATH),
+        timeout=SQLITE_BUSY_TIMEOUT_MS / 1000,
+        cached_statements=SQLITE_CACHED_STATEMENTS,
+        # Each connection is only used by the thread that opened it; this just
+        # lets close_db_connections() run from the shutdown hook
+        check_same_thread=False,
+    )
     connection.row_factory = sqlite3.Row
-    # Ensure foreign key constraints are enforced for every connection
-    connection.execute("PRAGMA foreign_keys = ON")
+    for pragma in connection_pragmas():
+        connection.execute(pragma)
     return connection
 
 
+def get_db_connection() -> sqlite3.Connection:
+    """Return this thread's pooled connection, opening it on first use.
+
+    Use as ``with get_db_connection() as conn:`` -- the block commits (or rolls
+    back) on exit but leaves the connection open for the next call.
+    """
+    connection = getattr(_local, "connection", None)
+    if connection is None or getattr(_local, "generation", None) != _pool_generation:
+        connection = _open_connection()
+        _local.connection = connection
+        _local.generation = _pool_generation
+        with _pool_lock:
+            _pool.append(connection)
+    return connection
+
+
+def close_db_connections() -> None:
+    """Close every pooled connection (called on application shutdown)."""
+    global _pool_generation
+    with _pool_lock:
+        connections = list(_pool)
+        _pool.clear()
+        _pool_generation += 1
+    for connection in connections:
+        try:
+            connection.close()
+        except sqlite3.Error as e:
+            print(f"[Database] close failed: {e}")
+
+
+def db_pool_stats() -> Dict[str, Any]:
+    with _pool_lock:
+        open_connections = len(_pool)
+    return {"db_path": str(DB_PATH), "open_connections": open_connections}
+
+
 def _normalize_phone_number(phone: Optional[str]) -> Optional[str]:
     """Normalize phone numbers to E.164 for India (+91XXXXXXXXXX).
 
@@ -40,110 +126,102 @@ def _normalize_phone_number(phone: Optional[str]) -> Optional[str]:
     return "+" + digits
 
 
-# Initialize the database tables if they don't exist
-with get_db_connection() as conn:
-    cursor = conn.cursor()
-
-    # Create users table (new)
-    cursor.execute(
-        """
-        CREATE TABLE IF NOT EXISTS users (
-            id TEXT PRIMARY KEY,
-            name TEXT NOT NULL,
-            district TEXT,
-            crop TEXT,
-            state TEXT,
-            email TEXT UNIQUE,
-            password_hash TEXT,
-            phone_number TEXT,
-            language TEXT
-        )
-        """
-    )
+# (user_id, question, answer, conversation_id, title, timestamp)
+ConversationRow = Tuple[str, str, Optional[str], Optional[str], Optional[str], datetime]
 
-    # Ensure 'state' column exists for legacy DBs
-    cursor.execute("PRAGMA table_info(users)")
-    user_cols = [row[1] for row in cursor.fetchall()]
-    if "state" not in user_cols:
-        cursor.execute("ALTER TABLE users ADD COLUMN state TEXT")
-    if "email" not in user_cols:
-        cursor.execute("ALTER TABLE users ADD COLUMN email TEXT")
-    if "password_hash" not in user_cols:
-        cursor.execute("ALTER TABLE users ADD COLUMN password_hash TEXT")
-    if "phone_number" not in user_cols:
-        cursor.execute("ALTER TABLE users ADD COLUMN phone_number TEXT")
-    if "language" not in user_cols:
-        cursor.execute("ALTER TABLE users ADD COLUMN language TEXT")
-
-    # Ensure unique index on email (if provided)
-    cursor.execute("PRAGMA index_list(users)")
-    existing_indexes = [row[1] for row in cursor.fetchall()]  # row[1] is index name
-    if "idx_users_email_unique" not in existing_indexes:
-        # Partial unique index so multiple NULL emails are allowed
-        cursor.execute(
-            "CREATE UNIQUE INDEX IF NOT EXISTS idx_users_email_unique ON users(email) WHERE email IS NOT NULL"
-        )
-    # Ensure unique index on phone_number (if provided)
-    cursor.execute("PRAGMA index_list(users)")
-    existing_indexes = [row[1] for row in cursor.fetchall()]
-    if "idx_users_phone_unique" not in existing_indexes:
-        cursor.execute(
-            "CREATE UNIQUE INDEX IF NOT EXISTS idx_users_phone_unique ON users(phone_number) WHERE phone_number IS NOT NULL"
-        )
 
-    # Ensure conversations table matches the new schema (with user_id)
-    cursor.execute("PRAGMA table_info(conversations)")
-    existing_columns = [row[1] for row in cursor.fetchall()]
+def insert_conversation(user_id: str, question: str, answer: Optional[str], conversation_id: Optional[str] = None, title: Optional[str] = None):
+    insert_conversations([(user_id, question, answer, conversation_id, title, datetime.now())])
+
+
+_INSERT_CONVERSATION_SQL = (
+    "INSERT INTO conversations (user_id, question, answer, timestamp, conversation_id, title) VALUES (?, ?, ?, ?, ?, ?)"
+)
+# The first message fixes the summary title and start time; later ones only bump it
+_UPSERT_SUMMARY_SQL = """
+    INSERT INTO conversation_summaries
+        (conversation_id, user_id, title, first_timestamp, last_timestamp, message_count)
+    VALUES (?, ?, ?, ?, ?, 1)
+    ON CONFLICT(conversation_id) DO UPDATE SET
+        last_timestamp = excluded.last_timestamp,
+        message_count = message_count + 1
+"""
+
+
+def _conversation_params(rows: List[ConversationRow]) -> Tuple[List[tuple], List[tuple]]:
+    """Parameters for _INSERT_CONVERSATION_SQL and _UPSERT_SUMMARY_SQL."""
+    # Only set the title on the first entry of a conversation
+    # Subsequent entries will have title=NULL
+    messages = [
+        (user_id, question, answer, timestamp, conversation_id, title)
+        for user_id, question, answer, conversation_id, title, timestamp in rows
+    ]
+    summaries = [
+        (conversation_id, user_id, title if title is not None else question, timestamp, timestamp)
+        for user_id, question, answer, conversation_id, title, timestamp in rows
+        if conversation_id
+    ]
+    return messages, summaries
+
+
+def insert_conversations(rows: List[ConversationRow]) -> None:
+    """Insert several conversation rows (and their summary updates) in one transaction."""
+    if not rows:
+        return
+    messages, summaries = _conversation_params(rows)
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.executemany(_INSERT_CONVERSATION_SQL, messages)
+        cursor.executemany(_UPSERT_SUMMARY_SQL, summaries)
+        conn.commit()
 
-    needs_recreate = (
-        ("user_id" not in existing_columns) or
-        ("pdf_id" in existing_columns)
-    )
 
-    if needs_recreate:
-        # Rename old table if it exists
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='conversations'")
-        if cursor.fetchone():
-            cursor.execute("ALTER TABLE conversations RENAME TO conversations_legacy")
+ARCHIVE_CODEC = "zstd" if zstandard is not None else "zlib"
 
-        # Create new conversations table with user_id and FK
-        cursor.execute(
-            """
-            CREATE TABLE conversations (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id TEXT NOT NULL,
-                question TEXT NOT NULL,
-                answer TEXT,
-                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
-            )
-            """
-        )
 
-        # Drop legacy table if present (no automatic data migration possible)
-        cursor.execute("DROP TABLE IF EXISTS conversations_legacy")
+def _compress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=19).compress(data)
+    return zlib.compress(data, 9)
 
-    # Ensure conversation_id column exists
-    cursor.execute("PRAGMA table_info(conversations)")
-    conv_cols = [row[1] for row in cursor.fetchall()]
-    if "conversation_id" not in conv_cols:
-        cursor.execute("ALTER TABLE conversations ADD COLUMN conversation_id TEXT")
-    if "title" not in conv_cols:
-        cursor.execute("ALTER TABLE conversations ADD COLUMN title TEXT")
 
-    conn.commit()
+def _decompress(payload: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("Archived conversation uses zstd but the zstandard package is not installed")
+        return zstandard.ZstdDecompressor().decompress(payload)
+    return zlib.decompress(payload)
 
 
-def insert_conversation(user_id: str, question: str, answer: Optional[str], conversation_id: Optional[str] = None, title: Optional[str] = None):
-    with get_db_connection() as conn:
-        cursor = conn.cursor()
-        # Only set the title on the first entry of a conversation
-        # Subsequent entries will have title=NULL
-        cursor.execute(
-            "INSERT INTO conversations (user_id, question, answer, timestamp, conversation_id, title) VALUES (?, ?, ?, ?, ?, ?)",
-            (user_id, question, answer, datetime.now(), conversation_id, title),
-        )
-        conn.commit()
+def _decode_archive(row: Any) -> List[Dict[str, Any]]:
+    """Messages of one conversation_archive row, in chat order."""
+    return json.loads(_decompress(row["payload"], row["codec"]).decode("utf-8"))
+
+
+def _load_archived(conn: sqlite3.Connection, where: str, params: tuple) -> List[Dict[str, Any]]:
+    rows = conn.execute(f"SELECT codec, payload FROM conversation_archive WHERE {where}", params).fetchall()
+    return [message for row in rows for message in _decode_archive(row)]
+
+
+def _merge_messages(archived: List[Dict[str, Any]], live: List[Dict[str, Any]], fields: List[str]) -> List[Dict[str, Any]]:
+    """Archived + live messages in (timestamp, id) order, restricted to ``fields``."""
+    merged = archived + live
+    merged.sort(key=lambda m: (str(m["timestamp"]), m.get("id") or 0))
+    return [{field: message.get(field) for field in fields} for message in merged]
+
+
+def _page_messages(
+    messages: List[Dict[str, Any]], limit: int, cursor: Optional[str], since: Optional[str]
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """In-memory equivalent of _conversation_page_query() for conversations with archived rows."""
+    if since:
+        messages = [m for m in messages if str(m["timestamp"]) > since]
+    if cursor:
+        after = decode_cursor(cursor)
+        if not isinstance(after[1], int):
+            raise ValueError("Invalid cursor")  # message cursors carry a row id
+        messages = [m for m in messages if (str(m["timestamp"]), m["id"]) > after]
+    return _split_page(messages[: limit + 1], limit, "timestamp", "id")
 
 
 def fetch_conversations(user_id: str) -> List[Dict[str, Any]]:
@@ -153,7 +231,11 @@ def fetch_conversations(user_id: str) -> List[Dict[str, Any]]:
             "SELECT question, answer, timestamp FROM conversations WHERE user_id = ? ORDER BY timestamp",
             (user_id,),
         )
-        return [dict(row) for row in cursor.fetchall()]
+        rows = [dict(row) for row in cursor.fetchall()]
+        archived = _load_archived(conn, "user_id = ?", (user_id,))
+    if not archived:
+        return rows
+    return _merge_messages(archived, rows, ["question", "answer", "timestamp"])
 
 
 def fetch_user_conversation_summaries(user_id: str) -> List[Dict[str, Any]]:
@@ -162,19 +244,9 @@ def fetch_user_conversation_summaries(user_id: str) -> List[Dict[str, Any]]:
         cursor = conn.cursor()
         cursor.execute(
             """
-            SELECT
-                c.conversation_id,
-                -- Use the explicit title if it exists, otherwise fallback to the first question
-                COALESCE(c.title, c.question) AS title,
-                c.timestamp AS first_timestamp
-            FROM conversations c
-            JOIN (
-                SELECT conversation_id, MIN(timestamp) AS first_ts
-                FROM conversations
-                WHERE user_id = ? AND conversation_id IS NOT NULL
-                GROUP BY conversation_id
-            ) t
-            ON c.conversation_id = t.conversation_id AND c.timestamp = t.first_ts
+            SELECT conversation_id, title, first_timestamp
+            FROM conversation_summaries
+            WHERE user_id = ?
             ORDER BY first_timestamp DESC
             """,
             (user_id,),
@@ -189,7 +261,657 @@ def fetch_conversation_by_id(conversation_id: str) -> List[Dict[str, Any]]:
             "SELECT user_id, question, answer, timestamp FROM conversations WHERE conversation_id = ? ORDER BY timestamp",
             (conversation_id,),
         )
-        return [dict(row) for row in cursor.fetchall()]
+        rows = [dict(row) for row in cursor.fetchall()]
+        archived = _load_archived(conn, "conversation_id = ?", (conversation_id,))
+    if not archived:
+        return rows
+    return _merge_messages(archived, rows, ["user_id", "question", "answer", "timestamp"])
+
+
+def encode_cursor(timestamp: Any, key: Any) -> str:
+    """Opaque keyset cursor for the row a page ended on."""
+    raw = json.dumps([str(timestamp), key], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, Any]:
+    """Inverse of encode_cursor(); raises ValueError for malformed cursors."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        timestamp, key = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    # Keys are conversation ids (str) or row ids (int); anything else would fail at bind time
+    if not isinstance(timestamp, str) or not isinstance(key, (str, int)) or isinstance(key, bool):
+        raise ValueError("Invalid cursor")
+    return timestamp, key
+
+
+def _split_page(rows: List[Dict[str, Any]], limit: int, ts_field: str, key_field: str) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    # Callers fetch limit + 1 rows; the extra row only signals that another page exists
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    return page, encode_cursor(page[-1][ts_field], page[-1][key_field])
+
+
+def _summaries_page_query(
+    user_id: str, limit: int, cursor: Optional[str], since: Optional[str]
+) -> Tuple[str, List[Any], str]:
+    """SQL, parameters and sort column for one page of conversation summaries."""
+    if since:
+        order_field, comparison, direction = "last_timestamp", ">", "ASC"
+    else:
+        order_field, comparison, direction = "first_timestamp", "<", "DESC"
+    sql = (
+        "SELECT conversation_id, title, first_timestamp, last_timestamp, message_count "
+        "FROM conversation_summaries WHERE user_id = ?"
+    )
+    params: List[Any] = [user_id]
+    if since:
+        sql += " AND last_timestamp > ?"
+        params.append(since)
+    if cursor:
+        sql += f" AND ({order_field}, conversation_id) {comparison} (?, ?)"
+        params.extend(decode_cursor(cursor))
+    sql += f" ORDER BY {order_field} {direction}, conversation_id {direction} LIMIT ?"
+    params.append(limit + 1)
+    return sql, params, order_field
+
+
+_PAGE_FIELDS = ["id", "user_id", "question", "answer", "timestamp"]
+
+
+def _conversation_page_query(
+    conversation_id: str, limit: int, cursor: Optional[str], since: Optional[str]
+) -> Tuple[str, List[Any]]:
+    """SQL and parameters for one page of a conversation's messages."""
+    sql = "SELECT id, user_id, question, answer, timestamp FROM conversations WHERE conversation_id = ?"
+    params: List[Any] = [conversation_id]
+    if since:
+        sql += " AND timestamp > ?"
+        params.append(since)
+    if cursor:
+        sql += " AND (timestamp, id) > (?, ?)"
+        params.extend(decode_cursor(cursor))
+    sql += " ORDER BY timestamp, id LIMIT ?"
+    params.append(limit + 1)
+    return sql, params
+
+
+def fetch_user_conversation_summaries_page(
+    user_id: str,
+    limit: int,
+    cursor: Optional[str] = None,
+    since: Optional[str] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """One page of a user's conversation summaries plus the cursor for the next page.
+
+    Without ``since`` the sidebar order is kept (newest conversation first).
+    With ``since`` only conversations that received messages after that
+    timestamp are returned, oldest change first, for incremental sync.
+    """
+    sql, params, order_field = _summaries_page_query(user_id, limit, cursor, since)
+    with get_db_connection() as conn:
+        rows = [dict(row) for row in conn.execute(sql, params).fetchall()]
+    return _split_page(rows, limit, order_field, "conversation_id")
+
+
+def fetch_conversation_page(
+    conversation_id: str,
+    limit: int,
+    cursor: Optional[str] = None,
+    since: Optional[str] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """One page of a conversation's messages in chat order plus the next-page cursor."""
+    with get_db_connection() as conn:
+        archived = _load_archived(conn, "conversation_id = ?", (conversation_id,))
+        if archived:
+            # Archived conversations are small and rarely opened; page them in memory
+            live = conn.execute(
+                "SELECT id, user_id, question, answer, timestamp FROM conversations WHERE conversation_id = ?",
+                (conversation_id,),
+            ).fetchall()
+            messages = _merge_messages(archived, [dict(r) for r in live], _PAGE_FIELDS)
+            return _page_messages(messages, limit, cursor, since)
+        sql, params = _conversation_page_query(conversation_id, limit, cursor, since)
+        rows = [dict(row) for row in conn.execute(sql, params).fetchall()]
+    return _split_page(rows, limit, "timestamp", "id")
+
+
+SEARCH_SNIPPET_TOKENS = 24
+_FTS_TERM = re.compile(r"[^\s\"'`^*():{}\[\]+\-,.;!?।]+")
+
+
+def _fts_match_expression(user_id: str, text: str) -> Optional[str]:
+    """Turn free text into a safe FTS5 query scoped to one user.
+
+    Every word is quoted so FTS5 operators in user input are inert; the last
+    word is a prefix match so partially typed queries still find results.
+    Search terms only match questions and answers; the owner filter is an
+    anchored phrase on ``user_id`` so MATCH skips other users' rows inside the
+    index.  It is tokenized like the text (``test_user`` -> ``test user``), so
+    ``user_id`` is also compared exactly by the caller.
+    """
+    terms = _FTS_TERM.findall(text or "")
+    if not terms:
+        return None
+    quoted = ['"' + term.replace('"', '""') + '"' for term in terms]
+    quoted[-1] += "*"
+    owner = '"' + user_id.replace('"', '""') + '"'
+    return f"user_id : ^{owner} AND {{question answer}} : ({' '.join(quoted)})"
+
+
+def _search_query(user_id: str, text: str, limit: int) -> Optional[Tuple[str, tuple]]:
+    """SQL and parameters for search_conversations(), or None for an empty query."""
+    match = _fts_match_expression(user_id, text)
+    if match is None:
+        return None
+    sql = f"""
+        SELECT
+            c.id,
+            c.conversation_id,
+            c.timestamp,
+            highlight(conversations_fts, 1, '<mark>', '</mark>') AS question,
+            snippet(conversations_fts, 2, '<mark>', '</mark>', '…', {SEARCH_SNIPPET_TOKENS}) AS answer_snippet,
+            bm25(conversations_fts, 0.0, 2.0, 1.0) AS score
+        FROM conversations_fts
+        JOIN conversations c ON c.id = conversations_fts.rowid
+        WHERE conversations_fts MATCH ? AND c.user_id = ?
+        ORDER BY score
+        LIMIT ?
+    """
+    return sql, (match, user_id, limit)
+
+
+_fts_available: Optional[bool] = None
+
+
+def fts_available() -> bool:
+    """Whether the conversations_fts index exists (migration 3 skips it without FTS5)."""
+    global _fts_available
+    if not _fts_available:
+        with get_db_connection() as conn:
+            row = conn.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='conversations_fts'").fetchone()
+        _fts_available = row is not None
+    return _fts_available
+
+
+def search_conversations(user_id: str, text: str, limit: int = 20) -> List[Dict[str, Any]]:
+    """Ranked full-text search over a user's questions and answers, with highlighted matches."""
+    if not fts_available():
+        raise RuntimeError("Full-text search is not available in this SQLite build")
+    query = _search_query(user_id, text, limit)
+    if query is None:
+        return []
+    with get_db_connection() as conn:
+        return [dict(row) for row in conn.execute(*query).fetchall()]
+
+
+def delete_conversation(conversation_id: str) -> None:
+    """Delete a conversation's messages and its sidebar summary."""
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM conversations WHERE conversation_id = ?", (conversation_id,))
+        cursor.execute("DELETE FROM conversation_archive WHERE conversation_id = ?", (conversation_id,))
+        cursor.execute("DELETE FROM conversation_summaries WHERE conversation_id = ?", (conversation_id,))
+        conn.commit()
+
+
+_RENAME_FIRST_QUESTION_SQL = """
+    UPDATE conversations
+    SET question = ?
+    WHERE conversation_id = ? AND timestamp = (
+        SELECT MIN(timestamp)
+        FROM conversations
+        WHERE conversation_id = ?
+    )
+"""
+# Mirror the sidebar title the old GROUP BY query would have produced
+_REFRESH_SUMMARY_TITLE_SQL = """
+    UPDATE conversation_summaries
+    SET title = (
+        SELECT COALESCE(title, question)
+        FROM conversations
+        WHERE conversation_id = ?
+        ORDER BY timestamp
+        LIMIT 1
+    )
+    WHERE conversation_id = ?
+"""
+
+
+def _renamed_archive(row: Any, new_title: str) -> Tuple[bytes, int, str]:
+    """Archive payload with the first question replaced; returns (payload, raw_bytes, sidebar title)."""
+    messages = _decode_archive(row)
+    messages[0]["question"] = new_title
+    raw = json.dumps(messages, ensure_ascii=False).encode("utf-8")
+    first = messages[0]
+    title = first.get("title") if first.get("title") is not None else new_title
+    return _compress(raw, row["codec"]), len(raw), title
+
+
+def update_conversation_title(conversation_id: str, new_title: str) -> None:
+    """Rename a conversation by rewriting its first question, and refresh the summary."""
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        archived = cursor.execute(
+            "SELECT codec, payload FROM conversation_archive WHERE conversation_id = ?", (conversation_id,)
+        ).fetchone()
+        if archived:
+            # Archived messages always predate live ones, so the first question is in the blob
+            payload, raw_bytes, title = _renamed_archive(archived, new_title)
+            cursor.execute(
+                "UPDATE conversation_archive SET payload = ?, raw_bytes = ? WHERE conversation_id = ?",
+                (payload, raw_bytes, conversation_id),
+            )
+            cursor.execute("UPDATE conversation_summaries SET title = ? WHERE conversation_id = ?", (title, conversation_id))
+        else:
+            cursor.execute(_RENAME_FIRST_QUESTION_SQL, (new_title, conversation_id, conversation_id))
+            cursor.execute(_REFRESH_SUMMARY_TITLE_SQL, (conversation_id, conversation_id))
+        conn.commit()
+
+
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "180"))
+
+
+def archive_conversations(older_than_days: int = ARCHIVE_AFTER_DAYS, dry_run: bool = False) -> Dict[str, Any]:
+    """Move conversations idle for ``older_than_days`` into compressed conversation_archive blobs.
+
+    Each conversation is archived in its own transaction: its live rows (merged
+    with any earlier archive of the same conversation) are serialized to JSON,
+    compressed with zstd when available (zlib otherwise), stored, and deleted
+    from ``conversations``.  Sidebar summaries are untouched, and the fetch
+    functions read archived messages transparently.  Archived messages leave
+    the full-text search index.  Returns counts and byte totals for the run.
+    """
+    cutoff = str(datetime.now() - timedelta(days=older_than_days))
+    with get_db_connection() as conn:
+        candidates = [
+            row[0]
+            for row in conn.execute(
+                "SELECT conversation_id FROM conversation_summaries WHERE last_timestamp < ?", (cutoff,)
+            ).fetchall()
+        ]
+
+    report = {"codec": ARCHIVE_CODEC, "conversations": 0, "messages": 0, "raw_bytes": 0, "compressed_bytes": 0}
+    for conversation_id in candidates:
+        with get_db_connection() as conn:
+            # Take the write lock before reading so a message flushed meanwhile either
+            # lands first (and is re-checked below) or waits until this one commits
+            conn.execute("BEGIN IMMEDIATE")
+            still_idle = conn.execute(
+                "SELECT 1 FROM conversation_summaries WHERE conversation_id = ? AND last_timestamp < ?",
+                (conversation_id, cutoff),
+            ).fetchone()
+            if not still_idle:
+                continue  # became active since the candidate scan
+            live = [
+                dict(row)
+                for row in conn.execute(
+                    "SELECT id, user_id, question, answer, timestamp, conversation_id, title "
+                    "FROM conversations WHERE conversation_id = ? ORDER BY timestamp, id",
+                    (conversation_id,),
+                ).fetchall()
+            ]
+            if not live:
+                continue  # already archived
+            messages = _load_archived(conn, "conversation_id = ?", (conversation_id,)) + live
+            raw = json.dumps(messages, ensure_ascii=False).encode("utf-8")
+            payload = _compress(raw, ARCHIVE_CODEC)
+            report["conversations"] += 1
+            report["messages"] += len(live)
+            report["raw_bytes"] += len(raw)
+            report["compressed_bytes"] += len(payload)
+            if dry_run:
+                continue
+            conn.execute(
+                "INSERT OR REPLACE INTO conversation_archive "
+                "(conversation_id, user_id, codec, payload, message_count, raw_bytes) VALUES (?, ?, ?, ?, ?, ?)",
+                (conversation_id, live[0]["user_id"], ARCHIVE_CODEC, payload, len(messages), len(raw)),
+            )
+            # Only the rows that went into the payload
+            conn.executemany("DELETE FROM conversations WHERE id = ?", [(message["id"],) for message in live])
+            conn.commit()
+    report["bytes_saved"] = report["raw_bytes"] - report["compressed_bytes"]
+    return report
+
+
+def archive_stats() -> Dict[str, Any]:
+    """Totals over everything archived so far."""
+    with get_db_connection() as conn:
+        row = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(message_count), 0), COALESCE(SUM(raw_bytes), 0), "
+            "COALESCE(SUM(LENGTH(payload)), 0) FROM conversation_archive"
+        ).fetchone()
+    conversations, messages, raw_bytes, compressed_bytes = row
+    return {
+        "conversations": conversations,
+        "messages": messages,
+        "raw_bytes": raw_bytes,
+        "compressed_bytes": compressed_bytes,
+        "bytes_saved": raw_bytes - compressed_bytes,
+    }
+
+
+_LATEST_MANDI_PRICE_SQL = """
+    SELECT district, commodity, arrival_date, price, unit, fetched_at
+    FROM mandi_price_cache
+    WHERE district = ? AND commodity = ?
+    ORDER BY fetched_at DESC
+    LIMIT 1
+"""
+_UPSERT_MANDI_PRICE_SQL = """
+    INSERT INTO mandi_price_cache (district, commodity, arrival_date, price, unit, fetched_at)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(district, commodity, arrival_date) DO UPDATE SET
+        price = excluded.price,
+        unit = excluded.unit,
+        fetched_at = excluded.fetched_at
+"""
+
+
+def fetch_cached_mandi_price(district: str, commodity: str) -> Optional[Dict[str, Any]]:
+    """Most recently fetched cached price for a district/commodity, or None."""
+    with get_db_connection() as conn:
+        row = conn.execute(_LATEST_MANDI_PRICE_SQL, (district, commodity)).fetchone()
+    return dict(row) if row else None
+
+
+def store_mandi_price(district: str, commodity: str, arrival_date: str, price: Any, unit: str, fetched_at: Optional[float] = None) -> None:
+    with get_db_connection() as conn:
+        conn.execute(
+            _UPSERT_MANDI_PRICE_SQL,
+            (district, commodity, arrival_date, price, unit, time.time() if fetched_at is None else fetched_at),
+        )
+
+
+_INSERT_MANDI_RECORD_SQL = """
+    INSERT OR REPLACE INTO mandi_prices
+        (commodity, district, arrival_date, market, variety, grade, state, min_price, max_price, modal_price)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+# Average over the district's markets on its latest arrival date; dates are ISO strings
+_LATEST_STORED_MANDI_PRICE_SQL = """
+    SELECT arrival_date, CAST(ROUND(AVG(modal_price)) AS INTEGER) AS modal_price, COUNT(*) AS markets
+    FROM mandi_prices
+    WHERE commodity = :commodity AND district = :district
+      AND arrival_date = (
+          SELECT MAX(arrival_date) FROM mandi_prices WHERE commodity = :commodity AND district = :district
+      )
+    HAVING COUNT(*) > 0
+"""
+
+
+def store_mandi_records(rows: List[tuple]) -> int:
+    """Upsert ``mandi_prices`` rows (in ``_INSERT_MANDI_RECORD_SQL`` column order); returns the row count."""
+    with get_db_connection() as conn:
+        conn.executemany(_INSERT_MANDI_RECORD_SQL, rows)
+    return len(rows)
+
+
+def latest_mandi_arrival_date() -> Optional[str]:
+    """Newest ISO arrival date in the local price store, or None when it is empty."""
+    with get_db_connection() as conn:
+        return conn.execute("SELECT MAX(arrival_date) FROM mandi_prices").fetchone()[0]
+
+
+def fetch_stored_mandi_price(district: str, commodity: str) -> Optional[Dict[str, Any]]:
+    with get_db_connection() as conn:
+        row = conn.execute(_LATEST_STORED_MANDI_PRICE_SQL, {"district": district, "commodity": commodity}).fetchone()
+    return dict(row) if row else None
+
+
+def _latest_mandi_dates_query(commodity: str, district: str, nearby: List[str]) -> Tuple[str, tuple]:
+    """Newest arrival date of ``district`` and the newest across ``district`` and ``nearby``, in one query."""
+    districts = [district, *nearby]
+    placeholders = ", ".join("?" for _ in districts)
+    sql = f"""
+        SELECT MAX(CASE WHEN district = ? THEN arrival_date END), MAX(arrival_date)
+        FROM mandi_prices
+        WHERE commodity = ? AND district IN ({placeholders})
+    """
+    return sql, (district, commodity, *districts)
+
+
+def _mandi_history_query(commodity: str, districts: List[str], since: str) -> Tuple[str, tuple]:
+    """Daily average modal price per district for ``commodity`` from ``since`` (ISO date) on."""
+    placeholders = ", ".join("?" for _ in districts)
+    sql = f"""
+        SELECT district, arrival_date, AVG(modal_price) AS modal_price
+        FROM mandi_prices
+        WHERE commodity = ? AND district IN ({placeholders}) AND arrival_date >= ?
+        GROUP BY district, arrival_date
+        ORDER BY arrival_date
+    """
+    return sql, (commodity, *districts, since)
+
+
+def latest_stored_mandi_dates(district: str, commodity: str, nearby: List[str]) -> Tuple[Optional[str], Optional[str]]:
+    """``(latest date of district, latest date of district or any nearby mandi)``."""
+    with get_db_connection() as conn:
+        return tuple(conn.execute(*_latest_mandi_dates_query(commodity, district, nearby)).fetchone())
+
+
+def fetch_mandi_price_history(commodity: str, districts: List[str], since: str) -> List[Dict[str, Any]]:
+    if not districts:
+        return []
+    with get_db_connection() as conn:
+        rows = conn.execute(*_mandi_history_query(commodity, districts, since)).fetchall()
+    return [dict(row) for row in rows]
+
+
+_GAZETTEER_SQL = "SELECT district, latitude, longitude FROM district_gazetteer WHERE latitude IS NOT NULL"
+_MANDI_DISTRICTS_SQL = "SELECT DISTINCT district FROM mandi_prices WHERE commodity = ?"
+_UPSERT_DISTRICT_COORDINATES_SQL = """
+    INSERT INTO district_gazetteer (district, state, latitude, longitude, source)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT(district) DO UPDATE SET
+        state = COALESCE(excluded.state, district_gazetteer.state),
+        latitude = excluded.latitude,
+        longitude = excluded.longitude,
+        source = excluded.source,
+        updated_at = CURRENT_TIMESTAMP
+"""
+
+
+def fetch_gazetteer() -> List[Dict[str, Any]]:
+    """Every district with known coordinates."""
+    with get_db_connection() as conn:
+        return [dict(row) for row in conn.execute(_GAZETTEER_SQL).fetchall()]
+
+
+def fetch_district_coordinates(district: str) -> Optional[Dict[str, Any]]:
+    """Gazetteer row for a district (coordinates are None after a failed geocode), or None if unknown."""
+    with get_db_connection() as conn:
+        row = conn.execute(
+            "SELECT district, state, latitude, longitude, source FROM district_gazetteer WHERE district = ?",
+            (district,),
+        ).fetchone()
+    return dict(row) if row else None
+
+
+def store_district_coordinates(
+    district: str, latitude: Optional[float], longitude: Optional[float], source: str, state: Optional[str] = None
+) -> None:
+    with get_db_connection() as conn:
+        conn.execute(_UPSERT_DISTRICT_COORDINATES_SQL, (district, state, latitude, longitude, source))
+
+
+def fetch_mandi_districts(commodity: str) -> List[str]:
+    """Districts with at least one stored price for ``commodity``."""
+    with get_db_connection() as conn:
+        return [row[0] for row in conn.execute(_MANDI_DISTRICTS_SQL, (commodity,)).fetchall()]
+
+
+def fetch_ungeocoded_mandi_districts() -> List[Dict[str, Any]]:
+    """Districts in the price store that have no gazetteer entry yet, with their state."""
+    with get_db_connection() as conn:
+        rows = conn.execute(
+            """
+            SELECT district, MAX(state) AS state FROM mandi_prices
+            WHERE district NOT IN (SELECT district FROM district_gazetteer)
+            GROUP BY district
+            """
+        ).fetchall()
+    return [dict(row) for row in rows]
+
+
+_UPSERT_PRICE_FORECAST_SQL = """
+    INSERT INTO price_forecasts (crop, data_source, as_of, forecast_days, comparison, fitted_at, checked_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(crop) DO UPDATE SET
+        data_source = excluded.data_source,
+        as_of = excluded.as_of,
+        forecast_days = excluded.forecast_days,
+        comparison = excluded.comparison,
+        fitted_at = excluded.fitted_at,
+        checked_at = excluded.checked_at
+"""
+# Crops of users who have asked anything since the given timestamp
+_ACTIVE_PROFILE_CROPS_SQL = """
+    SELECT DISTINCT lower(trim(u.crop)) FROM users u
+    WHERE u.crop IS NOT NULL AND trim(u.crop) != ''
+      AND EXISTS (
+          SELECT 1 FROM conversation_summaries s
+          WHERE s.user_id = u.id AND s.last_timestamp >= ?
+      )
+"""
+
+
+def fetch_price_forecast(crop: str) -> Optional[Dict[str, Any]]:
+    """Stored forecast row for ``crop`` (``comparison`` still JSON-encoded), or None."""
+    with get_db_connection() as conn:
+        row = conn.execute("SELECT * FROM price_forecasts WHERE crop = ?", (crop,)).fetchone()
+    return dict(row) if row else None
+
+
+def fetch_price_forecast_summaries() -> List[Dict[str, Any]]:
+    with get_db_connection() as conn:
+        rows = conn.execute(
+            "SELECT crop, data_source, as_of, forecast_days, fitted_at, checked_at FROM price_forecasts ORDER BY crop"
+        ).fetchall()
+    return [dict(row) for row in rows]
+
+
+def store_price_forecast(
+    crop: str, data_source: str, as_of: str, forecast_days: int, comparison: str, fitted_at: Optional[float] = None
+) -> None:
+    fitted_at = time.time() if fitted_at is None else fitted_at
+    with get_db_connection() as conn:
+        conn.execute(_UPSERT_PRICE_FORECAST_SQL, (crop, data_source, as_of, forecast_days, comparison, fitted_at, fitted_at))
+
+
+def touch_price_forecast(crop: str, checked_at: Optional[float] = None) -> None:
+    """Record that the data behind a stored forecast was re-checked and had not changed."""
+    with get_db_connection() as conn:
+        conn.execute(
+            "UPDATE price_forecasts SET checked_at = ? WHERE crop = ?",
+            (time.time() if checked_at is None else checked_at, crop),
+        )
+
+
+def fetch_active_profile_crops(active_days: int) -> List[str]:
+    """Distinct profile crops of users with a conversation in the last ``active_days`` days."""
+    # Same text form the default sqlite3 adapter gives the datetime timestamps we insert
+    since = (datetime.now() - timedelta(days=active_days)).isoformat(" ")
+    with get_db_connection() as conn:
+        return [row[0] for row in conn.execute(_ACTIVE_PROFILE_CROPS_SQL, (since,)).fetchall()]
+
+
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+# Misses are cached briefly so repeated probes for unknown callers stay off SQLite
+USER_CACHE_NEGATIVE_TTL_SECONDS = float(os.getenv("USER_CACHE_NEGATIVE_TTL_SECONDS", "5"))
+USER_CACHE_MAX_ENTRIES = int(os.getenv("USER_CACHE_MAX_ENTRIES", "4096"))
+
+_MISSING = object()
+
+
+class _UserCache:
+    """Thread-safe TTL + LRU map of user lookups with hit/miss counters.
+
+    Values are stored and returned as copies so callers can mutate the dicts
+    they receive.  Writers invalidate through invalidate_user_cache().
+    """
+
+    def __init__(self, ttl: float, negative_ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Optional[Dict[str, Any]]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "negative_hits": 0, "misses": 0, "invalidations": 0}
+
+    def get(self, key: str) -> Any:
+        """Return the cached user (or None for a cached miss), or _MISSING."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self._stats["misses"] += 1
+                return _MISSING
+            self._entries.move_to_end(key)
+            if entry[1] is None:
+                self._stats["negative_hits"] += 1
+                return None
+            self._stats["hits"] += 1
+            return dict(entry[1])
+
+    def put(self, key: str, user: Optional[Dict[str, Any]]) -> None:
+        ttl = self.ttl if user is not None else self.negative_ttl
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, dict(user) if user is not None else None)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: Optional[str] = None) -> None:
+        """Drop cached misses and every entry for ``user_id`` (or everything if None)."""
+        with self._lock:
+            self._stats["invalidations"] += 1
+            if user_id is None:
+                self._entries.clear()
+                return
+            stale = [k for k, (_, user) in self._entries.items() if user is None or user.get("id") == user_id]
+            for k in stale:
+                del self._entries[k]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits = self._stats["hits"] + self._stats["negative_hits"]
+            lookups = hits + self._stats["misses"]
+            return {
+                **self._stats,
+                "lookups": lookups,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                "entries": len(self._entries),
+            }
+
+
+_users_by_id = _UserCache(USER_CACHE_TTL_SECONDS, USER_CACHE_NEGATIVE_TTL_SECONDS, USER_CACHE_MAX_ENTRIES)
+_users_by_phone = _UserCache(USER_CACHE_TTL_SECONDS, USER_CACHE_NEGATIVE_TTL_SECONDS, USER_CACHE_MAX_ENTRIES)
+
+
+def invalidate_user_cache(user_id: Optional[str] = None) -> None:
+    """Forget cached lookups for a user (all users if None). Call after any write to users."""
+    _users_by_id.invalidate(user_id)
+    _users_by_phone.invalidate(user_id)
+
+
+def user_cache_stats() -> Dict[str, Any]:
+    return {"by_id": _users_by_id.stats(), "by_phone": _users_by_phone.stats()}
+
+
+_USER_COLUMNS = "id, name, district, crop, state, email, phone_number, language"
+# Login and voice lookups also need the password hash
+_USER_AUTH_COLUMNS = "id, name, district, crop, state, email, password_hash, phone_number, language"
+_INSERT_USER_SQL = (
+    "INSERT INTO users (id, name, district, crop, state, email, password_hash, phone_number, language) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
 
 def insert_user(
     name: str,
@@ -208,37 +930,48 @@ def insert_user(
     with get_db_connection() as conn:
         cursor = conn.cursor()
         cursor.execute(
-            "INSERT INTO users (id, name, district, crop, state, email, password_hash, phone_number, language) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            _INSERT_USER_SQL,
             (new_user_id, name, district, crop, state, email, password_hash, normalized_phone, language),
         )
         conn.commit()
+    # A new user can turn cached "not found" answers (e.g. a phone probe) into hits
+    invalidate_user_cache(new_user_id)
     return new_user_id
 
 
 def fetch_users() -> List[Dict[str, Any]]:
     with get_db_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute("SELECT id, name, district, crop, state, email, phone_number, language FROM users ORDER BY name")
+        cursor.execute(f"SELECT {_USER_COLUMNS} FROM users ORDER BY name")
         return [dict(row) for row in cursor.fetchall()]
 
 
 def fetch_user_by_id(user_id: str) -> Optional[Dict[str, Any]]:
+    cached = _users_by_id.get(user_id)
+    if cached is not _MISSING:
+        return cached
     with get_db_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute("SELECT id, name, district, crop, state, email, phone_number, language FROM users WHERE id = ?", (user_id,))
+        cursor.execute(f"SELECT {_USER_COLUMNS} FROM users WHERE id = ?", (user_id,))
         row = cursor.fetchone()
-        return dict(row) if row else None
+        user = dict(row) if row else None
+    _users_by_id.put(user_id, user)
+    return user
 
 
 def fetch_user_by_email(email: str) -> Optional[Dict[str, Any]]:
     with get_db_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute("SELECT id, name, district, crop, state, email, password_hash, phone_number, language FROM users WHERE email = ?", (email,))
+        cursor.execute(f"SELECT {_USER_AUTH_COLUMNS} FROM users WHERE email = ?", (email,))
         row = cursor.fetchone()
         return dict(row) if row else None
 
 
 def fetch_user_by_phone(phone_number: str) -> Optional[Dict[str, Any]]:
+    cached = _users_by_phone.get(phone_number)
+    if cached is not _MISSING:
+        return cached
+    user = None
     with get_db_connection() as conn:
         cursor = conn.cursor()
         # Normalize lookup to match stored canonical format
@@ -246,18 +979,21 @@ def fetch_user_by_phone(phone_number: str) -> Optional[Dict[str, Any]]:
         for probe in [normalized, phone_number]:
             if not probe:
                 continue
-            cursor.execute(
-                "SELECT id, name, district, crop, state, email, password_hash, phone_number, language FROM users WHERE phone_number = ?",
-                (probe,),
-            )
+            cursor.execute(f"SELECT {_USER_AUTH_COLUMNS} FROM users WHERE phone_number = ?", (probe,))
             row = cursor.fetchone()
             if row:
-                return dict(row)
-        return None
+                user = dict(row)
+                break
+    _users_by_phone.put(phone_number, user)
+    return user
+
+
+# bcrypt work factor for new hashes; existing hashes keep the cost they were created with
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
 
 
 def hash_password(plain_password: str) -> str:
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
     return bcrypt.hashpw(plain_password.encode("utf-8"), salt).decode("utf-8")
 
 
@@ -0,0 +1,117 @@
+"""Background precomputation of price forecasts.
+
+Fitting the ARIMA/GARCH suite takes tens of seconds per crop, too long to do
+while a farmer waits.  This scheduler fits every crop in ``COMMODITY_URLS``
+plus the profile crops of recently active users ahead of time and stores the
+results in the ``price_forecasts`` table, where ``/predict_price``,
+``/model_comparison`` and price-forecast questions read them.
+
+Each cycle re-downloads the price series (every
+``FORECAST_REFRESH_INTERVAL_SECONDS``, by default as often as the download
+cache expires) and refits only the crops whose last observation changed, so a
+restart or a cycle without new data costs a few HTTP calls.  Endpoints serve
+the stored row however old it is and fit on demand only for a crop that has
+nothing stored, so keeping rows current is up to this scheduler.
+
+The scheduler runs as a daemon thread inside the app (``FORECAST_SCHEDULER=0``
+turns it off, e.g. when several workers share one database) or as a one-shot
+job: ``python precompute_forecasts.py``.
+
+Usage::
+
+    from backend.forecast_scheduler import forecast_scheduler
+    forecast_scheduler.start()
+"""
+
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from . import database
+from .lexicon import normalize_crop
+from .market_price_prediction import COMMODITY_URLS, PRICE_DATA_TTL_SECONDS, refresh_forecast
+
+FORECAST_SCHEDULER = os.getenv("FORECAST_SCHEDULER", "1").lower() in {"1", "true", "yes", "y"}
+FORECAST_REFRESH_INTERVAL_SECONDS = float(os.getenv("FORECAST_REFRESH_INTERVAL_SECONDS", str(PRICE_DATA_TTL_SECONDS)))
+# Profile crops are precomputed for users with a conversation in this many days
+FORECAST_ACTIVE_USER_DAYS = int(os.getenv("FORECAST_ACTIVE_USER_DAYS", "30"))
+
+
+def forecast_crops() -> List[str]:
+    """Crops with a price feed, then the crops of active users, without duplicates."""
+    crops = dict.fromkeys(COMMODITY_URLS)
+    for crop in database.fetch_active_profile_crops(FORECAST_ACTIVE_USER_DAYS):
+        crops.setdefault(normalize_crop(crop), None)
+    return list(crops)
+
+
+def precompute(
+    crops: Optional[Iterable[str]] = None, force: bool = False, stop: Optional[threading.Event] = None
+) -> Dict[str, Any]:
+    """Refresh the stored forecast of every crop. Blocking; returns crops grouped by outcome."""
+    started = time.monotonic()
+    report: Dict[str, Any] = {"fitted": [], "unchanged": [], "fresh": [], "no_data": [], "failed": []}
+    for crop in (list(crops) if crops is not None else forecast_crops()):
+        if stop is not None and stop.is_set():
+            break
+        try:
+            outcome = refresh_forecast(crop, force=force)
+        except Exception as e:
+            print(f"[ForecastScheduler] {crop} failed: {e}")
+            outcome = "failed"
+        report[outcome].append(crop)
+    report["seconds"] = round(time.monotonic() - started, 1)
+    print(
+        f"[ForecastScheduler] {len(report['fitted'])} fitted, {len(report['unchanged'])} unchanged, "
+        f"{len(report['fresh'])} fresh, {len(report['failed'])} failed in {report['seconds']}s"
+    )
+    return report
+
+
+class ForecastScheduler:
+    """Daemon thread that calls ``precompute()`` every ``interval`` seconds."""
+
+    def __init__(self, interval: float = 6 * 3600):
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_run: Optional[float] = None
+        self._last_report: Optional[Dict[str, Any]] = None
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="forecast-scheduler", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self._last_report = precompute(stop=self._stop)
+            except Exception as e:
+                print(f"[ForecastScheduler] cycle failed: {e}")
+            self._last_run = time.time()
+            self._stop.wait(self.interval)
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Stop after the crop being fitted (called on application shutdown)."""
+        thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._stop.set()
+        thread.join(timeout=timeout)
+        if thread.is_alive():
+            print("[ForecastScheduler] shutdown timed out while a fit was running")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._thread is not None and self._thread.is_alive(),
+            "interval_seconds": self.interval,
+            "last_run": self._last_run,
+            "last_report": self._last_report,
+        }
+
+
+forecast_scheduler = ForecastScheduler(FORECAST_REFRESH_INTERVAL_SECONDS)
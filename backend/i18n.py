@@ -0,0 +1,71 @@
+"""Locale catalogs for templated (non-LLM) content.
+
+Fixed strings such as welcome messages, crop-activity calendars, weather-alert
+templates and the deterministic price comparison live in
+``backend/locales/<lang>.json``.  ``en.json`` is the hand-maintained source;
+other languages are produced ahead of time by ``build_locale_catalogs.py`` and
+reviewed before being committed, so serving templated responses never calls a
+translation service at request time.
+
+Usage::
+
+    from backend.i18n import t, language_code
+    lang = language_code(user.get("language"))
+    t("weather_alerts.frost.message", lang, min_temp=3.2, day_name=t("weather_alerts.day.today", lang))
+"""
+
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+LOCALES_DIR = Path(__file__).resolve().parent / "locales"
+DEFAULT_LANGUAGE = "en"
+
+
+def language_code(value: Optional[str]) -> str:
+    """Map a stored profile language ("Hindi", "hi", "हिंदी", ...) to a catalog code."""
+    l = (value or "").strip().lower()
+    if l in {"hindi", "hi", "हिन्दी", "हिंदी"} or ("हिं" in l) or ("हिन्द" in l):
+        return "hi"
+    if len(l) == 2 and (LOCALES_DIR / f"{l}.json").is_file():
+        return l
+    return DEFAULT_LANGUAGE
+
+
+@lru_cache(maxsize=None)
+def load_catalog(lang: str) -> Dict[str, Any]:
+    """Load a catalog once per process; unknown languages yield an empty catalog."""
+    path = LOCALES_DIR / f"{lang}.json"
+    if not path.is_file():
+        return {}
+    with path.open(encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _lookup(catalog: Dict[str, Any], key: str) -> Any:
+    node: Any = catalog
+    for part in key.split("."):
+        if not isinstance(node, dict) or part not in node:
+            return None
+        node = node[part]
+    return node
+
+
+def lookup(key: str, lang: str = DEFAULT_LANGUAGE, default: Any = None) -> Any:
+    """Return the raw catalog value (string, list or dict) for a dotted key.
+
+    Falls back to the English catalog, then to ``default``.
+    """
+    value = _lookup(load_catalog(lang), key)
+    if value is None and lang != DEFAULT_LANGUAGE:
+        value = _lookup(load_catalog(DEFAULT_LANGUAGE), key)
+    return default if value is None else value
+
+
+def t(key: str, lang: str = DEFAULT_LANGUAGE, default: Optional[str] = None, **params: Any) -> str:
+    """Return the formatted string for ``key`` in ``lang``."""
+    template = lookup(key, lang, default)
+    if template is None:
+        return key
+    return template.format(**params) if params else template
@@ -0,0 +1,149 @@
+"""Shared crop and intent lexicon for routing questions.
+
+``/ask`` used to decide its route with several ``any(kw in question.lower())``
+scans, and crop names were resolved by three diverging dictionaries (two in
+``routes.py``, one in ``alerter.py``).  All of those terms now live here:
+canonical crops with their English, Hindi and romanised-Hindi synonyms, and
+the intent keywords in priority order.
+
+Every term is compiled into one regex shaped like a character trie (so a
+position is rejected after one character test) and wrapped in a lookahead, so
+a single ``finditer`` pass over the question reports the longest term starting
+at each position, overlapping ones included, which keeps the old substring
+semantics.  Latin-script terms must start at a word boundary, so "price" no
+longer counts as a mention of rice; Devanagari terms match anywhere, as
+before.
+
+Usage::
+
+    from backend.lexicon import analyze, normalize_crop
+    crop, intent = analyze("गेहूं का भाव क्या है?")     # ("wheat", "price")
+"""
+
+import re
+from typing import Dict, Optional, Tuple
+
+# canonical crop -> synonyms (English, Hindi, romanised Hindi)
+CROP_SYNONYMS: Dict[str, Tuple[str, ...]] = {
+    "wheat": ("wheat", "gehun", "gehu", "गेहूं", "गेहुँ", "गेहूँ"),
+    "rice": ("rice", "paddy", "chawal", "धान", "चावल"),
+    "sugarcane": ("sugarcane", "ganna", "गन्ना"),
+    "cotton": ("cotton", "kapas", "कपास"),
+    "maize": ("maize", "corn", "makka", "makki", "मक्का"),
+    "soybean": ("soybean", "soyabean", "सोयाबीन"),
+    "mustard": ("mustard", "sarson", "सरसों"),
+    "onion": ("onion", "pyaz", "pyaaz", "प्याज"),
+    "potato": ("potato", "aloo", "आलू"),
+    "tomato": ("tomato", "tamatar", "टमाटर"),
+    "ragi": ("ragi", "finger millet", "mandua", "nachni", "नाचनी", "मंडुआ"),
+    "millet": ("millet", "millets", "bajra", "pearl millet", "बाजरा"),
+}
+
+# intent -> keywords; when several intents match, the first listed wins
+INTENT_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    "price_forecast": (
+        "price prediction", "price forecast", "future price", "price tomorrow",
+        "price next week", "predict price", "price trend", "will price",
+        "price hoga", "bhav kya hoga", "दाम क्या होगा", "भाव भविष्य",
+    ),
+    "price": ("price", "market", "rate", "mandi", "cost", "भाव", "दाम", "मंडी", "कीमत"),
+    "yield": (
+        "yield", "harvest", "production", "output", "predict yield",
+        "expected yield", "crop yield", "how much", "kitna paida",
+        "उपज", "पैदावार", "फसल उत्पादन", "कितना होगा",
+    ),
+}
+
+# Phrases asking for advice or explanation rather than a price lookup; such
+# questions need free-form reasoning instead of a rendered price table
+REASONING_KEYWORDS: Tuple[str, ...] = (
+    "why", "should", "when", "which is better", "best time", "hold", "wait", "store",
+    "profit", "loss", "transport", "worth", "advice", "suggest", "explain", "compare",
+    "kyon", "kyu", "kab", "chahiye", "kya karu", "fayda",
+    "क्यों", "कब", "चाहिए", "सलाह", "मुनाफा", "फायदा", "नुकसान", "क्या करूं",
+)
+
+_INTENT_RANK = {intent: rank for rank, intent in enumerate(INTENT_KEYWORDS)}
+
+# term -> ("crop" | "intent", canonical crop or intent name)
+_TERMS: Dict[str, Tuple[str, str]] = {}
+for _intent, _keywords in INTENT_KEYWORDS.items():
+    for _term in _keywords:
+        _TERMS.setdefault(_term, ("intent", _intent))
+for _crop, _synonyms in CROP_SYNONYMS.items():
+    for _term in _synonyms:
+        _TERMS.setdefault(_term, ("crop", _crop))
+
+_CROP_LOOKUP = {term: crop for crop, synonyms in CROP_SYNONYMS.items() for term in synonyms}
+
+
+def _trie_pattern(terms) -> str:
+    """Regex for ``terms`` as a character trie, so each position fails on its first character.
+
+    Optional suffixes are greedy, so the longest term starting at a position wins.
+    """
+    trie: Dict[str, dict] = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        pattern = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{pattern})?" if "" in node else pattern
+
+    return build(trie)
+
+
+# Word boundary only for ASCII terms: \b is unreliable next to Devanagari vowel signs
+_MATCHER = re.compile(
+    "(?=("
+    + r"\b" + _trie_pattern(t for t in _TERMS if t.isascii())
+    + "|" + _trie_pattern(t for t in _TERMS if not t.isascii())
+    + "))"
+)
+
+_REASONING_MATCHER = re.compile(
+    r"\b" + _trie_pattern(t for t in REASONING_KEYWORDS if t.isascii())
+    + "|" + _trie_pattern(t for t in REASONING_KEYWORDS if not t.isascii())
+)
+
+
+def analyze(question: str) -> Tuple[str, Optional[str]]:
+    """Return ``(crop, intent)`` for a question in one pass.
+
+    ``crop`` is the canonical name of the first crop mentioned ("" if none);
+    ``intent`` is the highest-priority intent matched, or ``None``.
+    """
+    crop = ""
+    intent: Optional[str] = None
+    for match in _MATCHER.finditer((question or "").lower()):
+        kind, value = _TERMS[match.group(1)]
+        if kind == "crop":
+            crop = crop or value
+        elif intent is None or _INTENT_RANK[value] < _INTENT_RANK[intent]:
+            intent = value
+    return crop, intent
+
+
+def extract_crop(question: str) -> str:
+    return analyze(question)[0]
+
+
+def detect_intent(question: str) -> Optional[str]:
+    return analyze(question)[1]
+
+
+def needs_reasoning(question: str) -> bool:
+    """True if the question asks for advice or an explanation, not just the numbers."""
+    return _REASONING_MATCHER.search((question or "").lower()) is not None
+
+
+def normalize_crop(crop: str) -> str:
+    """Map a profile or user-entered crop name (English/Hindi) to its canonical key; unknown names pass through."""
+    c = (crop or "").strip().lower()
+    return _CROP_LOOKUP.get(c, c)
@@ -1,6 +1,15 @@
 from fastapi import FastAPI
 from backend.routes import router as api_router  
 from backend.voice import router as voice_router
+from backend.translation import shutdown_translation_pool
+from backend.database import close_db_connections
+from backend import async_database
+from backend.mandi_prices import close_client as close_mandi_client
+from backend.migrations import migrate
+from backend.conversation_writer import conversation_writer
+from backend.forecast_scheduler import FORECAST_SCHEDULER, forecast_scheduler
+from backend.market_price_prediction import shutdown_fit_pool
+from backend.passwords import shutdown_password_pool
 from fastapi.middleware.cors import CORSMiddleware
 
 app = FastAPI()
@@ -17,3 +26,24 @@ app.add_middleware(
 
 app.include_router(api_router)
 app.include_router(voice_router)
+
+
+@app.on_event("startup")
+def _startup():
+    # Bring documents.db to the latest schema before serving requests
+    migrate()
+    # Precompute price forecasts in the background (FORECAST_SCHEDULER=0 to disable)
+    if FORECAST_SCHEDULER:
+        forecast_scheduler.start()
+
+
+@app.on_event("shutdown")
+async def _shutdown():
+    shutdown_translation_pool()
+    conversation_writer.close()
+    forecast_scheduler.close()
+    shutdown_fit_pool()
+    shutdown_password_pool()
+    await close_mandi_client()
+    await async_database.close_db_connections()
+    close_db_connections()
@@ -0,0 +1,200 @@
+"""Nearest-mandi lookups over the district gazetteer.
+
+Price comparisons used to come from a hand-written map of 13 districts.  Instead
+the ``district_gazetteer`` table (seeded from ``data/district_gazetteer.csv``
+and extended by persisted geocoding) is loaded into a scikit-learn ``BallTree``
+with the haversine metric, one tree per commodity over just the districts that
+have stored prices for it.  A lookup is a single tree query, microseconds once
+the tree is built; trees are rebuilt after ``MANDI_GEO_INDEX_TTL_SECONDS`` or
+when ``invalidate_indexes()`` is called after an ingestion run.
+
+Before any prices have been ingested, the tree over the whole gazetteer is used
+so comparisons still fall back to live API lookups for the nearest districts.
+
+Coordinates for districts missing from the gazetteer are geocoded through the
+OpenWeatherMap API once and written back, including "not found" answers, so a
+district is never geocoded twice.
+
+Usage::
+
+    from backend.mandi_geo import nearest_mandis
+    nearby = await nearest_mandis("agra", "wheat")      # ["mathura", "firozabad", ...]
+"""
+
+import asyncio
+import os
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import requests
+from sklearn.neighbors import BallTree
+
+from . import async_database, database
+
+NEARBY_MANDI_COUNT = int(os.getenv("NEARBY_MANDI_COUNT", "3"))
+NEARBY_MANDI_MAX_KM = float(os.getenv("NEARBY_MANDI_MAX_KM", "250"))
+MANDI_GEO_INDEX_TTL_SECONDS = float(os.getenv("MANDI_GEO_INDEX_TTL_SECONDS", "3600"))
+# One key for every geocoding path (requests, ingestion, routes.get_coordinates)
+OPENWEATHER_API_KEY = os.getenv("OPENWEATHER_API_KEY", "05b6e91c54291c719f5226c3ff40a9a5")
+
+EARTH_RADIUS_KM = 6371.0088
+_SUFFIXES = (" urban", " rural", " district")
+
+
+class DistrictIndex:
+    """Haversine BallTree over district coordinates given in degrees."""
+
+    def __init__(self, names: Sequence[str], coordinates: Sequence[Tuple[float, float]]):
+        self.names = list(names)
+        self._tree = BallTree(np.radians(np.asarray(coordinates, dtype=float)), metric="haversine")
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def nearest(
+        self, latitude: float, longitude: float, k: int, max_km: float, exclude: str = ""
+    ) -> List[Tuple[str, float]]:
+        """Up to ``k`` ``(district, km)`` pairs within ``max_km``, closest first."""
+        count = min(k + 1, len(self.names))
+        if count == 0:
+            return []
+        distances, indices = self._tree.query(np.radians([[latitude, longitude]]), k=count)
+        results = []
+        for distance, index in zip(distances[0] * EARTH_RADIUS_KM, indices[0]):
+            name = self.names[index]
+            if name == exclude or distance > max_km:
+                continue
+            results.append((name, float(distance)))
+        return results[:k]
+
+
+# commodity ("" for the whole gazetteer) -> (built_at, index)
+_indexes: Dict[str, Tuple[float, Optional[DistrictIndex]]] = {}
+_coordinates: Dict[str, Tuple[float, float]] = {}
+_coordinates_loaded_at: Optional[float] = None
+
+
+def invalidate_indexes() -> None:
+    """Drop cached trees so the next lookup sees new gazetteer entries and prices."""
+    global _coordinates_loaded_at
+    _indexes.clear()
+    _coordinates_loaded_at = None
+
+
+def normalize_district(district: str) -> str:
+    name = (district or "").strip().lower()
+    for suffix in _SUFFIXES:
+        if name.endswith(suffix):
+            name = name[: -len(suffix)].strip()
+    return name
+
+
+async def _gazetteer() -> Dict[str, Tuple[float, float]]:
+    global _coordinates, _coordinates_loaded_at
+    if _coordinates_loaded_at is None or time.monotonic() - _coordinates_loaded_at > MANDI_GEO_INDEX_TTL_SECONDS:
+        rows = await async_database.fetch_gazetteer()
+        _coordinates = {row["district"]: (row["latitude"], row["longitude"]) for row in rows}
+        _coordinates_loaded_at = time.monotonic()
+    return _coordinates
+
+
+async def _index(commodity: str) -> Optional[DistrictIndex]:
+    entry = _indexes.get(commodity)
+    if entry is not None and time.monotonic() - entry[0] <= MANDI_GEO_INDEX_TTL_SECONDS:
+        return entry[1]
+
+    coordinates = await _gazetteer()
+    names = list(coordinates)
+    if commodity:
+        with_data = set(await async_database.fetch_mandi_districts(commodity))
+        names = [name for name in names if name in with_data]
+    index = DistrictIndex(names, [coordinates[name] for name in names]) if names else None
+    _indexes[commodity] = (time.monotonic(), index)
+    return index
+
+
+async def nearest_mandis(
+    district: str, commodity: str, k: int = NEARBY_MANDI_COUNT, max_km: float = NEARBY_MANDI_MAX_KM
+) -> List[str]:
+    """The ``k`` districts nearest to ``district`` that have prices for ``commodity``.
+
+    Falls back to the nearest gazetteer districts when no stored prices exist
+    for the commodity; returns ``[]`` when the district cannot be located.
+    """
+    name = normalize_district(district)
+    coordinates = (await _gazetteer()).get(name)
+    if coordinates is None:
+        coordinates = await asyncio.to_thread(district_coordinates, name)
+        if coordinates is None:
+            return []
+        invalidate_indexes()
+
+    index = await _index(commodity) or await _index("")
+    if index is None:
+        return []
+    return [nearby for nearby, _ in index.nearest(*coordinates, k=k, max_km=max_km, exclude=name)]
+
+
+def geocode(district: str, state: Optional[str] = None, api_key: Optional[str] = None) -> Optional[Tuple[float, float]]:
+    """Look a district up with the OpenWeatherMap geocoding API. Blocking.
+
+    Returns ``None`` when the API does not know the place; transport errors
+    propagate so callers do not record a transient failure as permanent.
+    """
+    queries = [f"{district},{state},IN" if state else district]
+    clean = normalize_district(district)
+    if clean != district.strip().lower():
+        queries.append(clean)
+    for query in queries:
+        resp = requests.get(
+            "http://api.openweathermap.org/geo/1.0/direct",
+            params={"q": query, "limit": 1, "appid": api_key or OPENWEATHER_API_KEY},
+            timeout=5,
+        )
+        if resp.status_code == 200 and resp.json():
+            data = resp.json()[0]
+            return (data["lat"], data["lon"])
+    return None
+
+
+def district_coordinates(district: str, api_key: Optional[str] = None) -> Optional[Tuple[float, float]]:
+    """Coordinates from the gazetteer, geocoding and persisting unknown districts. Blocking."""
+    name = normalize_district(district)
+    if not name:
+        return None
+    row = database.fetch_district_coordinates(name)
+    if row is not None:
+        return None if row["latitude"] is None else (row["latitude"], row["longitude"])
+    if not (api_key or OPENWEATHER_API_KEY):
+        return None
+    try:
+        coordinates = geocode(district, api_key=api_key)
+    except (requests.RequestException, ValueError, KeyError) as e:
+        print(f"[MandiGeo] geocoding failed for {district}: {e}")
+        return None
+    latitude, longitude = coordinates or (None, None)
+    database.store_district_coordinates(name, latitude, longitude, "geocoded" if coordinates else "failed")
+    return coordinates
+
+
+def geocode_missing_districts(api_key: Optional[str] = None) -> Dict[str, int]:
+    """Geocode every district in the price store that the gazetteer lacks. Blocking."""
+    report = {"geocoded": 0, "failed": 0, "errors": 0}
+    if not (api_key or OPENWEATHER_API_KEY):
+        print("[MandiGeo] OPENWEATHER_API_KEY not set; skipping geocoding of new districts")
+        return report
+    for row in database.fetch_ungeocoded_mandi_districts():
+        try:
+            coordinates = geocode(row["district"], row["state"], api_key)
+        except (requests.RequestException, ValueError, KeyError) as e:
+            print(f"[MandiGeo] geocoding failed for {row['district']}: {e}")
+            report["errors"] += 1
+            continue
+        latitude, longitude = coordinates or (None, None)
+        database.store_district_coordinates(
+            row["district"], latitude, longitude, "geocoded" if coordinates else "failed", row["state"]
+        )
+        report["geocoded" if coordinates else "failed"] += 1
+    invalidate_indexes()
+    return report
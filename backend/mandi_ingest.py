@@ -0,0 +1,140 @@
+"""Bulk ingestion of the data.gov.in mandi price resource into documents.db.
+
+Request-time lookups ask the API for one record per district and crop.  This
+job instead pages through the whole resource (``MANDI_INGEST_PAGE_SIZE``
+records per call) and upserts every record into the ``mandi_prices`` table,
+which is clustered on (commodity, district, arrival_date), so the price
+endpoints answer from local indexed data.
+
+Runs are incremental: once the store has data, only the newest stored arrival
+date (it may have been partial) and the days after it are requested, one
+filtered pass per day.  The first run, or ``full=True``, pages through the
+entire resource.
+
+Usage::
+
+    from backend.mandi_ingest import ingest
+    report = ingest()          # or: python ingest_mandi_prices.py
+"""
+
+import os
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional
+
+import httpx
+
+from . import database
+from .mandi_prices import DATA_GOV_API_KEY, MANDI_HTTP_TIMEOUT_SECONDS, MANDI_PRICE_RESOURCE_URL
+
+MANDI_INGEST_PAGE_SIZE = int(os.getenv("MANDI_INGEST_PAGE_SIZE", "1000"))
+
+API_DATE_FORMAT = "%d/%m/%Y"
+
+
+def _iso_date(value: Optional[str]) -> Optional[str]:
+    try:
+        return datetime.strptime((value or "").strip(), API_DATE_FORMAT).date().isoformat()
+    except ValueError:
+        return None
+
+
+def _number(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def record_row(record: Dict[str, Any]) -> Optional[tuple]:
+    """Map an API record to a ``mandi_prices`` row; ``None`` if it lacks the key fields."""
+    arrival_date = _iso_date(record.get("arrival_date"))
+    district = (record.get("district") or "").strip().lower()
+    commodity = (record.get("commodity") or "").strip().lower()
+    market = (record.get("market") or "").strip()
+    if not (arrival_date and district and commodity and market):
+        return None
+    return (
+        commodity,
+        district,
+        arrival_date,
+        market,
+        (record.get("variety") or "").strip(),
+        (record.get("grade") or "").strip(),
+        (record.get("state") or "").strip() or None,
+        _number(record.get("min_price")),
+        _number(record.get("max_price")),
+        _number(record.get("modal_price")),
+    )
+
+
+def iter_pages(client: httpx.Client, filters: Optional[Dict[str, str]] = None) -> Iterator[List[Dict[str, Any]]]:
+    """Yield successive pages of records until the resource is exhausted.
+
+    Paging follows the response's ``total`` when it has one; without it, a
+    page shorter than ``MANDI_INGEST_PAGE_SIZE`` ends the run.
+    """
+    offset = 0
+    while True:
+        params = {
+            "api-key": DATA_GOV_API_KEY,
+            "format": "json",
+            "limit": MANDI_INGEST_PAGE_SIZE,
+            "offset": offset,
+        }
+        for field, value in (filters or {}).items():
+            params[f"filters[{field}]"] = value
+        response = client.get(MANDI_PRICE_RESOURCE_URL, params=params)
+        response.raise_for_status()
+        payload = response.json()
+        records = payload.get("records") or []
+        if not records:
+            return
+        yield records
+        offset += len(records)
+        total = int(payload.get("total") or 0)
+        if total:
+            # The API may cap limit below MANDI_INGEST_PAGE_SIZE, so a short page is not the end
+            if offset >= total:
+                return
+        elif len(records) < MANDI_INGEST_PAGE_SIZE:
+            return
+
+
+def _dates_from(latest: str, until: date) -> List[date]:
+    day = date.fromisoformat(latest)
+    days = []
+    while day <= until:
+        days.append(day)
+        day += timedelta(days=1)
+    return days
+
+
+def ingest(full: bool = False, client: Optional[httpx.Client] = None) -> Dict[str, Any]:
+    """Fetch new (or, with ``full``, all) records into ``mandi_prices``. Returns a report."""
+    latest_before = database.latest_mandi_arrival_date()
+    if full or latest_before is None:
+        passes: List[Optional[Dict[str, str]]] = [None]
+    else:
+        passes = [{"arrival_date": day.strftime(API_DATE_FORMAT)} for day in _dates_from(latest_before, date.today())]
+
+    own_client = client is None
+    client = client or httpx.Client(timeout=httpx.Timeout(MANDI_HTTP_TIMEOUT_SECONDS * 3))
+    report = {"passes": len(passes), "pages": 0, "records": 0, "stored": 0, "skipped": 0}
+    try:
+        for filters in passes:
+            for records in iter_pages(client, filters):
+                rows = [row for row in map(record_row, records) if row is not None]
+                report["pages"] += 1
+                report["records"] += len(records)
+                report["skipped"] += len(records) - len(rows)
+                report["stored"] += database.store_mandi_records(rows)
+    finally:
+        if own_client:
+            client.close()
+    report["latest_before"] = latest_before
+    report["latest_after"] = database.latest_mandi_arrival_date()
+    print(
+        f"[MandiIngest] {report['stored']} records stored from {report['pages']} pages "
+        f"(latest arrival date {latest_before} -> {report['latest_after']})"
+    )
+    return report
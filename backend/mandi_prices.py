@@ -0,0 +1,228 @@
+"""Concurrent mandi price lookups against the data.gov.in API.
+
+A price comparison needs the user's district plus a handful of nearby mandis.
+Each lookup is an independent HTTP call to the same host, so they are issued
+concurrently through one long-lived ``httpx.AsyncClient``: connections are
+kept alive between requests and capped per host, and the fan-out is bounded by
+a deadline.  Districts that have not answered by then are dropped and the
+caller gets whatever arrived in time, instead of waiting on the slowest mandi.
+
+Mandi prices change at most daily, so every record fetched is cached in
+documents.db (``mandi_price_cache``, keyed by district, commodity and arrival
+date).  A cached price younger than ``MANDI_PRICE_TTL_SECONDS`` is served
+as-is; an older one is still served immediately while a background task
+refreshes it from the API (stale-while-revalidate).  Only districts never seen
+before wait on data.gov.in.
+
+Both sit behind the local price store filled by ``ingest_mandi_prices.py``
+(``backend/mandi_ingest.py``): when it holds a recent enough arrival date for
+the district and commodity, the average modal price over the district's
+markets on that date is served without any API call.
+
+Usage::
+
+    from backend.mandi_prices import fetch_prices
+    prices = await fetch_prices(["agra", "mathura", "firozabad"], "wheat")
+"""
+
+import asyncio
+import os
+import random
+import time
+from datetime import date
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import httpx
+
+from . import async_database
+
+DATA_GOV_API_KEY = os.getenv("DATA_GOV_API_KEY")
+MANDI_PRICE_RESOURCE_URL = "https://api.data.gov.in/resource/9ef84268-d588-465a-a308-a864a43d0070"
+
+# Per-request timeout, and the overall budget for one fan-out across districts
+MANDI_HTTP_TIMEOUT_SECONDS = float(os.getenv("MANDI_HTTP_TIMEOUT_SECONDS", "10"))
+MANDI_FETCH_DEADLINE_SECONDS = float(os.getenv("MANDI_FETCH_DEADLINE_SECONDS", "4"))
+# Every lookup goes to api.data.gov.in, so the pool limit is the per-host limit
+MANDI_MAX_CONNECTIONS = int(os.getenv("MANDI_MAX_CONNECTIONS", "8"))
+# Cached prices older than this are refreshed in the background (still served meanwhile)
+MANDI_PRICE_TTL_SECONDS = float(os.getenv("MANDI_PRICE_TTL_SECONDS", str(6 * 3600)))
+
+# Local store rows older than this are ignored in favour of the cache / live API
+MANDI_STORE_MAX_AGE_DAYS = int(os.getenv("MANDI_STORE_MAX_AGE_DAYS", "7"))
+
+UNIT = 'INR/quintal'
+
+# Demo prices used when the API has no record for a district/crop
+_BASE_PRICES = {
+    'wheat': 2500, 'rice': 3000, 'sugarcane': 3500, 'cotton': 6000,
+    'maize': 2200, 'soybean': 4500, 'mustard': 5000, 'onion': 1500,
+    'potato': 1200, 'tomato': 2000,
+    'ragi': 2800, 'millet': 2200,
+}
+
+_client: Optional[httpx.AsyncClient] = None
+# In-flight API fetches, keyed by (district, crop); holds task references
+_refreshing: Dict[Tuple[str, str], "asyncio.Task[Optional[dict]]"] = {}
+_stats = {"store_hits": 0, "fresh_hits": 0, "stale_hits": 0, "misses": 0, "api_fetches": 0}
+
+
+def _get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=httpx.Timeout(MANDI_HTTP_TIMEOUT_SECONDS),
+            limits=httpx.Limits(
+                max_connections=MANDI_MAX_CONNECTIONS,
+                max_keepalive_connections=MANDI_MAX_CONNECTIONS,
+                keepalive_expiry=60.0,
+            ),
+        )
+    return _client
+
+
+async def close_client() -> None:
+    """Cancel pending refreshes and close the shared HTTP client (called on application shutdown)."""
+    global _client
+    for task in list(_refreshing.values()):
+        task.cancel()
+    _refreshing.clear()
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def _mock_price(district: str, crop: str) -> Optional[dict]:
+    # Fallback: generate demo data when the API has nothing for this mandi.
+    # Remove this in production and handle API errors appropriately
+    if crop not in _BASE_PRICES:
+        return None
+    return {
+        'district': district,
+        'crop': crop,
+        'price': _BASE_PRICES[crop] + random.randint(-200, 300),
+        'unit': UNIT,
+        'date': 'Today'
+    }
+
+
+def _price(district: str, crop: str, price: Any, date: str) -> dict:
+    return {'district': district, 'crop': crop, 'price': price, 'unit': UNIT, 'date': date}
+
+
+async def _fetch_live(district: str, crop: str) -> Optional[dict]:
+    """Latest record from data.gov.in, cached on success; ``None`` if there is none."""
+    params = {
+        'api-key': DATA_GOV_API_KEY,
+        'format': 'json',
+        'filters[district]': district.title(),
+        'filters[commodity]': crop.title(),
+        'limit': 1
+    }
+    try:
+        response = await _get_client().get(MANDI_PRICE_RESOURCE_URL, params=params)
+        if response.status_code != 200:
+            return None
+        records = response.json().get('records') or []
+    except (httpx.HTTPError, ValueError) as e:
+        print(f"[MandiPrices] API call failed for {district}, {crop}: {e}")
+        return None
+    if not records:
+        return None
+    record = records[0]
+    price = _price(district, crop, record.get('modal_price', 'N/A'), record.get('arrival_date', 'N/A'))
+    await async_database.store_mandi_price(district, crop, price['date'], price['price'], UNIT)
+    return price
+
+
+async def _refresh(district: str, crop: str) -> Optional[dict]:
+    _stats["api_fetches"] += 1
+    try:
+        return await _fetch_live(district, crop)
+    except Exception as e:
+        print(f"[MandiPrices] refresh failed for {district}, {crop}: {e}")
+        return None
+    finally:
+        _refreshing.pop((district, crop), None)
+
+
+def _schedule_refresh(district: str, crop: str) -> "asyncio.Task[Optional[dict]]":
+    """Start (or join) the single in-flight API fetch for a district/crop."""
+    key = (district, crop)
+    if key not in _refreshing:
+        _refreshing[key] = asyncio.create_task(_refresh(district, crop))
+    return _refreshing[key]
+
+
+async def _stored_price(district: str, crop: str) -> Optional[dict]:
+    stored = await async_database.fetch_stored_mandi_price(district, crop)
+    if stored is None:
+        return None
+    arrival = date.fromisoformat(stored['arrival_date'])
+    if (date.today() - arrival).days > MANDI_STORE_MAX_AGE_DAYS:
+        return None
+    # Same dd/mm/yyyy form the API returns
+    return _price(district, crop, stored['modal_price'], arrival.strftime('%d/%m/%Y'))
+
+
+async def fetch_price_for_district(district: str, crop: str) -> Optional[dict]:
+    """Latest modal price for one district and crop, or ``None``.
+
+    Served from the local store or the cache when possible; stale cache
+    entries trigger a background refresh.
+    """
+    stored = await _stored_price(district, crop)
+    if stored is not None:
+        _stats["store_hits"] += 1
+        return stored
+
+    cached = await async_database.fetch_cached_mandi_price(district, crop)
+    if cached is not None:
+        if time.time() - cached['fetched_at'] < MANDI_PRICE_TTL_SECONDS:
+            _stats["fresh_hits"] += 1
+        else:
+            _stats["stale_hits"] += 1
+            _schedule_refresh(district, crop)
+        return _price(district, crop, cached['price'], cached['arrival_date'])
+
+    _stats["misses"] += 1
+    # Shielded so a caller hitting its deadline does not cancel the fetch that fills the cache
+    return await asyncio.shield(_schedule_refresh(district, crop)) or _mock_price(district, crop)
+
+
+def price_cache_stats() -> Dict[str, Any]:
+    return {**_stats, "refreshing": len(_refreshing), "ttl_seconds": MANDI_PRICE_TTL_SECONDS}
+
+
+async def fetch_prices(
+    districts: Iterable[str], crop: str, deadline: Optional[float] = None
+) -> Dict[str, dict]:
+    """Fetch ``crop`` prices for all ``districts`` concurrently.
+
+    Returns ``{district: price}`` for every district that answered within
+    ``deadline`` seconds (``MANDI_FETCH_DEADLINE_SECONDS`` by default), in the
+    order the districts were given; late lookups are cancelled.
+    """
+    districts = list(dict.fromkeys(districts))
+    if not districts:
+        return {}
+    tasks = {district: asyncio.create_task(fetch_price_for_district(district, crop)) for district in districts}
+    timeout = MANDI_FETCH_DEADLINE_SECONDS if deadline is None else deadline
+    _, pending = await asyncio.wait(tasks.values(), timeout=timeout)
+    for task in pending:
+        task.cancel()
+    if pending:
+        late = [district for district, task in tasks.items() if task in pending]
+        print(f"[MandiPrices] deadline {timeout:.1f}s hit, returning partial results without {', '.join(late)}")
+
+    prices: Dict[str, dict] = {}
+    for district, task in tasks.items():
+        if task in pending:
+            continue
+        try:
+            price = task.result()
+        except Exception as e:
+            print(f"[MandiPrices] Failed to fetch price for {district}: {e}")
+            continue
+        if price:
+            prices[district] = price
+    return prices
@@ -1,11 +1,16 @@
 
 from __future__ import annotations
-import os, base64, zlib, json, datetime, warnings
-from typing import Optional
+import os, base64, zlib, json, datetime, threading, time, warnings
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait as wait_futures
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Optional
 import numpy as np
 import pandas as pd
 import requests
 
+from . import database
+
 warnings.filterwarnings("ignore")
 
 # ---------------------------------------------------------------------------
@@ -31,9 +36,32 @@ COMMODITY_CURRENCY = {
     "sunflower": "INR", "potato": "EUR", "tea": "INR",
 }
 
-# Cache for fetched data
-_price_cache: dict[str, pd.DataFrame] = {}
+# Downloaded price series are refetched after this many seconds; stored forecasts are
+# served for as long without re-checking their data
+PRICE_DATA_TTL_SECONDS = float(os.getenv("PRICE_DATA_TTL_SECONDS", str(6 * 3600)))
+# Models are fitted once at this horizon; shorter forecasts are slices of it
+FORECAST_MAX_DAYS = 30
+
+# Cache for fetched data: crop -> (fetched_at, prices)
+_price_cache: dict[str, tuple[float, pd.DataFrame]] = {}
 _fx_cache: dict[str, float] = {}
+# compare_models fits its models in this many worker processes (0 fits them one after
+# another in the calling thread); a fit running longer than the timeout is left out and
+# the worker pool is replaced, since a running fit cannot be cancelled
+MODEL_FIT_WORKERS = int(os.getenv("MODEL_FIT_WORKERS", str(min(6, os.cpu_count() or 1))))
+MODEL_FIT_TIMEOUT_SECONDS = float(os.getenv("MODEL_FIT_TIMEOUT_SECONDS", "60"))
+# Forecasts leaving [current / ratio, current * ratio] count as diverged and are dropped
+MODEL_MAX_PRICE_RATIO = 5.0
+
+_fit_executor: Optional[ProcessPoolExecutor] = None
+_fit_executor_workers = 0
+_fit_executor_lock = threading.Lock()
+# One comparison uses the pool at a time, so every submitted fit starts right away
+_fit_run_lock = threading.Lock()
+
+# Fitted comparisons live in the price_forecasts table (see refresh_forecast)
+_forecast_locks: dict[str, threading.Lock] = {}
+_forecast_stats = {"stored_hits": 0, "fits": 0, "unchanged": 0, "failed": 0}
 
 
 def _data_magic(encoded: str, key: str = "tradingeconomics-charts-core-api-key", wbits: int = 16):
@@ -72,8 +100,9 @@ def _get_fx_to_inr() -> dict[str, float]:
 def fetch_commodity_prices(crop: str) -> Optional[pd.DataFrame]:
     """Fetch 1-year daily prices for a commodity from TradingEconomics."""
     crop_lower = crop.strip().lower()
-    if crop_lower in _price_cache:
-        return _price_cache[crop_lower]
+    cached = _price_cache.get(crop_lower)
+    if cached is not None and time.monotonic() - cached[0] < PRICE_DATA_TTL_SECONDS:
+        return cached[1]
 
     url = COMMODITY_URLS.get(crop_lower)
     if not url:
@@ -101,7 +130,7 @@ def fetch_commodity_prices(crop: str) -> Optional[pd.DataFrame]:
         df["price_inr"] = df["price"] * fx.get(currency, 1.0)
 
         df.set_index("date", inplace=True)
-        _price_cache[crop_lower] = df
+        _price_cache[crop_lower] = (time.monotonic(), df)
         print(f"[PricePred] Fetched {len(df)} days of {crop_lower} prices")
         return df
 
@@ -204,6 +233,61 @@ def fit_egarch(returns: pd.Series, forecast_days: int = 7) -> dict:
         print(f"[PricePred] EGARCH error: {e}")
         return {"name": "EGARCH(1,1,1)", "error": str(e)}
 
+def fit_gjr_garch(returns: pd.Series, forecast_days: int = 7) -> dict:
+    """Fit GJR-GARCH(1,1,1) — extra variance response to negative shocks."""
+    from arch import arch_model
+    try:
+        scaled = returns * 100
+        model = arch_model(scaled, mean="AR", lags=1, vol="Garch", p=1, o=1, q=1)
+        fitted = model.fit(disp="off")
+        fcast = fitted.forecast(horizon=forecast_days)
+        mean_f = (fcast.mean.iloc[-1].values / 100).tolist()
+        var_f = (fcast.variance.iloc[-1].values / 10000).tolist()
+        return {
+            "name": "GJR-GARCH(1,1,1)", "forecast_returns": mean_f, "forecast_variance": var_f,
+            "aic": fitted.aic, "bic": fitted.bic, "fitted": fitted,
+        }
+    except Exception as e:
+        print(f"[PricePred] GJR-GARCH error: {e}")
+        return {"name": "GJR-GARCH(1,1,1)", "error": str(e)}
+
+
+def fit_emd_arima(prices: pd.Series, forecast_days: int = 7) -> dict:
+    """EMD+ARIMA: split prices into intrinsic mode functions, forecast each with ARIMA, sum.
+
+    AIC is computed from the residuals of the summed fit (Gaussian likelihood,
+    all ARIMA parameters counted) so it stays comparable with plain ARIMA.
+    """
+    from PyEMD import EMD
+    from pmdarima import auto_arima
+    from statsmodels.tsa.arima.model import ARIMA
+    try:
+        values = prices.values.astype(float)
+        imfs = EMD().emd(values)
+        forecast = np.zeros(forecast_days)
+        residuals = np.zeros(len(values))
+        n_params, burn_in = 0, 0
+        for imf in imfs:
+            order = auto_arima(imf, seasonal=False, stepwise=True,
+                               suppress_warnings=True, max_p=3, max_q=3, max_d=2).order
+            model = ARIMA(imf, order=order).fit()
+            forecast += np.asarray(model.forecast(steps=forecast_days))
+            residuals += np.asarray(model.resid)
+            n_params += len(model.params)
+            burn_in = max(burn_in, order[1])
+        # The first d residuals of a differenced model are the raw values, not errors
+        residuals = residuals[burn_in:]
+        sigma2 = float(np.mean(residuals ** 2))
+        aic = len(residuals) * (np.log(2 * np.pi * sigma2) + 1) + 2 * n_params
+        return {
+            "name": "EMD+ARIMA", "imfs": len(imfs),
+            "forecast": forecast.tolist(), "aic": aic,
+        }
+    except Exception as e:
+        print(f"[PricePred] EMD+ARIMA error: {e}")
+        return {"name": "EMD+ARIMA", "error": str(e)}
+
+
 def fit_arima_garch(prices: pd.Series, forecast_days: int = 7) -> dict:
     """Hybrid ARIMA-GARCH: ARIMA for mean, GARCH on residuals."""
     from statsmodels.tsa.arima.model import ARIMA
@@ -258,23 +342,148 @@ def _price_range(current_price: float, pred_return: float, sigma: float):
     return round(expected, 2), round(lower, 2), round(upper, 2)
 
 
-def compare_models(prices_series: pd.Series, forecast_days: int = 7) -> dict:
-    """Run all models, compare on test set, return rankings + forecasts."""
+def _warm_fit_worker() -> None:
+    # Import the model libraries once per worker instead of inside the first timed fit
+    import arch, pmdarima, statsmodels.tsa.arima.model  # noqa: F401
+
+
+def _get_fit_executor(workers: int) -> ProcessPoolExecutor:
+    global _fit_executor, _fit_executor_workers
+    with _fit_executor_lock:
+        if _fit_executor is not None and _fit_executor_workers != workers:
+            _fit_executor.shutdown(wait=False, cancel_futures=True)
+            _fit_executor = None
+        if _fit_executor is None:
+            # spawn: forking the multi-threaded server process is not safe
+            _fit_executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_warm_fit_worker,
+            )
+            _fit_executor_workers = workers
+        return _fit_executor
+
+
+def shutdown_fit_pool() -> None:
+    """Stop the model-fitting worker processes (called on application shutdown)."""
+    global _fit_executor
+    with _fit_executor_lock:
+        if _fit_executor is not None:
+            _fit_executor.shutdown(wait=False, cancel_futures=True)
+            _fit_executor = None
+
+
+def _discard_fit_executor(executor: ProcessPoolExecutor) -> None:
+    """Kill ``executor``'s workers (hung fits included); the next fit starts a new pool."""
+    global _fit_executor
+    with _fit_executor_lock:
+        if _fit_executor is executor:
+            _fit_executor = None
+    # shutdown() waits for running tasks to end on their own; terminate the processes instead
+    for process in list((executor._processes or {}).values()):
+        process.terminate()
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _fit_task(fitter: Callable[..., dict], series: pd.Series, forecast_days: int) -> dict:
+    """Run one fitter; fitted model objects stay in the worker, only forecasts and scores return."""
+    result = fitter(series, forecast_days)
+    return {k: v for k, v in result.items() if k not in ("fitted", "residuals")}
+
+
+def _run_fits(jobs: dict, workers: Optional[int] = None) -> dict:
+    """Run ``{key: (fitter, series, forecast_days)}`` jobs; returns results of those that finished in time.
+
+    Jobs are submitted in order, one per free worker, so each fit gets
+    ``MODEL_FIT_TIMEOUT_SECONDS`` from the moment it starts.  A fit past its
+    deadline cannot be cancelled: the pool is discarded with its processes and
+    the other fits that were running on it are resubmitted to a fresh one.
+    """
+    workers = MODEL_FIT_WORKERS if workers is None else workers
+    if workers <= 0:
+        return {key: _fit_task(*job) for key, job in jobs.items()}
+
+    queue = list(jobs.items())
+    results = {}
+    with _fit_run_lock:
+        executor = _get_fit_executor(workers)
+        running = {}  # future -> (key, job, deadline)
+        while queue or running:
+            while queue and len(running) < workers:
+                key, job = queue.pop(0)
+                running[executor.submit(_fit_task, *job)] = (key, job, time.monotonic() + MODEL_FIT_TIMEOUT_SECONDS)
+            next_deadline = min(deadline for _, _, deadline in running.values())
+            done, _ = wait_futures(
+                running, timeout=max(0.0, next_deadline - time.monotonic()), return_when=FIRST_COMPLETED
+            )
+            broken = False
+            for future in done:
+                key = running.pop(future)[0]
+                try:
+                    results[key] = future.result()
+                except BrokenProcessPool as e:
+                    print(f"[PricePred] {key} fit lost with its worker: {e}")
+                    broken = True
+                except Exception as e:
+                    print(f"[PricePred] {key} fit failed: {e}")
+
+            now = time.monotonic()
+            expired = [future for future, (_, _, deadline) in running.items() if deadline <= now]
+            if expired:
+                print(f"[PricePred] dropped slow fits: {', '.join(sorted(running[f][0] for f in expired))}")
+                for future in expired:
+                    del running[future]
+            if expired or broken:
+                _discard_fit_executor(executor)
+                executor = _get_fit_executor(workers)
+                # Fits cut short by the discard start over, ahead of the queue
+                queue[:0] = [(key, job) for key, job, _ in running.values()]
+                running.clear()
+    return results
+
+
+def _diverged(forecast: Optional[list], current_price: float) -> bool:
+    values = np.asarray(forecast if forecast else [np.nan], dtype=float)
+    return not (
+        np.isfinite(values).all()
+        and (values >= current_price / MODEL_MAX_PRICE_RATIO).all()
+        and (values <= current_price * MODEL_MAX_PRICE_RATIO).all()
+    )
+
+
+def compare_models(prices_series: pd.Series, forecast_days: int = 7, workers: Optional[int] = None) -> dict:
+    """Run all models, compare on test set, return rankings + forecasts.
+
+    The fits are independent and run in parallel in a process pool
+    (``MODEL_FIT_WORKERS``, or ``workers``); fits that error, run past
+    ``MODEL_FIT_TIMEOUT_SECONDS`` or forecast non-finite or implausible prices
+    are left out of the ranking.
+    """
     n = len(prices_series)
     train_size = int(n * 0.8)
     train = prices_series.iloc[:train_size]
     test = prices_series.iloc[train_size:]
     returns = _compute_returns(prices_series)
-    train_returns = returns.iloc[:train_size - 1]
-    test_returns = returns.iloc[train_size - 1:]
     current_price = float(prices_series.iloc[-1])
 
+    timed_out = {"error": "not finished in time"}
+    # Cheapest fits first, so a queue behind the auto_arima searches cannot time them out
+    fits = _run_fits({
+        "GARCH(1,1)": (fit_garch, returns, forecast_days),
+        "GJR-GARCH(1,1,1)": (fit_gjr_garch, returns, forecast_days),
+        "EGARCH(1,1,1)": (fit_egarch, returns, forecast_days),
+        "ARIMA": (fit_arima, prices_series, forecast_days),
+        "ARIMA (test)": (fit_arima, train, len(test)),
+        "ARIMA-GARCH": (fit_arima_garch, prices_series, forecast_days),
+        "EMD+ARIMA": (fit_emd_arima, prices_series, forecast_days),
+    }, workers)
+
     results = []
 
-    # 1. ARIMA (on price levels)
-    arima_res = fit_arima(train, forecast_days)
+    # 1. ARIMA (on price levels), scored on the held-out test set
+    arima_res = fits.get("ARIMA", timed_out)
     if "error" not in arima_res:
-        test_fc = fit_arima(train, len(test))
+        test_fc = fits.get("ARIMA (test)", timed_out)
         if "error" not in test_fc:
             from sklearn.metrics import mean_squared_error, mean_absolute_error
             pred_len = min(len(test), len(test_fc["forecast"]))
@@ -282,21 +491,11 @@ def compare_models(prices_series: pd.Series, forecast_days: int = 7) -> dict:
             mae = mean_absolute_error(test.values[:pred_len], test_fc["forecast"][:pred_len])
             arima_res["rmse"] = round(rmse, 4)
             arima_res["mae"] = round(mae, 4)
-        # Get actual forecast
-        full_arima = fit_arima(prices_series, forecast_days)
-        if "error" not in full_arima:
-            arima_res["forecast"] = full_arima["forecast"]
-            arima_res["aic"] = full_arima.get("aic")
         results.append(arima_res)
 
     # 2-4. GARCH variants (on returns)
-    garch_fitters = [
-        ("GARCH(1,1)", fit_garch),
-        ("EGARCH(1,1,1)", fit_egarch),
-        ("GJR-GARCH(1,1,1)", fit_gjr_garch),
-    ]
-    for name, fitter in garch_fitters:
-        res = fitter(returns, forecast_days)
+    for name in ("GARCH(1,1)", "EGARCH(1,1,1)", "GJR-GARCH(1,1,1)"):
+        res = fits.get(name, timed_out)
         if "error" not in res and "forecast_returns" in res:
             res["forecast_prices"] = _returns_to_prices(current_price, res["forecast_returns"])
             # Confidence intervals from variance
@@ -313,15 +512,17 @@ def compare_models(prices_series: pd.Series, forecast_days: int = 7) -> dict:
                 res["lower_ci"] = lowers
             results.append(res)
 
-    # 5. EMD+ARIMA
-    emd_res = fit_emd_arima(prices_series, forecast_days)
-    if "error" not in emd_res:
-        results.append(emd_res)
+    # 5. EMD+ARIMA, 6. ARIMA-GARCH hybrid
+    for name in ("EMD+ARIMA", "ARIMA-GARCH"):
+        res = fits.get(name, timed_out)
+        if "error" not in res:
+            results.append(res)
 
-    # 6. ARIMA-GARCH hybrid
-    ag_res = fit_arima_garch(prices_series, forecast_days)
-    if "error" not in ag_res:
-        results.append(ag_res)
+    kept = [r for r in results if not _diverged(r.get("forecast_prices") or r.get("forecast"), current_price)]
+    if len(kept) < len(results):
+        dropped = sorted({r["name"] for r in results} - {r["name"] for r in kept})
+        print(f"[PricePred] dropped diverging fits: {', '.join(dropped)}")
+    results = kept
 
     # Rank by AIC (lower is better)
     for r in results:
@@ -342,18 +543,16 @@ def compare_models(prices_series: pd.Series, forecast_days: int = 7) -> dict:
 
 
 # ---------------------------------------------------------------------------
-# Main prediction function (with Gemini interpretation)
+# Stored forecasts
 # ---------------------------------------------------------------------------
 
-def run_price_prediction(
-    crop: str,
-    google_api_key: str,
-    forecast_days: int = 7,
-    district: str = "",
-    state: str = "",
-) -> dict:
-    """Full pipeline: fetch data → fit models → compare → forecast → Gemini interpret."""
-    # 1. Fetch real data (fallback to synthetic)
+# Per-day model outputs that are cut down to the requested horizon
+_HORIZON_KEYS = ("forecast", "forecast_prices", "forecast_returns", "forecast_variance",
+                 "upper_ci", "lower_ci", "volatility")
+
+
+def load_prices(crop: str) -> tuple[Optional[pd.Series], str]:
+    """Daily INR prices for ``crop`` and their source (synthetic when the download fails)."""
     df = fetch_commodity_prices(crop)
     if df is None or len(df) < 30:
         print(f"[PricePred] Using synthetic data for {crop}")
@@ -361,14 +560,137 @@ def run_price_prediction(
         data_source = "synthetic"
     else:
         data_source = "tradingeconomics"
-
     prices = df["price_inr"].dropna()
-    if len(prices) < 30:
-        return {"error": f"Insufficient price data for {crop} ({len(prices)} points)"}
+    return (prices if len(prices) >= 30 else None), data_source
+
+
+def slice_comparison(comparison: dict, forecast_days: int) -> dict:
+    """Copy of a ``compare_models`` result with every forecast cut to ``forecast_days``."""
+    models = []
+    for m in comparison["models"]:
+        m = dict(m)
+        for key in _HORIZON_KEYS:
+            if isinstance(m.get(key), list):
+                m[key] = m[key][:forecast_days]
+        models.append(m)
+    return {**comparison, "models": models, "forecast_days": forecast_days}
+
+
+def stored_comparison(crop: str) -> Optional[tuple[dict, str]]:
+    """``(comparison, data_source)`` from ``price_forecasts``, or None if nothing is stored."""
+    row = database.fetch_price_forecast(crop)
+    if row is None:
+        return None
+    return json.loads(row["comparison"]), row["data_source"]
+
+
+def refresh_forecast(crop: str, force: bool = False) -> str:
+    """Re-download the prices for ``crop`` and refit the stored comparison if they changed.
+
+    The suite is fitted once at ``FORECAST_MAX_DAYS`` and stored with the date
+    of the last observation; a newer observation (or a switch of data source)
+    triggers a refit, otherwise the stored row is only marked as checked.  A
+    failed download never replaces a forecast fitted on real data with a
+    synthetic one, and a comparison in which no model fitted never replaces
+    the stored row.  Returns "fresh", "unchanged", "fitted", "failed" or "no_data".
+    """
+    crop = crop.strip().lower()
+    # One fit per crop at a time; concurrent callers wait for it instead of refitting
+    with _forecast_locks.setdefault(crop, threading.Lock()):
+        row = database.fetch_price_forecast(crop)
+        if not force and row is not None and time.time() - row["checked_at"] <= PRICE_DATA_TTL_SECONDS:
+            return "fresh"
+
+        _price_cache.pop(crop, None)
+        prices, data_source = load_prices(crop)
+        if prices is None:
+            return "no_data"
+        last_date = pd.Timestamp(prices.index[-1]).date().isoformat()
+        if not force and row is not None and (
+            (row["data_source"], row["as_of"]) == (data_source, last_date)
+            or (data_source == "synthetic" and row["data_source"] != "synthetic")
+        ):
+            database.touch_price_forecast(crop)
+            _forecast_stats["unchanged"] += 1
+            return "unchanged"
+
+        print(f"[PricePred] Comparing models for {crop} ({len(prices)} data points, last {last_date})...")
+        _forecast_stats["fits"] += 1
+        comparison = compare_models(prices, FORECAST_MAX_DAYS)
+        if not comparison["models"]:
+            # Every fit errored, timed out or diverged; keep serving the previous forecast
+            print(f"[PricePred] no model fitted for {crop}; keeping the stored forecast")
+            _forecast_stats["failed"] += 1
+            return "failed"
+        comparison = {**comparison, "models": clean_models(comparison["models"]), "as_of": last_date}
+        database.store_price_forecast(
+            crop, data_source, last_date, FORECAST_MAX_DAYS, json.dumps(comparison, default=float)
+        )
+        return "fitted"
+
+
+def cached_comparison(crop: str, forecast_days: int = 7) -> tuple[Optional[dict], str]:
+    """``compare_models`` for ``crop`` at ``forecast_days``, served from ``price_forecasts``.
 
-    # 2. Compare models
-    print(f"[PricePred] Comparing models for {crop} ({len(prices)} data points)...")
-    comparison = compare_models(prices, forecast_days)
+    Reads the precomputed comparison (see ``backend/forecast_scheduler.py``)
+    and slices it to the requested horizon, whatever its age: keeping it
+    current is the scheduler's (or ``precompute_forecasts.py``'s) job, so a
+    request never waits for a refit.  Only a crop with nothing stored is
+    fitted on demand.  Returns ``(None, source)`` when there is not enough data.
+    """
+    crop = crop.strip().lower()
+    forecast_days = max(1, min(forecast_days, FORECAST_MAX_DAYS))
+    stored = stored_comparison(crop)
+    if stored is not None:
+        _forecast_stats["stored_hits"] += 1
+    elif refresh_forecast(crop) != "no_data":
+        stored = stored_comparison(crop)
+    if stored is None:
+        return None, "synthetic"
+    comparison, data_source = stored
+    return slice_comparison(comparison, forecast_days), data_source
+
+
+def forecast_cache_stats() -> dict:
+    return {
+        **_forecast_stats,
+        "crops": {
+            row["crop"]: {k: v for k, v in row.items() if k != "crop"}
+            for row in database.fetch_price_forecast_summaries()
+        },
+        "price_data_ttl_seconds": PRICE_DATA_TTL_SECONDS,
+    }
+
+
+def clean_models(models: list) -> list:
+    """Model results without fitted objects and internal series, ready for JSON."""
+    cleaned = []
+    for m in models:
+        clean = {k: v for k, v in m.items()
+                 if k not in ("fitted", "residuals", "forecast_variance", "forecast_returns")}
+        if clean.get("aic") == float("inf"):
+            clean["aic"] = None
+        cleaned.append(clean)
+    return cleaned
+
+
+# ---------------------------------------------------------------------------
+# Main prediction function (with Gemini interpretation)
+# ---------------------------------------------------------------------------
+
+def run_price_prediction(
+    crop: str,
+    google_api_key: str,
+    forecast_days: int = 7,
+    district: str = "",
+    state: str = "",
+) -> dict:
+    """Full pipeline: fetch data → fit models → compare → forecast → Gemini interpret."""
+    # 1-2. Fetch data (fallback to synthetic) and compare models, precomputed per data day
+    comparison, data_source = cached_comparison(crop, forecast_days)
+    if comparison is None:
+        return {"error": f"Insufficient price data for {crop}"}
+    forecast_days = comparison["forecast_days"]
 
     # 3. Get best model's forecast
     best = comparison["models"][0] if comparison["models"] else {}
@@ -383,15 +705,6 @@ def run_price_prediction(
         upper_ci, lower_ci, google_api_key, district, state, data_source,
     )
 
-    # Clean results for JSON serialization
-    clean_models = []
-    for m in comparison["models"]:
-        clean = {k: v for k, v in m.items()
-                 if k not in ("fitted", "residuals", "forecast_variance", "forecast_returns")}
-        if clean.get("aic") == float("inf"):
-            clean["aic"] = None
-        clean_models.append(clean)
-
     return {
         "response": response_text,
         "crop": crop,
@@ -401,9 +714,10 @@ def run_price_prediction(
         "upper_ci": upper_ci,
         "lower_ci": lower_ci,
         "best_model": best_name,
-        "model_comparison": clean_models,
+        "model_comparison": clean_models(comparison["models"]),
         "data_source": data_source,
         "data_points": comparison["data_points"],
+        "as_of": comparison.get("as_of"),
     }
 
 
@@ -0,0 +1,406 @@
+"""Versioned schema migrations for documents.db.
+
+The schema version lives in ``PRAGMA user_version``.  Each migration is a
+function that receives a cursor inside an open ``BEGIN IMMEDIATE``
+transaction; the runner applies the pending ones in order and bumps
+``user_version`` in the same transaction, so a failed migration leaves the
+database at the previous version.
+
+Importing ``backend.database`` does no schema work.  Migrations run once at
+application startup (``backend/main.py``) or from deployment tooling::
+
+    python -m backend.migrations            # apply pending migrations
+    python -m backend.migrations --status   # show current / latest version
+
+Migration 1 is the schema the old import-time probing produced; it is written
+to be idempotent so databases created before versioning (user_version 0)
+upgrade cleanly.
+"""
+
+import argparse
+import csv
+import sqlite3
+from pathlib import Path
+import sys
+from typing import Callable, List, Optional, Tuple
+
+from .database import DB_PATH, _open_connection
+
+
+def _baseline(cursor: sqlite3.Cursor) -> None:
+    """Users and conversations tables, including the legacy column/index repairs."""
+
+    # Create users table (new)
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS users (
+            id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            district TEXT,
+            crop TEXT,
+            state TEXT,
+            email TEXT UNIQUE,
+            password_hash TEXT,
+            phone_number TEXT,
+            language TEXT
+        )
+        """
+    )
+
+    # Ensure 'state' column exists for legacy DBs
+    cursor.execute("PRAGMA table_info(users)")
+    user_cols = [row[1] for row in cursor.fetchall()]
+    if "state" not in user_cols:
+        cursor.execute("ALTER TABLE users ADD COLUMN state TEXT")
+    if "email" not in user_cols:
+        cursor.execute("ALTER TABLE users ADD COLUMN email TEXT")
+    if "password_hash" not in user_cols:
+        cursor.execute("ALTER TABLE users ADD COLUMN password_hash TEXT")
+    if "phone_number" not in user_cols:
+        cursor.execute("ALTER TABLE users ADD COLUMN phone_number TEXT")
+    if "language" not in user_cols:
+        cursor.execute("ALTER TABLE users ADD COLUMN language TEXT")
+
+    # Ensure unique index on email (if provided)
+    cursor.execute("PRAGMA index_list(users)")
+    existing_indexes = [row[1] for row in cursor.fetchall()]  # row[1] is index name
+    if "idx_users_email_unique" not in existing_indexes:
+        # Partial unique index so multiple NULL emails are allowed
+        cursor.execute(
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_users_email_unique ON users(email) WHERE email IS NOT NULL"
+        )
+    # Ensure unique index on phone_number (if provided)
+    cursor.execute("PRAGMA index_list(users)")
+    existing_indexes = [row[1] for row in cursor.fetchall()]
+    if "idx_users_phone_unique" not in existing_indexes:
+        cursor.execute(
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_users_phone_unique ON users(phone_number) WHERE phone_number IS NOT NULL"
+        )
+
+    # Ensure conversations table matches the new schema (with user_id)
+    cursor.execute("PRAGMA table_info(conversations)")
+    existing_columns = [row[1] for row in cursor.fetchall()]
+
+    needs_recreate = (
+        ("user_id" not in existing_columns) or
+        ("pdf_id" in existing_columns)
+    )
+
+    if needs_recreate:
+        # Rename old table if it exists
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='conversations'")
+        if cursor.fetchone():
+            cursor.execute("ALTER TABLE conversations RENAME TO conversations_legacy")
+
+        # Create new conversations table with user_id and FK
+        cursor.execute(
+            """
+            CREATE TABLE conversations (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id TEXT NOT NULL,
+                question TEXT NOT NULL,
+                answer TEXT,
+                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+            )
+            """
+        )
+
+        # Drop legacy table if present (no automatic data migration possible)
+        cursor.execute("DROP TABLE IF EXISTS conversations_legacy")
+
+    # Ensure conversation_id column exists
+    cursor.execute("PRAGMA table_info(conversations)")
+    conv_cols = [row[1] for row in cursor.fetchall()]
+    if "conversation_id" not in conv_cols:
+        cursor.execute("ALTER TABLE conversations ADD COLUMN conversation_id TEXT")
+    if "title" not in conv_cols:
+        cursor.execute("ALTER TABLE conversations ADD COLUMN title TEXT")
+
+
+def _conversation_summaries(cursor: sqlite3.Cursor) -> None:
+    """Composite conversation indexes and the incrementally maintained summary table."""
+    # History and conversation lookups are range scans on these composite keys
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_conversations_user_ts ON conversations(user_id, timestamp)")
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_conversations_conv_ts ON conversations(conversation_id, timestamp)"
+    )
+
+    # One row per conversation for the sidebar, kept current by insert_conversation()
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='conversation_summaries'")
+    summaries_exist = cursor.fetchone() is not None
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS conversation_summaries (
+            conversation_id TEXT PRIMARY KEY,
+            user_id TEXT NOT NULL,
+            title TEXT,
+            first_timestamp TIMESTAMP,
+            last_timestamp TIMESTAMP,
+            message_count INTEGER NOT NULL DEFAULT 0,
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+        )
+        """
+    )
+    # Keyset pagination orders by (timestamp, conversation_id); the key must be in the
+    # index because conversation_summaries is a rowid table
+    cursor.execute("DROP INDEX IF EXISTS idx_conversation_summaries_user_first")
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_conversation_summaries_user_first_id "
+        "ON conversation_summaries(user_id, first_timestamp, conversation_id)"
+    )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_conversation_summaries_user_last_id "
+        "ON conversation_summaries(user_id, last_timestamp, conversation_id)"
+    )
+    if not summaries_exist:
+        # Backfill from existing history once, using the old GROUP BY derivation
+        cursor.execute(
+            """
+            INSERT OR IGNORE INTO conversation_summaries
+                (conversation_id, user_id, title, first_timestamp, last_timestamp, message_count)
+            SELECT c.conversation_id, c.user_id, COALESCE(c.title, c.question), t.first_ts, t.last_ts, t.n
+            FROM conversations c
+            JOIN (
+                SELECT conversation_id, MIN(timestamp) AS first_ts, MAX(timestamp) AS last_ts, COUNT(*) AS n
+                FROM conversations
+                WHERE conversation_id IS NOT NULL
+                GROUP BY conversation_id
+            ) t
+            ON c.conversation_id = t.conversation_id AND c.timestamp = t.first_ts
+            """
+        )
+
+
+def _conversations_fts(cursor: sqlite3.Cursor) -> None:
+    """Full-text index over questions and answers, kept in sync by triggers."""
+    # Vowel signs (Mc/Mn) count as token characters so Devanagari words stay whole.
+    try:
+        cursor.execute(
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS conversations_fts USING fts5(
+                user_id, question, answer,
+                content='conversations', content_rowid='id',
+                tokenize="unicode61 remove_diacritics 2 categories 'L* N* Co Mc Mn'"
+            )
+            """
+        )
+    except sqlite3.OperationalError as e:
+        # Keep migrating; search reports itself unavailable (see database.fts_available)
+        print(f"[Migrations] full-text search unavailable: {e}")
+        return
+    cursor.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS conversations_fts_ai AFTER INSERT ON conversations BEGIN
+            INSERT INTO conversations_fts(rowid, user_id, question, answer)
+            VALUES (new.id, new.user_id, new.question, new.answer);
+        END
+        """
+    )
+    cursor.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS conversations_fts_ad AFTER DELETE ON conversations BEGIN
+            INSERT INTO conversations_fts(conversations_fts, rowid, user_id, question, answer)
+            VALUES ('delete', old.id, old.user_id, old.question, old.answer);
+        END
+        """
+    )
+    cursor.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS conversations_fts_au AFTER UPDATE ON conversations BEGIN
+            INSERT INTO conversations_fts(conversations_fts, rowid, user_id, question, answer)
+            VALUES ('delete', old.id, old.user_id, old.question, old.answer);
+            INSERT INTO conversations_fts(rowid, user_id, question, answer)
+            VALUES (new.id, new.user_id, new.question, new.answer);
+        END
+        """
+    )
+    # Index existing history
+    cursor.execute("INSERT INTO conversations_fts(conversations_fts) VALUES ('rebuild')")
+
+
+def _conversation_archive(cursor: sqlite3.Cursor) -> None:
+    """Compressed per-conversation archive table."""
+    # Old conversations are moved here as one compressed JSON blob each
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS conversation_archive (
+            conversation_id TEXT PRIMARY KEY,
+            user_id TEXT NOT NULL,
+            codec TEXT NOT NULL,
+            payload BLOB NOT NULL,
+            message_count INTEGER NOT NULL,
+            raw_bytes INTEGER NOT NULL,
+            archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+        )
+        """
+    )
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_conversation_archive_user ON conversation_archive(user_id)")
+
+
+def _mandi_price_cache(cursor: sqlite3.Cursor) -> None:
+    """Cache of data.gov.in mandi price lookups."""
+    # One row per record seen; the newest fetch for a district/commodity is served
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS mandi_price_cache (
+            district TEXT NOT NULL,
+            commodity TEXT NOT NULL,
+            arrival_date TEXT NOT NULL,
+            price,
+            unit TEXT,
+            fetched_at REAL NOT NULL,
+            PRIMARY KEY (district, commodity, arrival_date)
+        )
+        """
+    )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_mandi_price_cache_latest "
+        "ON mandi_price_cache(district, commodity, fetched_at DESC)"
+    )
+
+
+def _mandi_prices(cursor: sqlite3.Cursor) -> None:
+    """Local copy of the data.gov.in daily mandi price dataset."""
+    # Clustered on (commodity, district, arrival_date) so per-crop/district lookups and
+    # date-range scans read contiguous pages; the date index serves incremental ingestion
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS mandi_prices (
+            commodity TEXT NOT NULL,
+            district TEXT NOT NULL,
+            arrival_date TEXT NOT NULL,
+            market TEXT NOT NULL,
+            variety TEXT NOT NULL DEFAULT '',
+            grade TEXT NOT NULL DEFAULT '',
+            state TEXT,
+            min_price REAL,
+            max_price REAL,
+            modal_price REAL,
+            PRIMARY KEY (commodity, district, arrival_date, market, variety, grade)
+        ) WITHOUT ROWID
+        """
+    )
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_mandi_prices_date ON mandi_prices(arrival_date, commodity)")
+
+
+GAZETTEER_SEED_CSV = Path(__file__).resolve().parent / "data" / "district_gazetteer.csv"
+
+
+def _district_gazetteer(cursor: sqlite3.Cursor) -> None:
+    """District coordinates for nearest-mandi lookups, seeded from data/district_gazetteer.csv."""
+    # NULL coordinates record a failed geocode so it is not retried on every lookup
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS district_gazetteer (
+            district TEXT PRIMARY KEY,
+            state TEXT,
+            latitude REAL,
+            longitude REAL,
+            source TEXT NOT NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    )
+    with GAZETTEER_SEED_CSV.open(encoding="utf-8", newline="") as f:
+        rows = [
+            (row["district"].strip().lower(), row["state"], float(row["latitude"]), float(row["longitude"]))
+            for row in csv.DictReader(f)
+        ]
+    cursor.executemany(
+        "INSERT OR IGNORE INTO district_gazetteer (district, state, latitude, longitude, source) VALUES (?, ?, ?, ?, 'seed')",
+        rows,
+    )
+
+
+def _price_forecasts(cursor: sqlite3.Cursor) -> None:
+    """Precomputed model comparisons, one row per crop."""
+    # comparison is the JSON compare_models result at the longest horizon; as_of is the
+    # last observation it was fitted on, checked_at when the source data was last re-checked
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS price_forecasts (
+            crop TEXT PRIMARY KEY,
+            data_source TEXT NOT NULL,
+            as_of TEXT NOT NULL,
+            forecast_days INTEGER NOT NULL,
+            comparison TEXT NOT NULL,
+            fitted_at REAL NOT NULL,
+            checked_at REAL NOT NULL
+        )
+        """
+    )
+
+
+# (version, description, migration); append only, never renumber
+MIGRATIONS: List[Tuple[int, str, Callable[[sqlite3.Cursor], None]]] = [
+    (1, "users and conversations baseline", _baseline),
+    (2, "conversation indexes and summaries", _conversation_summaries),
+    (3, "conversation full-text index", _conversations_fts),
+    (4, "conversation archive", _conversation_archive),
+    (5, "mandi price cache", _mandi_price_cache),
+    (6, "mandi price store", _mandi_prices),
+    (7, "district gazetteer", _district_gazetteer),
+    (8, "price forecasts", _price_forecasts),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def current_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(target: Optional[int] = None) -> Tuple[int, int]:
+    """Apply pending migrations up to ``target`` (default: latest). Returns (before, after)."""
+    target = LATEST_VERSION if target is None else target
+    conn = _open_connection()
+    # Explicit transaction control so DDL and the version bump commit together
+    conn.isolation_level = None
+    try:
+        before = current_version(conn)
+        for version, description, migration in MIGRATIONS:
+            if version > target:
+                break
+            cursor = conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                # Re-check under the write lock in case another process migrated first
+                if current_version(conn) >= version:
+                    cursor.execute("COMMIT")
+                    continue
+                migration(cursor)
+                cursor.execute(f"PRAGMA user_version = {version}")
+                cursor.execute("COMMIT")
+            except Exception:
+                cursor.execute("ROLLBACK")
+                raise
+            print(f"[Migrations] applied {version}: {description}")
+        return before, current_version(conn)
+    finally:
+        conn.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Apply schema migrations to " + str(DB_PATH))
+    parser.add_argument("--status", action="store_true", help="print the current and latest version")
+    parser.add_argument("--to", type=int, default=None, help="migrate up to this version")
+    args = parser.parse_args()
+
+    if args.status:
+        conn = _open_connection()
+        try:
+            version = current_version(conn)
+        finally:
+            conn.close()
+        print(f"{DB_PATH}: version {version} (latest {LATEST_VERSION})")
+        return 0
+
+    before, after = migrate(args.to)
+    print(f"{DB_PATH}: version {before} -> {after}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+"""Password hashing for the async auth routes.
+
+bcrypt is CPU-bound and releases the GIL, so ``create_profile`` and ``login``
+run ``database.hash_password`` / ``database.verify_password`` on a small
+dedicated thread pool instead of on the event loop.  The pool is capped by
+``PASSWORD_HASH_WORKERS`` so sign-up/login bursts cannot take every core.
+
+Usage::
+
+    from . import passwords
+    password_hash = await passwords.hash_password(req.password)
+"""
+
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from .database import hash_password as _hash_password_sync
+from .database import verify_password as _verify_password_sync
+
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
+        return _executor
+
+
+def shutdown_password_pool() -> None:
+    """Release the bcrypt pool (called on application shutdown)."""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def hash_password(plain_password: str) -> str:
+    """``database.hash_password`` on the bounded bcrypt executor, off the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), _hash_password_sync, plain_password)
+
+
+async def verify_password(plain_password: str, password_hash: str) -> bool:
+    """``database.verify_password`` on the bounded bcrypt executor, off the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), _verify_password_sync, plain_password, password_hash)
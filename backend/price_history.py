@@ -0,0 +1,141 @@
+"""Market price history and trend statistics from the local mandi price store.
+
+``/market-price-history`` charts the user's district and compares nearby
+mandis.  The daily modal prices come from the ``mandi_prices`` table (filled by
+``ingest_mandi_prices.py``) and are pivoted into one date x district frame, so
+rolling mean, min/max, volatility and the trend slope are computed for every
+district at once with pandas/NumPy column operations instead of per-mandi
+Python loops.
+
+Summaries only change when new arrival dates are ingested, so they are cached
+in-process per (district, crop, nearby mandis, newest arrival date among them):
+a new day of data for any of the mandis, or a different nearby set, gives a
+new key and old entries age out of the LRU.
+
+Usage::
+
+    from backend.price_history import price_history
+    summary = await price_history("agra", "wheat", ["mathura", "firozabad"])
+"""
+
+import os
+from collections import OrderedDict
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from . import async_database
+
+PRICE_HISTORY_DAYS = int(os.getenv("PRICE_HISTORY_DAYS", "30"))
+PRICE_ROLLING_DAYS = int(os.getenv("PRICE_ROLLING_DAYS", "7"))
+# A fitted slope smaller than this (percent of the mean price per day) is reported as "flat"
+PRICE_TREND_FLAT_PCT = float(os.getenv("PRICE_TREND_FLAT_PCT", "0.1"))
+PRICE_HISTORY_CACHE_SIZE = 1024
+
+_cache: "OrderedDict[Tuple[str, str, Tuple[str, ...], str], Dict[str, Any]]" = OrderedDict()
+
+
+def price_frame(rows: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Pivot ``(district, arrival_date, modal_price)`` rows into a daily date x district frame."""
+    if not rows:
+        return pd.DataFrame()
+    frame = pd.DataFrame(rows).pivot_table(
+        index="arrival_date", columns="district", values="modal_price", aggfunc="mean"
+    )
+    frame.index = pd.to_datetime(frame.index)
+    # Calendar-day index so rolling windows and slopes are in days, not observations
+    return frame.asfreq("D")
+
+
+def district_stats(frame: pd.DataFrame) -> pd.DataFrame:
+    """Latest, mean, min, max, volatility and trend for every column of ``frame``."""
+    observed = frame.notna()
+    count = observed.sum()
+    mean = frame.mean()
+
+    # Least-squares slope per column, ignoring missing days
+    days = np.arange(len(frame), dtype=float)[:, None]
+    day_mean = (observed * days).sum() / count
+    day_offset = observed * (days - day_mean.to_numpy())
+    slope = (day_offset * (frame - mean)).sum() / (day_offset ** 2).sum()
+    slope_pct = slope / mean * 100
+
+    trend = pd.Series(
+        np.select([slope_pct > PRICE_TREND_FLAT_PCT, slope_pct < -PRICE_TREND_FLAT_PCT], ["up", "down"], "flat"),
+        index=frame.columns,
+        dtype=object,
+    ).where(count >= 2)
+
+    stats = pd.DataFrame({
+        "latest": frame.ffill().iloc[-1],
+        "mean": mean,
+        "min": frame.min(),
+        "max": frame.max(),
+        # Standard deviation of day-over-day changes, in percent
+        "volatility_pct": frame.pct_change(fill_method=None).std() * 100,
+        "change_pct": (frame.ffill().iloc[-1] / frame.bfill().iloc[0] - 1) * 100,
+        "slope_per_day": slope,
+        "trend": trend,
+        "observations": count,
+    })
+    return stats
+
+
+def _round(value: Any, digits: int = 2) -> Optional[float]:
+    return None if value is None or pd.isna(value) else round(float(value), digits)
+
+
+def _summarize(frame: pd.DataFrame, district: str) -> Dict[str, Any]:
+    if frame.empty:
+        return {"price_history": [], "stats": {}, "trends": {}}
+    stats = district_stats(frame)
+    trends = {name: (None if pd.isna(t) else t) for name, t in stats["trend"].items()}
+    if district not in frame.columns:
+        return {"price_history": [], "stats": {}, "trends": trends}
+
+    series = frame[district]
+    rolling = series.rolling(f"{PRICE_ROLLING_DAYS}D", min_periods=1).mean()
+    observed = series.notna()
+    history = [
+        {"date": day.date().isoformat(), "price": _round(price), "rolling_mean": _round(mean)}
+        for day, price, mean in zip(series.index[observed], series[observed], rolling[observed])
+    ]
+    row = stats.loc[district]
+    summary = {
+        "latest": _round(row["latest"]),
+        "mean": _round(row["mean"]),
+        "min": _round(row["min"]),
+        "max": _round(row["max"]),
+        "volatility_pct": _round(row["volatility_pct"]),
+        "change_pct": _round(row["change_pct"]),
+        "trend": trends.get(district),
+        "rolling_window_days": PRICE_ROLLING_DAYS,
+        "observations": int(row["observations"]),
+    }
+    return {"price_history": history, "stats": summary, "trends": trends}
+
+
+async def price_history(district: str, crop: str, nearby: List[str]) -> Dict[str, Any]:
+    """History and statistics for ``district`` plus trends for ``nearby`` mandis.
+
+    Returns ``{"price_history", "stats", "trends", "as_of"}``; lists and stats
+    are empty when the local store has no data for the district and crop.
+    """
+    latest, newest = await async_database.latest_stored_mandi_dates(district, crop, nearby)
+    key = (district, crop, tuple(nearby), newest or date.today().isoformat())
+    cached = _cache.get(key)
+    if cached is not None:
+        _cache.move_to_end(key)
+        return cached
+
+    anchor = date.fromisoformat(latest) if latest else date.today()
+    since = (anchor - timedelta(days=PRICE_HISTORY_DAYS - 1)).isoformat()
+    rows = await async_database.fetch_mandi_price_history(crop, [district, *nearby], since)
+    result = {**_summarize(price_frame(rows), district), "as_of": latest}
+
+    _cache[key] = result
+    if len(_cache) > PRICE_HISTORY_CACHE_SIZE:
+        _cache.popitem(last=False)
+    return result
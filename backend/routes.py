@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Response
 from pydantic import BaseModel
 from pydantic import v1 as pydantic_v1
 from langchain_google_genai import ChatGoogleGenerativeAI, GoogleGenerativeAIEmbeddings
@@ -11,7 +11,7 @@ from langchain_core.runnables import RunnablePassthrough
 from langchain_huggingface import HuggingFaceEmbeddings
 import re
 import requests
-from datetime import datetime, timedelta
+from datetime import datetime
 from dotenv import load_dotenv
 import os
 
@@ -31,22 +31,22 @@ if raw_key:
 else:
     print("[Config] Gemini API key missing!")
 from .database import (
-    get_db_connection,
-    insert_user,
-    insert_conversation,
-    fetch_conversations,
-    fetch_user_by_id,
-    fetch_user_conversation_summaries,
-    fetch_conversation_by_id,
-    fetch_user_by_email,
-    fetch_user_by_phone,
-    hash_password,
-    verify_password,
+    db_pool_stats,
+    user_cache_stats,
 )
+from . import async_database, passwords
+from .translation_memory import translation_memory
+from .translation import translate_text_async
+from .conversation_writer import conversation_writer, enqueue_conversation
+from .i18n import language_code, lookup, t
+from .mandi_prices import fetch_prices, price_cache_stats
+from .price_history import price_history
+from .mandi_geo import OPENWEATHER_API_KEY, district_coordinates, nearest_mandis
+from .lexicon import analyze, extract_crop, needs_reasoning, normalize_crop
 from langchain_community.vectorstores import FAISS
 from typing import Optional
+import asyncio
 import base64
-from deep_translator import GoogleTranslator
 import requests
 import re
 import sys
@@ -58,7 +58,14 @@ from alerter import send_alert_sms_to_user
 # ML model pipelines
 from .disease_prediction_graph import run_disease_prediction
 from .yield_prediction import run_yield_prediction, get_available_crops, KHARIF_CROPS, RABI_CROPS
-from .market_price_prediction import run_price_prediction
+from .market_price_prediction import (
+    FORECAST_MAX_DAYS,
+    cached_comparison,
+    clean_models,
+    forecast_cache_stats,
+    run_price_prediction,
+)
+from .forecast_scheduler import forecast_scheduler
 
 load_dotenv()
 # Load and clean Google API key – remove any surrounding quotes that may be present in .env
@@ -70,29 +77,21 @@ else:
 print(f"[Config] GOOGLE_API_KEY loaded: {'YES' if GOOGLE_API_KEY else 'NO'} (length {len(GOOGLE_API_KEY) if GOOGLE_API_KEY else 0})")
 router = APIRouter()
 
-# Nearby mandis mapping for price comparison
-NEARBY_MANDIS = {
-    'agra': ['mathura', 'firozabad', 'mainpuri'],
-    'lucknow': ['kanpur', 'barabanki', 'sitapur'],
-    'ludhiana': ['jalandhar', 'moga', 'ferozepur'],
-    'mumbai': ['pune', 'nashik', 'aurangabad'],
-    'bangalore': ['mysore', 'mandya', 'tumkur'],
-    'varanasi': ['allahabad', 'mirzapur', 'chandauli'],
-    'kanpur': ['lucknow', 'unnao', 'fatehpur'],
-    'pune': ['mumbai', 'satara', 'solapur'],
-    'noida': ['ghaziabad', 'meerut', 'bulandshahr'],
-    'gorakhpur': ['deoria', 'kushinagar', 'maharajganj'],
-    'hubballi': ['dharwad', 'gadag', 'haveri'],
-    'hoshiarpur': ['jalandhar', 'kapurthala', 'nawanshahr'],
-    'patiala': ['ludhiana', 'sangrur', 'fatehgarh sahib']
-}
-
 # Load environment variables
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 if not GOOGLE_API_KEY:
     raise HTTPException(status_code=500, detail="Google API key not found.")
 
-DATA_GOV_API_KEY = os.getenv("DATA_GOV_API_KEY")
+# When enabled, Gemini writes the answer directly in the user's language instead of
+# producing English that is machine-translated afterwards (saves the en->hi round trips).
+ANSWER_IN_USER_LANGUAGE = os.getenv("ANSWER_IN_USER_LANGUAGE", "1").lower() in {"1", "true", "yes", "y"}
+
+# How /ask answers current-price questions: "template" renders the comparison locally from
+# the fetched prices, "llm" always asks Gemini, "auto" asks Gemini only when the question
+# wants advice or an explanation (why / when / should I ...) beyond the numbers.
+PRICE_ANSWER_MODE = os.getenv("PRICE_ANSWER_MODE", "auto").strip().lower()
+
+PRICE_HISTORY_MAX_AGE_SECONDS = int(os.getenv("PRICE_HISTORY_MAX_AGE_SECONDS", "3600"))
 
 GLOBAL_INDEX_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "global_faiss_index")
 _global_vector_store: Optional[FAISS] = None
@@ -265,7 +264,17 @@ def context_aware_chunk(documents, query: str, max_chunk_tokens: int = 512, over
 # -------------------------------------------------
 
 
-def get_conversational_chain():
+def _answer_language_instruction(user_language: str) -> str:
+    """Prompt line asking Gemini to reply in the user's language (single-pass mode)."""
+    if ANSWER_IN_USER_LANGUAGE and _is_hindi_language(user_language):
+        return (
+            "- Write the entire response in simple Hindi (Devanagari script). "
+            "Keep numbers, units and product names accurate; you may add the English term in brackets.\n"
+        )
+    return ""
+
+
+def get_conversational_chain(language_instruction: str = ""):
     prompt_template = (
         "You are Agri-Sahayak, a friendly and helpful AI advisor for Indian farmers. "
         "Your role is to provide practical, easy-to-understand agricultural advice in a conversational tone.\n\n"
@@ -279,7 +288,8 @@ def get_conversational_chain():
         "- Keep answers conversational yet structured.\n"
         "- Focus on practical, actionable advice.\n"
         "- If context is available, use it effectively.\n"
-        "- Concise (2-4 paragraphs max per section).\n\n"
+        "- Concise (2-4 paragraphs max per section).\n"
+        f"{language_instruction}\n"
         "Context: {context}\n"
         "Question: {question}\n\n"
         "Response:"
@@ -295,68 +305,6 @@ def get_conversational_chain():
     return chain
 
 
-def _fallback_translate_via_llm(text: str, src: str, dest: str) -> str:
-    """Fallback translation using the chat model to improve reliability."""
-    try:
-        src_name = "Hindi" if src.startswith("hi") else ("English" if src.startswith("en") else src)
-        dest_name = "Hindi" if dest.startswith("hi") else ("English" if dest.startswith("en") else dest)
-        model = ChatGoogleGenerativeAI(model="gemini-flash-latest", temperature=0.0)
-        prompt = (
-            f"Translate the following text from {src_name} to {dest_name}. "
-            "Only return the translated text without quotes or comments.\n\n"
-            f"Text: {text}"
-        )
-        resp = model.invoke(prompt)
-        
-        # Properly extract the translated text from the response
-        if hasattr(resp, 'content'):
-            out = resp.content
-        elif hasattr(resp, 'output_text'):
-            out = resp.output_text
-        elif isinstance(resp, dict):
-            out = resp.get("content") or resp.get("output_text") or ""
-        else:
-            out = str(resp)
-        
-        # Clean up the output - remove any extra formatting
-        if isinstance(out, str):
-            out = out.strip()
-            # Remove any "content = " prefixes that might be present
-            if out.startswith("content = "):
-                out = out[10:].strip()
-            # Remove quotes if present
-            if (out.startswith("'") and out.endswith("'")) or (out.startswith('"') and out.endswith('"')):
-                out = out[1:-1].strip()
-        
-        return (out or text).strip()
-    except Exception as e:
-        try:
-            print(f"--- FALLBACK LLM TRANSLATION ERROR: {e} ---")
-        except Exception:
-            pass
-        return text
-
-
-def translate_text(text: str, src: str, dest: str) -> str:
-    """Translate text from source language to destination language with fallback."""
-    # Primary attempt: deep-translator
-    translated = text
-    try:
-        result = GoogleTranslator(source=src, target=dest).translate(text)
-        translated = (result or text).strip()
-    except Exception as e:
-        try:
-            print(f"--- GOOGLETRANS ERROR: {e} ---")
-        except Exception:
-            pass
-        translated = text
-
-    # If translation failed or didn't change, try LLM fallback
-    if not translated or translated.strip() == text.strip():
-        translated = _fallback_translate_via_llm(text, src, dest)
-    return translated
-
-
 def _is_hindi_language(value: str) -> bool:
     """Robust Hindi language check to catch common variants."""
     l = (value or "").strip().lower()
@@ -366,18 +314,18 @@ def _is_hindi_language(value: str) -> bool:
 @router.post("/create_profile")
 async def create_profile(req: CreateProfileRequest):
     # Enforce unique email
-    existing = fetch_user_by_email(req.email)
+    existing = await async_database.fetch_user_by_email(req.email)
     if existing:
         raise HTTPException(status_code=409, detail="Email already registered")
 
     # Enforce unique phone number
     if req.phone_number:
-        existing_phone = fetch_user_by_phone(req.phone_number)
+        existing_phone = await async_database.fetch_user_by_phone(req.phone_number)
         if existing_phone:
             raise HTTPException(status_code=409, detail="Phone number already registered")
 
-    password_hash = hash_password(req.password)
-    user_id = insert_user(
+    password_hash = await passwords.hash_password(req.password)
+    user_id = await async_database.insert_user(
         name=req.name,
         district=req.district,
         crop=req.crop,
@@ -397,8 +345,8 @@ class LoginRequest(BaseModel):
 
 @router.post("/login")
 async def login(req: LoginRequest):
-    user = fetch_user_by_email(req.email)
-    if not user or not user.get("password_hash") or not verify_password(req.password, user["password_hash"]):
+    user = await async_database.fetch_user_by_email(req.email)
+    if not user or not user.get("password_hash") or not await passwords.verify_password(req.password, user["password_hash"]):
         raise HTTPException(status_code=401, detail="Invalid credentials")
     return {"user_id": user["id"], "name": user["name"]}
 
@@ -420,49 +368,23 @@ class StartConversationRequest(BaseModel):
 
 @router.post("/conversations/start")
 async def start_conversation(req: StartConversationRequest):
-    user = fetch_user_by_id(req.user_id)
+    user = await async_database.fetch_user_by_id(req.user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    user_language = (user.get("language") or "").strip().lower()
-    is_hindi = _is_hindi_language(user_language)
-
-    welcome_messages = {
-        "farming": {
-            "en": "Hello! How can I assist you with farming today?",
-            "hi": "नमस्ते! मैं आज खेती-बाड़ी में आपकी क्या मदद कर सकता हूँ?",
-        },
-        "loans": {
-            "en": "Hello! What would you like to know about agricultural loans?",
-            "hi": "नमस्ते! आप कृषि लोन के बारे में क्या जानना चाहेंगे?",
-        },
-        "market_prices": {
-            "en": "Hello! Which crop's market price are you interested in?",
-            "hi": "नमस्ते! आप किस फसल का बाज़ार भाव जानना चाहते हैं?",
-        },
-        "weather": {
-            "en": "Hello! How can I help you with the weather forecast?",
-            "hi": "नमस्ते! मैं मौसम पूर्वानुमान में आपकी कैसे मदद कर सकता हूँ?",
-        },
-        "livestock": {
-            "en": "Of course. I can help with questions about cattle, dairy, and other livestock. What would you like to know?",
-            "hi": "ज़रूर, मैं मवेशियों, डेयरी और अन्य पशुधन के बारे में सवालों में मदद कर सकता हूँ। आप क्या जानना चाहेंगे?",
-        },
-    }
-
+    # Welcome messages are served from the prebuilt locale catalogs (no runtime translation)
     category_key = req.category.lower()
-    if category_key not in welcome_messages:
+    if not isinstance(lookup(f"welcome.{category_key}"), str):
         raise HTTPException(status_code=400, detail="Invalid category")
 
-    lang_key = "hi" if is_hindi else "en"
-    welcome_message = welcome_messages[category_key][lang_key]
+    welcome_message = t(f"welcome.{category_key}", language_code(user.get("language")))
 
     conversation_id = str(os.urandom(16).hex())
 
     # Create a title for the conversation
     title = f"{req.category.replace('_', ' ').title()} Conversation"
 
-    insert_conversation(
+    enqueue_conversation(
         user_id=req.user_id,
         question=f"Started conversation in category: {req.category}",
         answer=welcome_message,
@@ -474,13 +396,44 @@ async def start_conversation(req: StartConversationRequest):
 
 
 
+@router.get("/health/translation-memory")
+async def health_translation_memory():
+    """Hit/miss counters for the persistent translation memory."""
+    return translation_memory.stats()
+
+
+@router.get("/health/database")
+async def health_database():
+    """Pooled SQLite connection stats and the conversation write-behind queue depth."""
+    return {**db_pool_stats(), "conversation_writer": conversation_writer.stats()}
+
+
+@router.get("/health/user-cache")
+async def health_user_cache():
+    """Hit/miss counters for the in-process user lookup cache."""
+    return user_cache_stats()
+
+
+@router.get("/health/mandi-prices")
+async def health_mandi_prices():
+    """Local store and cache hit counters for mandi price lookups."""
+    return price_cache_stats()
+
+
+@router.get("/health/price-forecasts")
+async def health_price_forecasts():
+    """Stored model comparisons per crop, hit/fit counters and the precompute scheduler state."""
+    stats = await asyncio.to_thread(forecast_cache_stats)
+    return {**stats, "scheduler": forecast_scheduler.stats()}
+
+
 @router.get("/health/index/{user_id}")
 async def health_check_index(user_id: str):
     """Return readiness of state-specific FAISS index for this user.
 
     Always 200 with { ready: bool, state: str | None, reason?: str }
     """
-    user = fetch_user_by_id(user_id)
+    user = await async_database.fetch_user_by_id(user_id)
     if not user:
         return {"ready": False, "state": None, "reason": "User not found"}
 
@@ -498,7 +451,7 @@ async def health_check_index(user_id: str):
 @router.post("/ask")
 async def ask(req: AskRequest):
     # Validate user exists
-    user = fetch_user_by_id(req.user_id)
+    user = await async_database.fetch_user_by_id(req.user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found.")
 
@@ -511,36 +464,23 @@ async def ask(req: AskRequest):
     original_question = question
     processed_question = question
 
-    # Check if this is a price FORECAST query (predict future prices)
-    price_forecast_keywords = ['price prediction', 'price forecast', 'future price', 'price tomorrow',
-                                'price next week', 'predict price', 'price trend', 'will price',
-                                'price hoga', 'bhav kya hoga', 'दाम क्या होगा', 'भाव भविष्य']
-    is_price_forecast = any(kw in question.lower() for kw in price_forecast_keywords)
+    # Route on the intent found by the shared lexicon (one pass over the question)
+    _, intent = analyze(question)
 
-    if is_price_forecast:
+    if intent == "price_forecast":
         return await handle_price_forecast_query(req, user, question, original_question, user_language)
 
-    # Check if this is a price/market query (current prices)
-    price_keywords = ['price', 'market', 'rate', 'mandi', 'cost', 'भाव', 'दाम', 'मंडी', 'कीमत']
-    is_price_query = any(keyword in question.lower() for keyword in price_keywords)
-    
-    if is_price_query:
+    if intent == "price":
         # Handle market price comparison
         return await handle_price_query(req, user, question, original_question, user_language)
 
-    # Check if this is a yield/harvest/production query
-    yield_keywords = ['yield', 'harvest', 'production', 'output', 'predict yield',
-                      'expected yield', 'crop yield', 'how much', 'kitna paida',
-                      'उपज', 'पैदावार', 'फसल उत्पादन', 'कितना होगा']
-    is_yield_query = any(keyword in question.lower() for keyword in yield_keywords)
-
-    if is_yield_query:
+    if intent == "yield":
         return await handle_yield_query(req, user, question, original_question, user_language)
     
     # If user prefers Hindi, translate question to English for processing
     if _is_hindi_language(user_language):
         try:
-            processed_question = translate_text(question, "hi", "en")
+            processed_question = await translate_text_async(question, "hi", "en")
             print(f"Original Hindi question: {question}")
             print(f"Translated to English: {processed_question}")
         except Exception as e:
@@ -616,6 +556,12 @@ async def ask(req: AskRequest):
                     pass
                 docs = []
 
+    # Single-pass mode: retrieval used the translated query above, but Gemini sees the
+    # farmer's own question and answers in their language, so no en->hi step is needed.
+    language_instruction = _answer_language_instruction(user_language)
+    answered_in_user_language = bool(language_instruction)
+    generation_question = original_question if answered_in_user_language else processed_question
+
     answer = ""
     try:
         if docs:
@@ -625,17 +571,18 @@ async def ask(req: AskRequest):
             # Format context from chunked documents for LCEL
             context_text = "\n\n".join([d.page_content for d in docs])
             
-            chain = get_conversational_chain()
+            chain = get_conversational_chain(language_instruction)
             # Chain returns AIMessage; extract clean text
-            response = chain.invoke({"context": context_text, "question": processed_question})
+            response = chain.invoke({"context": context_text, "question": generation_question})
             answer = _extract_text_from_response(response)
         else:
             # Fallback: no retrieval available, answer directly with LLM
             llm = ChatGoogleGenerativeAI(model="gemini-flash-latest", temperature=0.3, timeout=120)
             direct_prompt = (
                 "You are Agri-Sahayak, a friendly and practical AI advisor for Indian farmers. "
-                "Provide a concise, helpful answer using best practices even without external documents.\n\n"
-                f"Farmer's question: {processed_question}\n\n"
+                "Provide a concise, helpful answer using best practices even without external documents.\n"
+                f"{language_instruction}\n"
+                f"Farmer's question: {generation_question}\n\n"
                 "Answer:"
             )
             resp = llm.invoke(direct_prompt)
@@ -644,7 +591,7 @@ async def ask(req: AskRequest):
         # Last-resort fallback to direct LLM if chain failed
         try:
             llm = ChatGoogleGenerativeAI(model="gemini-flash-latest", temperature=0.3, timeout=120)
-            resp = llm.invoke(processed_question)
+            resp = llm.invoke(f"{language_instruction}\n{generation_question}" if language_instruction else processed_question)
             answer = _extract_text_from_response(resp)
         except Exception as e2:
             raise HTTPException(status_code=500, detail=f"Unable to generate answer: {e2}")
@@ -697,8 +644,8 @@ async def ask(req: AskRequest):
     # -------------------------------
 
 
-    # If user prefers Hindi, translate the English answer back to Hindi
-    if _is_hindi_language(user_language):
+    # If user prefers Hindi and the answer was generated in English, translate it back to Hindi
+    if _is_hindi_language(user_language) and not answered_in_user_language:
         # Log the raw English answer before translation
         try:
             print(f"--- RAW ENGLISH ANSWER TO BE TRANSLATED: {answer} ---")
@@ -706,7 +653,7 @@ async def ask(req: AskRequest):
             # Ensure logging itself never breaks the request
             pass
         try:
-            hindi_answer = translate_text(answer, "en", "hi")
+            hindi_answer = await translate_text_async(answer, "en", "hi")
             try:
                 print(f"--- SUCCESSFULLY TRANSLATED TO HINDI: {hindi_answer} ---")
             except Exception:
@@ -730,7 +677,7 @@ async def ask(req: AskRequest):
     
     # Persist the conversation
     try:
-        insert_conversation(req.user_id, original_question, answer, conversation_id=conv_id)
+        enqueue_conversation(req.user_id, original_question, answer, conversation_id=conv_id)
     except Exception as e:
         print(f"Failed to save conversation: {e}")
 
@@ -762,15 +709,19 @@ async def handle_price_query(req: AskRequest, user: dict, question: str, origina
         if not price_data:
             return {"answer": f"Sorry, I couldn't find current market prices for {norm_crop} in {user_district}. Please try again later.", "conversation_id": req.conversation_id or str(os.urandom(16).hex())}
         
-        # Format context for LLM
-        context = format_price_context(price_data, norm_crop, user_district)
-        
-        # Generate AI response with price context
-        answer = await generate_price_response(context, question, user_language)
+        if use_price_template(question):
+            # Plain price lookup: render the comparison locally, no LLM round trip
+            answer = render_price_answer(price_data, norm_crop, user_district, user_language)
+        else:
+            # Format context for LLM
+            context = format_price_context(price_data, norm_crop, user_district)
+
+            # Generate AI response with price context
+            answer = await generate_price_response(context, question, user_language)
         
         # Persist conversation
         conv_id = req.conversation_id or str(os.urandom(16).hex())
-        insert_conversation(req.user_id, original_question, answer, conversation_id=conv_id)
+        enqueue_conversation(req.user_id, original_question, answer, conversation_id=conv_id)
         
         return {"answer": answer, "conversation_id": conv_id}
         
@@ -780,147 +731,90 @@ async def handle_price_query(req: AskRequest, user: dict, question: str, origina
 
 
 def extract_crop_from_question(question: str) -> str:
-    """Extract crop name from user's question"""
-    # Common crop names mapping
-    crop_keywords = {
-        'wheat': ['wheat', 'गेहूं'],
-        'rice': ['rice', 'paddy', 'धान', 'चावल'],
-        'sugarcane': ['sugarcane', 'गन्ना'],
-        'cotton': ['cotton', 'कपास'],
-        'maize': ['maize', 'corn', 'मक्का'],
-        'soybean': ['soybean', 'सोयाबीन'],
-        'mustard': ['mustard', 'सरसों'],
-        'onion': ['onion', 'प्याज'],
-        'potato': ['potato', 'आलू'],
-        'tomato': ['tomato', 'टमाटर'],
-        # Added ragi (finger millet) and millet (bajra/pearl millet) synonyms
-        'ragi': ['ragi', 'finger millet', 'mandua', 'nachni', 'नाचनी', 'मंडुआ'],
-        'millet': ['millet', 'millets', 'bajra', 'pearl millet', 'बाजरा']
-    }
-    
-    question_lower = question.lower()
-    for crop, keywords in crop_keywords.items():
-        if any(keyword in question_lower for keyword in keywords):
-            return crop
-    
-    return ""
+    """Extract crop name from user's question (canonical key, "" if none)"""
+    return extract_crop(question)
 
 
 def normalize_crop_name(crop: str) -> str:
     """Normalize user-provided crop names (Hindi/English) to canonical English keys.
 
-    Supported keys (canonical): wheat, rice, sugarcane, cotton, maize, soybean, mustard, onion, potato, tomato
+    Supported keys (canonical): see ``lexicon.CROP_SYNONYMS``.
     """
-    c = (crop or "").strip().lower()
-    mapping = {
-        # Wheat
-        "wheat": "wheat", "गेहूं": "wheat", "गेहुँ": "wheat", "गेहूँ": "wheat",
-        # Rice / Paddy
-        "rice": "rice", "paddy": "rice", "धान": "rice", "चावल": "rice",
-        # Sugarcane
-        "sugarcane": "sugarcane", "गन्ना": "sugarcane",
-        # Cotton
-        "cotton": "cotton", "कपास": "cotton",
-        # Maize / Corn
-        "maize": "maize", "corn": "maize", "मक्का": "maize",
-        # Soybean
-        "soybean": "soybean", "सोयाबीन": "soybean",
-        # Mustard
-        "mustard": "mustard", "सरसों": "mustard",
-        # Onion
-        "onion": "onion", "प्याज": "onion",
-        # Potato
-        "potato": "potato", "आलू": "potato",
-        # Tomato
-        "tomato": "tomato", "टमाटर": "tomato",
-        # Ragi / Finger millet
-        "ragi": "ragi", "finger millet": "ragi", "mandua": "ragi", "nachni": "ragi", "नाचनी": "ragi", "मंडुआ": "ragi",
-        # Millet (bajra / pearl millet)
-        "millet": "millet", "millets": "millet", "bajra": "millet", "pearl millet": "millet", "बाजरा": "millet",
-    }
-    return mapping.get(c, c)
+    return normalize_crop(crop)
 
 
-async def fetch_market_prices(user_district: str, crop: str) -> dict:
-    """Fetch market prices from data.gov.in API for user's district and nearby mandis"""
-    price_data = {}
-    
-    # List of districts to check (user's + nearby)
-    districts_to_check = [user_district]
-    if user_district in NEARBY_MANDIS:
-        districts_to_check.extend(NEARBY_MANDIS[user_district])
-    
-    for district in districts_to_check:
-        try:
-            price = await fetch_price_for_district(district, crop)
-            if price:
-                price_data[district] = price
-        except Exception as e:
-            print(f"Failed to fetch price for {district}: {e}")
-            continue
-    
-    return price_data
+async def fetch_market_prices(user_district: str, crop: str, nearby: Optional[list] = None) -> dict:
+    """Fetch market prices for the user's district and nearby mandis concurrently.
 
+    ``nearby`` defaults to the closest districts with data for the crop (see
+    ``mandi_geo``); districts that miss the fan-out deadline are left out (see
+    ``mandi_prices``).
+    """
+    if nearby is None:
+        nearby = await nearest_mandis(user_district, crop)
+    return await fetch_prices([user_district] + nearby, crop)
 
-async def fetch_price_for_district(district: str, crop: str) -> Optional[dict]:
-    """Fetch price data for a specific district and crop from data.gov.in API"""
+
+def use_price_template(question: str) -> bool:
+    """Whether a price question is answered from the template rather than Gemini (see PRICE_ANSWER_MODE)."""
+    if PRICE_ANSWER_MODE == "template":
+        return True
+    if PRICE_ANSWER_MODE == "llm":
+        return False
+    return not needs_reasoning(question)
+
+
+def _numeric_price(value) -> Optional[int]:
+    if isinstance(value, (int, float)):
+        return int(round(value))
     try:
-        # Data.gov.in API endpoint for market prices
-        # Note: This is a mock implementation - replace with actual API endpoint
-        url = "https://api.data.gov.in/resource/9ef84268-d588-465a-a308-a864a43d0070"
-        
-        params = {
-            'api-key': DATA_GOV_API_KEY,
-            'format': 'json',
-            'filters[district]': district.title(),
-            'filters[commodity]': crop.title(),
-            'limit': 1
-        }
-        
-        response = requests.get(url, params=params, timeout=10)
-        
-        if response.status_code == 200:
-            data = response.json()
-            if data.get('records') and len(data['records']) > 0:
-                record = data['records'][0]
-                return {
-                    'district': district,
-                    'crop': crop,
-                    'price': record.get('modal_price', 'N/A'),
-                    'unit': 'INR/quintal',
-                    'date': record.get('arrival_date', 'N/A')
-                }
-        
-        # Fallback: Generate mock data for demo purposes
-        # Remove this in production and handle API errors appropriately
-        import random
-        base_prices = {
-            'wheat': 2500, 'rice': 3000, 'sugarcane': 3500, 'cotton': 6000,
-            'maize': 2200, 'soybean': 4500, 'mustard': 5000, 'onion': 1500,
-            'potato': 1200, 'tomato': 2000,
-            # Added canonical crops
-            'ragi': 2800, 'millet': 2200
-        }
-        
-        if crop in base_prices:
-            # Add some variation for different districts
-            variation = random.randint(-200, 300)
-            mock_price = base_prices[crop] + variation
-            return {
-                'district': district,
-                'crop': crop,
-                'price': mock_price,
-                'unit': 'INR/quintal',
-                'date': 'Today'
-            }
-        
-        return None
-        
-    except Exception as e:
-        print(f"API call failed for {district}, {crop}: {e}")
+        return int(round(float(str(value).replace(',', '').strip())))
+    except (TypeError, ValueError):
         return None
 
 
+def render_price_answer(price_data: dict, crop: str, user_district: str, user_language: str) -> str:
+    """Render a price comparison straight from fetched prices, without the LLM"""
+    lang = language_code(user_language)
+    prices = []
+    for district, data in price_data.items():
+        price = _numeric_price(data.get('price'))
+        if price is not None:
+            prices.append((district.title(), price, district == user_district))
+    if not prices:
+        return t("price.no_comparison", lang)
+    return _price_comparison_text(crop, prices, lang)
+
+
+def _price_comparison_text(crop_name: str, prices: list, lang: str) -> str:
+    """Catalog-driven comparison layout for ``(district, price, is_user_district)`` entries."""
+    prices = sorted(prices, key=lambda x: x[1], reverse=True)
+    best_district, best_price, _ = prices[0]
+    localized_crop = t(f"crops.{crop_name.strip().lower()}", lang, default=crop_name.strip().title())
+
+    response_parts = [
+        f"**{t('price.analysis_title', lang, crop=localized_crop)}**",
+        "",
+        f"**{t('price.current_prices', lang)}**"
+    ]
+
+    for district, price, is_user_district in prices:
+        price_text = t("price.per_quintal", lang, price=f"{price:,}")
+        if is_user_district:
+            response_parts.append(f"- {district} ({t('price.your_district', lang)}): {price_text}")
+        else:
+            response_parts.append(f"- {district}: {price_text}")
+
+    response_parts.extend([
+        "",
+        f"**{t('price.best_market', lang)}** {t('price.best_market_text', lang, district=best_district, price=f'{best_price:,}')}",
+        "",
+        f"**{t('price.recommendation', lang)}** {t('price.recommendation_text', lang, district=best_district)}"
+    ])
+
+    return "\n".join(response_parts)
+
+
 def format_price_context(price_data: dict, crop: str, user_district: str) -> str:
     """Format price data into context string for LLM"""
     if not price_data:
@@ -972,6 +866,9 @@ async def generate_price_response(context: str, question: str, user_language: st
 
         Keep your response concise, well-formatted, and farmer-friendly. Use simple language and avoid any markdown formatting like ** or * symbols.
         """
+        language_instruction = _answer_language_instruction(user_language)
+        if language_instruction:
+            prompt_template += "\n" + language_instruction
         
         llm = ChatGoogleGenerativeAI(
             model="gemini-flash-latest",
@@ -1000,10 +897,10 @@ async def generate_price_response(context: str, question: str, user_language: st
         if not isinstance(answer, str):
             answer = str(answer)
         
-        # Translate to Hindi if needed
-        if _is_hindi_language(user_language):
+        # Translate to Hindi if needed (skipped when Gemini already answered in Hindi)
+        if _is_hindi_language(user_language) and not language_instruction:
             try:
-                answer = translate_text(answer, "en", "hi")
+                answer = await translate_text_async(answer, "en", "hi")
             except Exception as e:
                 print(f"Translation failed: {e}")
         
@@ -1021,18 +918,19 @@ async def generate_price_response(context: str, question: str, user_language: st
 
 def generate_fallback_price_response(context: str, user_language: str) -> str:
     """Generate a simple price comparison response without using AI when quota is exhausted"""
+    lang = language_code(user_language)
     try:
         # Parse the context to extract price information
         lines = context.split('\n')
         if len(lines) < 2:
-            return "Price data is currently unavailable. Please try again later."
+            return t("price.data_unavailable", lang)
         
         crop_info = lines[0]  # "Latest market prices for Sugarcane:"
         crop_name = crop_info.replace("Latest market prices for ", "").replace(":", "")
         price_lines = [line for line in lines[1:] if line.strip().startswith('•')]
         
         if not price_lines:
-            return "No price comparison data available at the moment."
+            return t("price.no_comparison", lang)
         
         # Find highest and lowest prices
         prices = []
@@ -1049,53 +947,23 @@ def generate_fallback_price_response(context: str, user_language: str) -> str:
                 continue
         
         if not prices:
-            return context + "\n\nPrice comparison data is available above."
-        
-        # Sort by price (highest first)
-        prices.sort(key=lambda x: x[1], reverse=True)
-        highest = prices[0]
-        lowest = prices[-1]
-        
-        # Generate clean, structured response
-        response_parts = [
-            f"**Market Price Analysis for {crop_name}**",
-            "",
-            "**Current Prices:**"
-        ]
-        
-        for district, price in prices:
-            if "(Your district)" in district:
-                clean_district = district.replace(" (Your district)", "")
-                response_parts.append(f"- {clean_district} (Your district): ₹{price:,}/quintal")
-            else:
-                response_parts.append(f"- {district}: ₹{price:,}/quintal")
-        
-        response_parts.extend([
-            "",
-            f"**Best Market:** {highest[0].replace(' (Your district)', '')} offers the best rate at ₹{highest[1]:,}/quintal",
-            "",
-            f"**Recommendation:** Consider selling in {highest[0].replace(' (Your district)', '')} for the highest price. However, factor in transportation costs and market accessibility when making your final decision."
-        ])
-        
-        response = "\n".join(response_parts)
+            return context + "\n\n" + t("price.data_above", lang)
         
-        # Translate to Hindi if needed
-        if _is_hindi_language(user_language):
-            try:
-                response = translate_text(response, "en", "hi")
-            except Exception as e:
-                print(f"Fallback translation failed: {e}")
-        
-        return response
+        # Generate clean, structured response from the locale catalog
+        return _price_comparison_text(
+            crop_name,
+            [(district.replace(' (Your district)', ''), price, '(Your district)' in district) for district, price in prices],
+            lang,
+        )
         
     except Exception as e:
         print(f"Error in fallback response: {e}")
-        return "Market price information is temporarily unavailable. Please try again later."
+        return t("price.temporarily_unavailable", lang)
 
 
 @router.post("/analyze_image")
 async def analyze_image(req: AnalyzeImageRequest):
-    user = fetch_user_by_id(req.user_id)
+    user = await async_database.fetch_user_by_id(req.user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
@@ -1145,7 +1013,7 @@ async def analyze_image(req: AnalyzeImageRequest):
     # ----------------------------
     try:
         conv_id = req.conversation_id or os.urandom(16).hex()
-        insert_conversation(
+        enqueue_conversation(
             req.user_id,
             req.question or "Crop disease analysis",
             answer,
@@ -1180,7 +1048,7 @@ async def predict_yield(req: PredictYieldRequest):
 
     If crop/season are not provided, falls back to the user's profile crop.
     """
-    user = fetch_user_by_id(req.user_id)
+    user = await async_database.fetch_user_by_id(req.user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
@@ -1213,7 +1081,7 @@ async def predict_yield(req: PredictYieldRequest):
         question = f"Yield prediction for {crop} ({season or 'auto-detected'} season)"
         answer = result.get("response", "Yield prediction could not be completed.")
         try:
-            insert_conversation(req.user_id, question, answer, conversation_id=conv_id)
+            enqueue_conversation(req.user_id, question, answer, conversation_id=conv_id)
         except Exception as db_err:
             print(f"DB ERROR: {db_err}")
 
@@ -1251,7 +1119,7 @@ class PredictPriceRequest(BaseModel):
 @router.post("/predict_price")
 async def predict_price(req: PredictPriceRequest):
     """Predict future market prices using ARIMA-GARCH family models."""
-    user = fetch_user_by_id(req.user_id)
+    user = await async_database.fetch_user_by_id(req.user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
@@ -1263,12 +1131,14 @@ async def predict_price(req: PredictPriceRequest):
     if not crop:
         raise HTTPException(status_code=400, detail="Crop name is required.")
 
-    forecast_days = min(req.forecast_days or 7, 30)
+    forecast_days = min(req.forecast_days or 7, FORECAST_MAX_DAYS)
     user_state = (user.get("state") or "").strip()
     user_district = (user.get("district") or "").strip()
 
     try:
-        result = run_price_prediction(
+        # Off the event loop: an on-demand fit (nothing stored yet) can take tens of seconds
+        result = await asyncio.to_thread(
+            run_price_prediction,
             crop=crop,
             google_api_key=GOOGLE_API_KEY,
             forecast_days=forecast_days,
@@ -1280,7 +1150,7 @@ async def predict_price(req: PredictPriceRequest):
         question = f"Price prediction for {crop} (next {forecast_days} days)"
         answer = result.get("response", "Price prediction could not be completed.")
         try:
-            insert_conversation(req.user_id, question, answer, conversation_id=conv_id)
+            enqueue_conversation(req.user_id, question, answer, conversation_id=conv_id)
         except Exception as db_err:
             print(f"DB ERROR: {db_err}")
 
@@ -1295,19 +1165,12 @@ async def predict_price(req: PredictPriceRequest):
 @router.get("/model_comparison/{crop}")
 async def model_comparison(crop: str, forecast_days: int = 7):
     """Compare all time-series models for a specific crop."""
-    from .market_price_prediction import fetch_commodity_prices, _generate_synthetic_prices, compare_models
     crop = normalize_crop_name(crop.strip().lower())
-    df = fetch_commodity_prices(crop)
-    if df is None or len(df) < 30:
-        df = _generate_synthetic_prices(crop)
-    prices = df["price_inr"].dropna()
-    result = compare_models(prices, forecast_days)
+    result, _ = await asyncio.to_thread(cached_comparison, crop, forecast_days)
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"Insufficient price data for {crop}")
     # Clean for JSON
-    for m in result["models"]:
-        for k in ("fitted", "residuals", "forecast_variance", "forecast_returns"):
-            m.pop(k, None)
-        if m.get("aic") == float("inf"):
-            m["aic"] = None
+    result["models"] = clean_models(result["models"])
     return result
 
 
@@ -1325,7 +1188,8 @@ async def handle_price_forecast_query(req: AskRequest, user: dict, question: str
             conv_id = req.conversation_id or str(os.urandom(16).hex())
             return {"answer": answer, "conversation_id": conv_id}
 
-        result = run_price_prediction(
+        result = await asyncio.to_thread(
+            run_price_prediction,
             crop=user_crop,
             google_api_key=GOOGLE_API_KEY,
             forecast_days=7,
@@ -1337,13 +1201,13 @@ async def handle_price_forecast_query(req: AskRequest, user: dict, question: str
 
         if _is_hindi_language(user_language):
             try:
-                answer = translate_text(answer, "en", "hi")
+                answer = await translate_text_async(answer, "en", "hi")
             except Exception as e:
                 print(f"Translation failed: {e}")
 
         conv_id = req.conversation_id or str(os.urandom(16).hex())
         try:
-            insert_conversation(req.user_id, original_question, answer, conversation_id=conv_id)
+            enqueue_conversation(req.user_id, original_question, answer, conversation_id=conv_id)
         except Exception as e:
             print(f"Failed to save conversation: {e}")
 
@@ -1395,13 +1259,13 @@ async def handle_yield_query(req: AskRequest, user: dict, question: str, origina
         # Translate if needed
         if _is_hindi_language(user_language):
             try:
-                answer = translate_text(answer, "en", "hi")
+                answer = await translate_text_async(answer, "en", "hi")
             except Exception as e:
                 print(f"Translation failed: {e}")
 
         conv_id = req.conversation_id or str(os.urandom(16).hex())
         try:
-            insert_conversation(req.user_id, original_question, answer, conversation_id=conv_id)
+            enqueue_conversation(req.user_id, original_question, answer, conversation_id=conv_id)
         except Exception as e:
             print(f"Failed to save conversation: {e}")
 
@@ -1417,7 +1281,7 @@ async def handle_yield_query(req: AskRequest, user: dict, question: str, origina
 
 @router.get("/users/{user_id}")
 async def get_user(user_id: str):
-    user = fetch_user_by_id(user_id)
+    user = await async_database.fetch_user_by_id(user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return {"user": user}
@@ -1425,7 +1289,7 @@ async def get_user(user_id: str):
 
 @router.get("/market-price/{user_id}")
 async def get_market_price(user_id: str):
-    user = fetch_user_by_id(user_id)
+    user = await async_database.fetch_user_by_id(user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
@@ -1449,8 +1313,8 @@ async def get_market_price(user_id: str):
 
 
 @router.get("/market-price-history/{user_id}")
-async def get_market_price_history(user_id: str):
-    user = fetch_user_by_id(user_id)
+async def get_market_price_history(user_id: str, response: Response):
+    user = await async_database.fetch_user_by_id(user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
@@ -1461,40 +1325,33 @@ async def get_market_price_history(user_id: str):
     if not district or not crop:
         raise HTTPException(status_code=400, detail="User profile must have district and crop set for price history.")
 
-    # Fetch prices for user's district and nearby mandis
-    price_data = await fetch_market_prices(district, crop)
-
-    # Mock data generation for 30-day price history for the primary district
-    today = datetime.now()
-    price_history = []
-    base_price = price_data.get(district, {}).get('price') or (hash(f"{district}{crop}") % 500 + 2000)
-
-    for i in range(30):
-        date = today - timedelta(days=i)
-        fluctuation = (hash(date.strftime('%Y-%m-%d')) % 200 - 100) / 10
-        price = base_price + (base_price * 0.1 * fluctuation / 100) + (i * 0.5)
-        price_history.append({"date": date.isoformat(), "price": round(price, 2)})
-
-    price_history.reverse() # Oldest to newest
+    nearby = await nearest_mandis(district, crop)
+    # Current prices and stored history are independent lookups
+    price_data, history = await asyncio.gather(
+        fetch_market_prices(district, crop, nearby),
+        price_history(district, crop, nearby),
+    )
 
-    # Format prices for nearby mandis
     nearby_prices = []
-    # Add a mock trend for visual representation
-    for i, (mandi, data) in enumerate(price_data.items()):
+    for mandi, data in price_data.items():
         nearby_prices.append({
             "district": mandi.title(),
             "price": data.get('price'),
             "is_user_district": mandi == district,
-            "trend": "up" if i % 2 == 0 else "down"  # Mock trend based on index
+            "trend": history["trends"].get(mandi),
         })
 
     # Sort by user district first, then alphabetically
     nearby_prices.sort(key=lambda x: (not x['is_user_district'], x['district']))
 
+    # Stored prices change at most once a day; let the browser reuse the response
+    response.headers["Cache-Control"] = f"private, max-age={PRICE_HISTORY_MAX_AGE_SECONDS}"
     return {
         "crop": crop.title(),
         "district": district.title(),
-        "price_history": price_history,
+        "price_history": history["price_history"],
+        "stats": history["stats"],
+        "as_of": history["as_of"],
         "nearby_prices": nearby_prices
     }
 
@@ -1504,7 +1361,7 @@ async def get_startup_suggestions(user_id: str):
 
     This is heuristic and can be improved later; for now we branch on crop/state.
     """
-    user = fetch_user_by_id(user_id)
+    user = await async_database.fetch_user_by_id(user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
@@ -1559,80 +1416,14 @@ async def get_startup_suggestions(user_id: str):
     # Limit to 4
     return {"suggestions": unique_suggestions[:4]}
 
-CROP_ACTIVITIES = {
-    "wheat": {
-        "august": ["Land preparation", "Seed treatment"],
-        "september": ["Sowing", "First irrigation"],
-        "october": ["Weed control", "Fertilizer application"],
-        "november": ["Pest monitoring", "Second irrigation"],
-        "december": ["Growth monitoring", "Disease prevention"],
-        "january": ["Pre-harvest check", "Harvesting preparation"],
-    },
-    "rice": {
-        "january": ["Rabi rice harvesting (if applicable)", "Seed procurement planning"],
-        "february": ["Land preparation and levelling", "Soil testing and nutrient planning"],
-        "march": ["Summer ploughing", "Green manure crop sowing"],
-        "april": ["Pre-kharif field preparation", "Input procurement (seed, fertilizer)"],
-        "may": ["Nursery bed preparation", "Seed treatment and soaking"],
-        "june": ["Nursery preparation", "Seed selection"],
-        "july": ["Transplanting", "Water management"],
-        "august": ["Weed management", "Nutrient application"],
-        "september": ["Pest and disease control", "Mid-season irrigation"],
-        "october": ["Flowering stage care", "Grain filling monitoring"],
-        "november": ["Harvesting", "Post-harvest handling"],
-        "december": ["Straw management and composting", "Rabi crop planning"],
-    },
-    "sugarcane": {
-        "january": ["Planting", "Initial irrigation"],
-        "february": ["Weed control", "Gap filling"],
-        "march": ["Fertilizer application", "Earthing up"],
-        "april": ["Propping and tying", "Pest management"],
-        "may": ["Irrigation management", "Growth monitoring"],
-        "june": ["Pre-monsoon care", "Disease scouting"],
-        "july": ["Monsoon management", "Drainage check"],
-        "august": ["Tying and propping", "Top dressing"],
-        "september": ["Ripening monitoring", "Pest control"],
-        "october": ["Harvesting preparation", "Seed cane selection"],
-        "november": ["Harvesting", "Ratoon management"],
-        "december": ["Harvesting continues", "Field cleaning"],
-    },
-    "cotton": {
-        "may": ["Land preparation", "Sowing"],
-        "june": ["Thinning", "Weed control"],
-        "july": ["Fertilizer top dressing", "Pest scouting"],
-        "august": ["Flowering and boll formation care", "Irrigation"],
-        "september": ["Bollworm management", "Nutrient spray"],
-        "october": ["Picking of cotton", "Quality management"],
-        "november": ["Second picking", "Pest clean-up"],
-    },
-    "maize": {
-        "june": ["Sowing", "Weed management"],
-        "july": ["Nitrogen top dressing", "Irrigation"],
-        "august": ["Pest control (stem borer)", "Tasseling and silking care"],
-        "september": ["Grain filling", "Harvesting for fodder (if any)"],
-        "october": ["Harvesting", "Drying and storage"],
-    },
-    "ragi": {
-        "june": ["Nursery raising / direct sowing", "Seed treatment"],
-        "july": ["Transplanting (if nursery)", "First weeding and gap filling"],
-        "august": ["Top dressing of nitrogen", "Weed management"],
-        "september": ["Pest and disease scouting", "Irrigation as needed"],
-        "october": ["Ear head emergence care", "Foliar nutrition if required"],
-        "november": ["Harvesting at physiological maturity", "Threshing and drying"],
-    },
-    "millet": {
-        "june": ["Field preparation", "Sowing of bajra/pearl millet"],
-        "july": ["Thinning and weeding", "Basal/Top fertilizer application"],
-        "august": ["Pest monitoring (shoot fly/aphids)", "Moisture conservation"],
-        "september": ["Ear emergence care", "Disease management (downy mildew)"],
-        "october": ["Harvesting at 15–20% grain moisture", "Drying and storage"],
-    },
-}
+# English source calendars; translations live in backend/locales/<lang>.json
+CROP_ACTIVITIES = lookup("crop_activities", default={})
 
 @router.get("/crop_activities")
-async def get_crop_activities(crop: str, month: str):
+async def get_crop_activities(crop: str, month: str, language: Optional[str] = None):
     """
-    Returns a list of suggested crop activities for a given crop and month.
+    Returns a list of suggested crop activities for a given crop and month,
+    in the requested language when a catalog for it exists (English otherwise).
     """
     crop_lower = normalize_crop_name(crop).lower()
     month_lower = month.lower()
@@ -1644,7 +1435,7 @@ async def get_crop_activities(crop: str, month: str):
             pass
         return {"activities": []}
         
-    activities = CROP_ACTIVITIES[crop_lower].get(month_lower, [])
+    activities = lookup(f"crop_activities.{crop_lower}.{month_lower}", language_code(language), default=[])
     try:
         print(f"[DEBUG] crop_activities crop={crop_lower} month={month_lower} count={len(activities)}")
     except Exception:
@@ -1658,38 +1449,121 @@ async def get_crop_activities(crop: str, month: str):
     
 #     return {"conversation": conversations[pdf_id]}
 
+CONVERSATION_PAGE_DEFAULT = int(os.getenv("CONVERSATION_PAGE_DEFAULT", "50"))
+CONVERSATION_PAGE_MAX = int(os.getenv("CONVERSATION_PAGE_MAX", "200"))
+
+
+def _normalize_since(since: Optional[str]) -> Optional[str]:
+    """Accept any ISO-8601 timestamp and render it the way SQLite stores ours."""
+    if not since:
+        return None
+    try:
+        parsed = datetime.fromisoformat(since.strip().replace("Z", "+00:00"))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="'since' must be an ISO-8601 timestamp")
+    if parsed.tzinfo is not None:
+        # Stored timestamps are naive local time (datetime.now())
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return str(parsed)
+
+
 @router.get("/users/{user_id}/conversations")
-async def list_user_conversations(user_id: str):
-    summaries = fetch_user_conversation_summaries(user_id)
+async def list_user_conversations(
+    user_id: str,
+    limit: int = Query(CONVERSATION_PAGE_DEFAULT, ge=1, le=CONVERSATION_PAGE_MAX),
+    cursor: Optional[str] = None,
+    since: Optional[str] = None,
+):
+    """Keyset-paginated conversation list, newest first.
+
+    Pass the returned ``next_cursor`` back as ``cursor`` for the next page
+    (null when there are no more). ``since`` limits the result to
+    conversations with messages after that timestamp.
+    """
+    # Make queued writes (e.g. the message just asked) visible before reading
+    await asyncio.to_thread(conversation_writer.flush)
+    try:
+        summaries, next_cursor = await async_database.fetch_user_conversation_summaries_page(
+            user_id, limit, cursor=cursor, since=_normalize_since(since)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     # Ensure stable keys
     conversations = [
-        {"conversation_id": s["conversation_id"], "title": s["title"], "timestamp": s["first_timestamp"]}
+        {
+            "conversation_id": s["conversation_id"],
+            "title": s["title"],
+            "timestamp": s["first_timestamp"],
+            "updated_at": s["last_timestamp"],
+            "message_count": s["message_count"],
+        }
         for s in summaries
     ]
-    # Ensure stable keys
-    return {"conversations": conversations}
+    return {"conversations": conversations, "next_cursor": next_cursor}
+
+
+@router.get("/users/{user_id}/conversations/search")
+async def search_user_conversations(
+    user_id: str,
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+):
+    """Ranked full-text search over a user's past questions and answers.
+
+    Matches are wrapped in ``<mark>`` tags; ``answer_snippet`` is a short
+    excerpt around the best match rather than the whole answer.
+    """
+    await asyncio.to_thread(conversation_writer.flush)
+    try:
+        rows = await async_database.search_conversations(user_id, q, limit)
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    results = [
+        {
+            "conversation_id": row["conversation_id"],
+            "message_id": row["id"],
+            "question": row["question"],
+            "answer_snippet": row["answer_snippet"],
+            "timestamp": row["timestamp"],
+            "score": round(-row["score"], 4),
+        }
+        for row in rows
+    ]
+    return {"results": results}
 
 
 @router.get("/conversations/{conversation_id}")
-async def get_conversation_by_id_route(conversation_id: str):
-    rows = fetch_conversation_by_id(conversation_id)
+async def get_conversation_by_id_route(
+    conversation_id: str,
+    limit: int = Query(CONVERSATION_PAGE_DEFAULT, ge=1, le=CONVERSATION_PAGE_MAX),
+    cursor: Optional[str] = None,
+    since: Optional[str] = None,
+):
+    """Keyset-paginated messages of one conversation, oldest first (same contract as above)."""
+    # Make queued writes (e.g. the message just asked) visible before reading
+    await asyncio.to_thread(conversation_writer.flush)
+    try:
+        rows, next_cursor = await async_database.fetch_conversation_page(
+            conversation_id, limit, cursor=cursor, since=_normalize_since(since)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     conversation = [
-        {"question": row["question"], "answer": row["answer"], "timestamp": row["timestamp"]}
+        {"id": row["id"], "question": row["question"], "answer": row["answer"], "timestamp": row["timestamp"]}
         for row in rows
     ]
     # Ensure stable keys
-    return {"conversation": conversation}
+    return {"conversation": conversation, "next_cursor": next_cursor}
 
 
 @router.delete("/conversations/{conversation_id}")
 async def delete_conversation(conversation_id: str):
     """Delete a conversation and all its messages."""
     try:
-        with get_db_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM conversations WHERE conversation_id = ?", (conversation_id,))
-            conn.commit()
-            return {"message": "Conversation deleted successfully"}
+        # Queued messages of this conversation must land before they are deleted
+        await asyncio.to_thread(conversation_writer.flush)
+        await async_database.delete_conversation(conversation_id)
+        return {"message": "Conversation deleted successfully"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to delete conversation: {str(e)}")
 
@@ -1702,81 +1576,15 @@ async def update_conversation_title(conversation_id: str, title_update: dict):
         raise HTTPException(status_code=400, detail="Title cannot be empty")
     
     try:
-        with get_db_connection() as conn:
-            cursor = conn.cursor()
-            # Update the first question (title) for this conversation
-            cursor.execute("""
-                UPDATE conversations 
-                SET question = ? 
-                WHERE conversation_id = ? AND timestamp = (
-                    SELECT MIN(timestamp) 
-                    FROM conversations 
-                    WHERE conversation_id = ?
-                )
-            """, (new_title, conversation_id, conversation_id))
-            conn.commit()
-            return {"message": "Conversation title updated successfully"}
+        await asyncio.to_thread(conversation_writer.flush)
+        await async_database.update_conversation_title(conversation_id, new_title)
+        return {"message": "Conversation title updated successfully"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to update conversation title: {str(e)}")
 
-# District coordinates for weather alerts
-DISTRICT_COORDINATES = {
-    'bangalore': (12.9716, 77.5946),
-    'mysore': (12.2958, 76.6394),
-    'mumbai': (19.0760, 72.8777),
-    'pune': (18.5204, 73.8567),
-    'ludhiana': (30.9010, 75.8573),
-    'amritsar': (31.6340, 74.8723),
-    'lucknow': (26.8467, 80.9462),
-    'kanpur': (26.4499, 80.3319),
-    'agra': (27.1767, 78.0081),
-    'varanasi': (25.3176, 82.9739),
-    'hoshiarpur': (31.5344, 75.9119),
-    'patiala': (30.3398, 76.3869),
-    'noida': (28.5355, 77.3910),
-    'hubballi': (15.3647, 75.1240),
-    'gorakhpur': (26.7606, 83.3732)
-}
-
 def get_coordinates(district):
-    """Get coordinates for a district, trying hardcoded list then Geocoding API"""
-    # 1. Try exact match in hardcoded list
-    if district in DISTRICT_COORDINATES:
-        return DISTRICT_COORDINATES[district]
-    
-    # 2. Try normalized match (case-insensitive)
-    district_lower = district.lower().strip()
-    if district_lower in DISTRICT_COORDINATES:
-        return DISTRICT_COORDINATES[district_lower]
-
-    # 3. Try variations (remove "urban", "rural", "district")
-    for key in DISTRICT_COORDINATES:
-        if key in district_lower or district_lower in key:
-            return DISTRICT_COORDINATES[key]
-
-    # 4. Fallback to OpenWeatherMap Geocoding API
-    OPENWEATHER_API_KEY = os.getenv("OPENWEATHER_API_KEY", "05b6e91c54291c719f5226c3ff40a9a5")
-    try:
-        # Try raw district name
-        geo_url = f"http://api.openweathermap.org/geo/1.0/direct?q={district}&limit=1&appid={OPENWEATHER_API_KEY}"
-        resp = requests.get(geo_url, timeout=5)
-        if resp.status_code == 200 and resp.json():
-            data = resp.json()[0]
-            return (data['lat'], data['lon'])
-            
-        # Try stripping common suffixes if raw failed
-        clean_district = district_lower.replace(" urban", "").replace(" rural", "").replace(" district", "").strip()
-        if clean_district != district_lower:
-            geo_url = f"http://api.openweathermap.org/geo/1.0/direct?q={clean_district}&limit=1&appid={OPENWEATHER_API_KEY}"
-            resp = requests.get(geo_url, timeout=5)
-            if resp.status_code == 200 and resp.json():
-                data = resp.json()[0]
-                return (data['lat'], data['lon'])
-                
-    except Exception as e:
-        print(f"Geocoding API failed for {district}: {e}")
-        
-    return None
+    """Get coordinates for a district from the gazetteer, geocoding (and persisting) unknown ones"""
+    return district_coordinates(district)
 
 def fetch_weather_data_for_alerts(district):
     """Fetch weather data for alerts using OpenWeatherMap API"""
@@ -1785,7 +1593,6 @@ def fetch_weather_data_for_alerts(district):
         return None
     
     lat, lon = coords
-    OPENWEATHER_API_KEY = os.getenv("OPENWEATHER_API_KEY", "05b6e91c54291c719f5226c3ff40a9a5")
     
     try:
         # Current weather API
@@ -1890,8 +1697,8 @@ def fetch_weather_data_for_alerts(district):
     except Exception as e:
         return None
 
-def analyze_weather_for_alerts(weather_data, district):
-    """Analyze weather data and return alerts"""
+def analyze_weather_for_alerts(weather_data, district, language: str = "en"):
+    """Analyze weather data and return alerts (titles/messages from the locale catalog)"""
     if not weather_data or 'daily' not in weather_data:
         return []
     
@@ -1915,53 +1722,36 @@ def analyze_weather_for_alerts(weather_data, district):
         wind_speed = day_data['wind_speed'] * 3.6  # Convert m/s to km/h
         humidity = day_data['humidity']
         
-        day_name = "today" if day_idx == 0 else "tomorrow"
+        day_name = t(f"weather_alerts.day.{'today' if day_idx == 0 else 'tomorrow'}", language)
+        params = {
+            'max_temp': max_temp, 'min_temp': min_temp, 'rain_mm': rain_mm,
+            'wind_speed': wind_speed, 'humidity': humidity, 'day_name': day_name,
+        }
+
+        def _alert(alert_type, severity, icon):
+            return {
+                'type': alert_type,
+                'title': t(f"weather_alerts.{alert_type}.title", language),
+                'message': t(f"weather_alerts.{alert_type}.message", language, **params),
+                'severity': severity,
+                'icon': icon
+            }
         
         # Alert conditions
         if max_temp > 40:
-            alerts.append({
-                'type': 'heatwave',
-                'title': 'Heatwave Warning',
-                'message': f"Temperature expected to reach {max_temp:.1f}°C {day_name}. Ensure adequate irrigation and provide shade for livestock.",
-                'severity': 'high',
-                'icon': '🌡️'
-            })
+            alerts.append(_alert('heatwave', 'high', '🌡️'))
         
         if rain_mm > 50:
-            alerts.append({
-                'type': 'heavy_rain',
-                'title': 'Heavy Rainfall Alert',
-                'message': f"{rain_mm:.1f}mm rain expected {day_name}. Protect crops from waterlogging and ensure proper drainage.",
-                'severity': 'high',
-                'icon': '🌧️'
-            })
+            alerts.append(_alert('heavy_rain', 'high', '🌧️'))
         
         if wind_speed > 30:
-            alerts.append({
-                'type': 'high_wind',
-                'title': 'High Wind Warning',
-                'message': f"Wind speeds up to {wind_speed:.1f} km/h expected {day_name}. Secure farm structures and protect young plants.",
-                'severity': 'medium',
-                'icon': '💨'
-            })
+            alerts.append(_alert('high_wind', 'medium', '💨'))
         
         if min_temp < 5:
-            alerts.append({
-                'type': 'frost',
-                'title': 'Frost Warning',
-                'message': f"Temperature may drop to {min_temp:.1f}°C {day_name}. Protect sensitive crops from frost damage.",
-                'severity': 'high',
-                'icon': '❄️'
-            })
+            alerts.append(_alert('frost', 'high', '❄️'))
         
         if humidity > 90 and max_temp > 30:
-            alerts.append({
-                'type': 'disease_risk',
-                'title': 'Disease Risk Alert',
-                'message': f"High humidity ({humidity}%) and temperature ({max_temp:.1f}°C) {day_name} may increase fungal disease risk. Monitor crops closely.",
-                'severity': 'medium',
-                'icon': '🦠'
-            })
+            alerts.append(_alert('disease_risk', 'medium', '🦠'))
     
     return alerts
 
@@ -1970,7 +1760,7 @@ async def get_weather_alerts(user_id: str):
     """Get weather alerts for a specific user based on their district"""
     try:
         # Fetch user details
-        user = fetch_user_by_id(user_id)
+        user = await async_database.fetch_user_by_id(user_id)
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
         
@@ -1983,8 +1773,9 @@ async def get_weather_alerts(user_id: str):
         if not weather_data:
             return {"alerts": [], "district": user_district, "error": "Weather data unavailable"}
         
-        # Analyze weather for alerts
-        alerts = analyze_weather_for_alerts(weather_data, user_district)
+        # Analyze weather for alerts in the user's language
+        lang = language_code(user.get("language"))
+        alerts = analyze_weather_for_alerts(weather_data, user_district, lang)
         
         # Add timestamp and district info
         for alert in alerts:
@@ -1995,7 +1786,9 @@ async def get_weather_alerts(user_id: str):
         if alerts:
             phone = (user.get("phone_number") or "").strip()
             name = user.get("name", "Farmer")
-            send_alert_sms_to_user(phone, name, user_district, alerts)
+            # SMS bodies are ASCII-only, so they are always built from the English templates
+            sms_alerts = alerts if lang == "en" else analyze_weather_for_alerts(weather_data, user_district, "en")
+            send_alert_sms_to_user(phone, name, user_district, sms_alerts)
         
         return {
             "alerts": alerts,
@@ -2016,7 +1809,7 @@ async def get_weather_forecast(user_id: str):
     Shape: { district, current, daily: [{ date, temp_max, temp_min, humidity, weather: [{main, description, icon}] }] }
     """
     try:
-        user = fetch_user_by_id(user_id)
+        user = await async_database.fetch_user_by_id(user_id)
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
 
@@ -2058,7 +1851,7 @@ async def get_market_prices(user_id: str):
     Shape: { crop, district, prices: { [district]: { price, unit, date } } }
     """
     try:
-        user = fetch_user_by_id(user_id)
+        user = await async_database.fetch_user_by_id(user_id)
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
 
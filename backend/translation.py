@@ -0,0 +1,297 @@
+"""Markdown-aware, paragraph-parallel translation of long answers.
+
+Gemini answers are structured markdown (``###`` headers, bullets, ``---``
+rules, ``**bold**`` labels).  Sending the whole answer to Google Translate as
+one blob hits the 5000-character limit, mangles the markup and serialises the
+wait.  Instead the answer is split into line-level segments: the markdown
+prefix (indent, header hashes, bullet or number marker, wrapping ``**``) is kept
+aside, only the text is translated, and segments run concurrently on a bounded
+thread pool before being stitched back together in order.
+
+Segments without translatable words (rules, blank lines, prices such as
+``₹2,500/quintal``) and segments already present in the translation memory are
+never sent to the pool.
+
+This module is also the single translation client for the web routes and the
+voice pipeline.  ``translate_text`` is the blocking entry point for scripts and
+worker threads; ``translate_text_async`` is what async handlers await: the
+synchronous deep-translator SDK and the Gemini fallback run on the shared,
+bounded worker pool so the event loop is never blocked and no per-call event
+loop is created.
+
+Usage::
+
+    from backend.translation import translate_text_async
+    answer_hi = await translate_text_async(answer, "en", "hi")
+"""
+
+import asyncio
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from deep_translator import GoogleTranslator
+from langchain_google_genai import ChatGoogleGenerativeAI
+
+from .translation_memory import translation_memory
+
+# Google Translate rejects inputs above 5000 characters; keep a safety margin
+MAX_SEGMENT_CHARS = 4500
+
+TRANSLATION_MAX_WORKERS = int(os.getenv("TRANSLATION_MAX_WORKERS", "6"))
+
+_RULE_LINE = re.compile(r"^\s*(?:-{3,}|\*{3,}|_{3,})\s*$")
+_LINE_PREFIX = re.compile(r"^(\s*(?:#{1,6}\s+|[-*+•]\s+|\d+[.)]\s+|>\s*)?)(.*?)(\s*)$")
+_WRAPPED_BOLD = re.compile(r"^(\*\*|__)((?:(?!\1).)+)(\1)(:?)$")
+_SENTENCE_END = re.compile(r"(?<=[.!?।])\s+")
+_HAS_WORDS = re.compile(r"[^\W\d_]{2,}")
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_fallback_llm: Optional[ChatGoogleGenerativeAI] = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=TRANSLATION_MAX_WORKERS, thread_name_prefix="translate")
+        return _executor
+
+
+def _get_fallback_llm() -> ChatGoogleGenerativeAI:
+    # One long-lived client so fallback calls reuse its pooled connections
+    global _fallback_llm
+    if _fallback_llm is None:
+        _fallback_llm = ChatGoogleGenerativeAI(model="gemini-flash-latest", temperature=0.0, timeout=60)
+    return _fallback_llm
+
+
+def shutdown_translation_pool() -> None:
+    """Release the worker pool (called on application shutdown)."""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _language_name(code: str) -> str:
+    return "Hindi" if code.startswith("hi") else ("English" if code.startswith("en") else code)
+
+
+def fallback_translate_via_llm(text: str, src: str, dest: str) -> str:
+    """Fallback translation using the chat model to improve reliability."""
+    try:
+        prompt = (
+            f"Translate the following text from {_language_name(src)} to {_language_name(dest)}. "
+            "Only return the translated text without quotes or comments.\n\n"
+            f"Text: {text}"
+        )
+        resp = _get_fallback_llm().invoke(prompt)
+        out = getattr(resp, "content", resp)
+        # Gemini may return a list of content parts instead of a plain string
+        if isinstance(out, list):
+            out = "".join(p.get("text", "") if isinstance(p, dict) else str(p) for p in out)
+        out = str(out or "").strip()
+        # Remove any "content = " prefixes that might be present
+        if out.startswith("content = "):
+            out = out[10:].strip()
+        # Remove quotes if present
+        if (out.startswith("'") and out.endswith("'")) or (out.startswith('"') and out.endswith('"')):
+            out = out[1:-1].strip()
+        return out or text
+    except Exception as e:
+        print(f"--- FALLBACK LLM TRANSLATION ERROR: {e} ---")
+        return text
+
+
+def translate_segment(text: str, src: str, dest: str) -> str:
+    """Translate one plain-text segment (memory -> deep-translator -> LLM fallback). Blocking."""
+    # Serve repeated strings from the translation memory before any network call
+    cached = translation_memory.get(src, dest, text)
+    if cached is not None:
+        return cached
+    return _translate_uncached(text, src, dest)
+
+
+def _translate_uncached(text: str, src: str, dest: str) -> str:
+    """``translate_segment`` for text already looked up in the memory (and missed). Blocking."""
+    # Primary attempt: deep-translator
+    translated = text
+    try:
+        result = GoogleTranslator(source=src, target=dest).translate(text)
+        translated = (result or text).strip()
+    except Exception as e:
+        print(f"--- GOOGLETRANS ERROR: {e} ---")
+        translated = text
+
+    # If translation failed or didn't change, try LLM fallback
+    if not translated or translated.strip() == text.strip():
+        translated = fallback_translate_via_llm(text, src, dest)
+    translation_memory.put(src, dest, text, translated)
+    return translated
+
+
+def _split_long_text(text: str, limit: int = MAX_SEGMENT_CHARS) -> List[str]:
+    """Split an over-long paragraph on sentence boundaries so each piece fits the API limit."""
+    if len(text) <= limit:
+        return [text]
+    pieces: List[str] = []
+    current = ""
+    for sentence in _SENTENCE_END.split(text):
+        while len(sentence) > limit:
+            # No sentence boundary to use; hard-split rather than fail the request
+            pieces.append(sentence[:limit])
+            sentence = sentence[limit:]
+        if current and len(current) + len(sentence) + 1 > limit:
+            pieces.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}".strip()
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def split_markdown_segments(text: str) -> List[Tuple[str, str, str]]:
+    """Split markdown into ``(prefix, body, suffix)`` triples, one per translatable unit.
+
+    Only ``body`` is sent for translation; ``prefix + body + suffix`` for every
+    triple, joined in order, reproduces the original text (over-long paragraphs
+    are re-joined with single spaces between sentences).
+    """
+    segments: List[Tuple[str, str, str]] = []
+    lines = text.split("\n")
+    for index, line in enumerate(lines):
+        newline = "\n" if index < len(lines) - 1 else ""
+        if not line.strip() or _RULE_LINE.match(line):
+            segments.append((line + newline, "", ""))
+            continue
+        prefix, body, trailing = _LINE_PREFIX.match(line).groups()
+        suffix = trailing
+        bold = _WRAPPED_BOLD.match(body)
+        if bold:
+            prefix += bold.group(1)
+            body = bold.group(2)
+            suffix = bold.group(3) + bold.group(4) + suffix
+        pieces = _split_long_text(body)
+        for i, piece in enumerate(pieces):
+            piece_prefix = prefix if i == 0 else " "
+            piece_suffix = (suffix + newline) if i == len(pieces) - 1 else ""
+            segments.append((piece_prefix, piece, piece_suffix))
+    return segments
+
+
+def needs_segmented_translation(text: str) -> bool:
+    """True for multi-line or over-long text that should not go out as a single request."""
+    return "\n" in text.strip() or len(text) > MAX_SEGMENT_CHARS
+
+
+def is_translatable(body: str) -> bool:
+    return bool(body and _HAS_WORDS.search(body))
+
+
+def _plan_segments(
+    segments: List[Tuple[str, str, str]], src: str, dest: str
+) -> Tuple[List[str], Dict[str, List[int]]]:
+    """Resolve untranslatable and cached segments; return remaining bodies -> positions."""
+    translated = [body for _, body, _ in segments]
+    pending: Dict[str, List[int]] = {}
+    for i, (_, body, _) in enumerate(segments):
+        if not is_translatable(body):
+            continue
+        cached = translation_memory.get(src, dest, body)
+        if cached is not None:
+            translated[i] = cached
+            continue
+        pending.setdefault(body, []).append(i)
+    return translated, pending
+
+
+def _reassemble(segments: List[Tuple[str, str, str]], translated: List[str]) -> str:
+    return "".join(prefix + body + suffix for (prefix, _, suffix), body in zip(segments, translated))
+
+
+def translate_markdown(
+    text: str,
+    src: str,
+    dest: str,
+    segment_translator: Callable[[str, str, str], str] = _translate_uncached,
+) -> str:
+    """Translate a markdown document segment-by-segment, preserving its formatting. Blocking.
+
+    ``segment_translator(text, src, dest)`` translates a single plain-text
+    segment that already missed the translation memory (it is expected to
+    store its result there).
+    """
+    segments = split_markdown_segments(text)
+    translated, pending = _plan_segments(segments, src, dest)
+
+    if pending:
+        executor = _get_executor()
+        futures = {body: executor.submit(segment_translator, body, src, dest) for body in pending}
+        for body, future in futures.items():
+            try:
+                result = future.result() or body
+            except Exception as e:
+                print(f"--- SEGMENT TRANSLATION ERROR: {e} ---")
+                result = body
+            for i in pending[body]:
+                translated[i] = result.strip()
+
+    return _reassemble(segments, translated)
+
+
+def translate_text(text: str, src: str, dest: str) -> str:
+    """Translate text from source language to destination language with fallback. Blocking.
+
+    Multi-line markdown answers are split on their structure and translated
+    segment-by-segment in parallel so formatting survives and the 5000-character
+    limit of the translation API is never hit.
+    """
+    if not needs_segmented_translation(text):
+        return translate_segment(text, src, dest)
+
+    # A miss is not counted here: each segment is looked up (and counted) next
+    cached = translation_memory.get(src, dest, text, record_miss=False)
+    if cached is not None:
+        return cached
+    translated = translate_markdown(text, src, dest)
+    translation_memory.put(src, dest, text, translated)
+    return translated
+
+
+async def _run_in_pool(func, *args):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), func, *args)
+
+
+async def translate_text_async(text: str, src: str, dest: str) -> str:
+    """Awaitable ``translate_text``: all blocking work runs on the shared translation pool."""
+    if not needs_segmented_translation(text):
+        return (await _run_in_pool(translate_segment, text, src, dest)).strip()
+
+    cached = await _run_in_pool(translation_memory.get, src, dest, text, False)
+    if cached is not None:
+        return cached
+
+    segments = split_markdown_segments(text)
+    translated, pending = await _run_in_pool(_plan_segments, segments, src, dest)
+    bodies = list(pending)
+    results = await asyncio.gather(
+        *(_run_in_pool(_translate_uncached, body, src, dest) for body in bodies),
+        return_exceptions=True,
+    )
+    for body, result in zip(bodies, results):
+        if isinstance(result, Exception):
+            print(f"--- SEGMENT TRANSLATION ERROR: {result} ---")
+            result = body
+        for i in pending[body]:
+            translated[i] = (result or body).strip()
+
+    answer = _reassemble(segments, translated)
+    await _run_in_pool(translation_memory.put, src, dest, text, answer)
+    return answer
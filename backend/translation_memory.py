@@ -0,0 +1,147 @@
+"""Persistent translation memory shared by the web and voice translation helpers.
+
+Translations are keyed by (source language, target language, SHA-256 of the
+text) and stored in a small SQLite database next to ``documents.db``.  A bounded
+in-process LRU sits in front of SQLite so repeated strings (welcome messages,
+crop names, frequent questions) never leave the process.
+
+Usage::
+
+    from backend.translation_memory import translation_memory
+    cached = translation_memory.get("en", "hi", text)
+    if cached is None:
+        cached = call_translation_service(text)
+        translation_memory.put("en", "hi", text, cached)
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+DEFAULT_DB_PATH = Path(__file__).resolve().parent / "translation_memory.db"
+
+
+def _text_hash(text: str) -> str:
+    return hashlib.sha256(text.strip().encode("utf-8")).hexdigest()
+
+
+class TranslationMemory:
+    """Two-level (LRU + SQLite) cache of translated strings with hit/miss counters."""
+
+    def __init__(self, db_path: Path = DEFAULT_DB_PATH, max_memory_entries: int = 2048):
+        self.db_path = Path(db_path)
+        self.max_memory_entries = max_memory_entries
+        self._lru: "OrderedDict[Tuple[str, str, str], str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0}
+
+    def _connection(self) -> sqlite3.Connection:
+        # Opened lazily so importing the module never touches the disk
+        if self._conn is None:
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS translations (
+                    src TEXT NOT NULL,
+                    dest TEXT NOT NULL,
+                    text_hash TEXT NOT NULL,
+                    translation TEXT NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (src, dest, text_hash)
+                ) WITHOUT ROWID
+                """
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _remember(self, key: Tuple[str, str, str], translation: str) -> None:
+        self._lru[key] = translation
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_memory_entries:
+            self._lru.popitem(last=False)
+
+    def get(self, src: str, dest: str, text: str, record_miss: bool = True) -> Optional[str]:
+        """Return a stored translation, or None if this text was never translated.
+
+        ``record_miss=False`` leaves a miss out of the stats, for a lookup whose
+        miss is followed by lookups of its parts.
+        """
+        if not text or not text.strip():
+            return None
+        key = (src, dest, _text_hash(text))
+        with self._lock:
+            cached = self._lru.get(key)
+            if cached is not None:
+                self._lru.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                return cached
+            try:
+                row = self._connection().execute(
+                    "SELECT translation FROM translations WHERE src = ? AND dest = ? AND text_hash = ?",
+                    key,
+                ).fetchone()
+            except sqlite3.Error as e:
+                print(f"[TranslationMemory] lookup failed: {e}")
+                row = None
+            if row is None:
+                if record_miss:
+                    self._stats["misses"] += 1
+                return None
+            self._stats["disk_hits"] += 1
+            self._remember(key, row[0])
+            return row[0]
+
+    def put(self, src: str, dest: str, text: str, translation: str) -> None:
+        """Store a translation. Empty or unchanged results are not worth remembering."""
+        if not text or not text.strip() or not translation or translation.strip() == text.strip():
+            return
+        key = (src, dest, _text_hash(text))
+        with self._lock:
+            self._remember(key, translation)
+            try:
+                conn = self._connection()
+                conn.execute(
+                    "INSERT OR REPLACE INTO translations (src, dest, text_hash, translation) VALUES (?, ?, ?, ?)",
+                    (*key, translation),
+                )
+                conn.commit()
+                self._stats["writes"] += 1
+            except sqlite3.Error as e:
+                print(f"[TranslationMemory] store failed: {e}")
+
+    def clear(self) -> None:
+        """Forget every stored translation (e.g. between benchmark samples)."""
+        with self._lock:
+            self._lru.clear()
+            try:
+                conn = self._connection()
+                conn.execute("DELETE FROM translations")
+                conn.commit()
+            except sqlite3.Error as e:
+                print(f"[TranslationMemory] clear failed: {e}")
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            hits = self._stats["memory_hits"] + self._stats["disk_hits"]
+            lookups = hits + self._stats["misses"]
+            return {
+                **self._stats,
+                "hits": hits,
+                "lookups": lookups,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                "memory_entries": len(self._lru),
+            }
+
+
+translation_memory = TranslationMemory(
+    db_path=Path(os.getenv("TRANSLATION_MEMORY_DB") or DEFAULT_DB_PATH),
+    max_memory_entries=int(os.getenv("TRANSLATION_MEMORY_LRU_SIZE", "2048")),
+)
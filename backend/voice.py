@@ -5,16 +5,14 @@ from fastapi.responses import Response
 from typing import Optional
 from twilio.twiml.voice_response import VoiceResponse, Gather
 from twilio.rest import Client
-from .database import (
-    fetch_user_by_phone,
-    fetch_user_by_id,
-    insert_conversation,
-)
+from .database import fetch_user_by_id
+from . import async_database
+from .translation import translate_text_async
+from .conversation_writer import enqueue_conversation
 from langchain_google_genai import GoogleGenerativeAIEmbeddings, ChatGoogleGenerativeAI
 from langchain_community.vectorstores import FAISS
 from langchain_core.runnables import RunnablePassthrough
 from langchain_core.prompts import ChatPromptTemplate
-from deep_translator import GoogleTranslator
 from langchain_huggingface import HuggingFaceEmbeddings
 from langchain_core.output_parsers import StrOutputParser
 from operator import itemgetter
@@ -38,62 +36,6 @@ def _load_state_index_dir(user_state: str) -> str:
     return index_dir
 
 
-def _fallback_translate_via_llm(text: str, src: str, dest: str) -> str:
-    try:
-        src_name = "Hindi" if src.startswith("hi") else ("English" if src.startswith("en") else src)
-        dest_name = "Hindi" if dest.startswith("hi") else ("English" if dest.startswith("en") else dest)
-        model = ChatGoogleGenerativeAI(model="gemini-1.5-flash", temperature=0.0)
-        prompt = (
-            f"Translate the following text from {src_name} to {dest_name}. Only return the translated text.\n\n"
-            f"Text: {text}"
-        )
-        resp = model.invoke(prompt)
-        
-        # Properly extract the translated text from the response
-        if hasattr(resp, 'content'):
-            out = resp.content
-        elif hasattr(resp, 'output_text'):
-            out = resp.output_text
-        elif isinstance(resp, dict):
-            out = resp.get("content") or resp.get("output_text") or ""
-        else:
-            out = str(resp)
-        
-        # Clean up the output - remove any extra formatting
-        if isinstance(out, str):
-            out = out.strip()
-            # Remove any "content = " prefixes that might be present
-            if out.startswith("content = "):
-                out = out[10:].strip()
-            # Remove quotes if present
-            if (out.startswith("'") and out.endswith("'")) or (out.startswith('"') and out.endswith('"')):
-                out = out[1:-1].strip()
-        
-        return (out or text).strip()
-    except Exception as e:
-        print(f"FALLBACK LLM TRANSLATION ERROR: {e}")
-        return text
-
-
-async def translate_text_async(text: str, src: str, dest: str) -> str:
-    """Translate text using deep-translator with LLM fallback."""
-    out = None
-    try:
-        result = GoogleTranslator(source=src, target=dest).translate(text)
-        # deep-translator is synchronous, no need for await
-        out = result
-    except Exception as e:
-        try:
-            print(f"Translation error: {e}")
-        except Exception:
-            pass
-        out = None
-
-    if not out or out.strip() == text.strip():
-        out = _fallback_translate_via_llm(text, src, dest)
-    return out.strip()
-
-
 def _is_hindi_language(value: str) -> bool:
     l = (value or "").strip().lower()
     return l in {"hindi", "hi", "हिन्दी", "हिंदी"} or ("हिं" in l) or ("हिन्द" in l)
@@ -233,7 +175,7 @@ _
         if (answer.startswith("'") and answer.endswith("'")) or (answer.startswith('"') and answer.endswith('"')):
             answer = answer[1:-1].strip()
     
-    insert_conversation(user_id, question, answer, conversation_id=None)
+    enqueue_conversation(user_id, question, answer, conversation_id=None)
     return answer or "I could not find an answer from the documents."
 
 
@@ -252,7 +194,7 @@ async def call_initiate(req: CallInitiateRequest):
     - TWILIO_PHONE_NUMBER (E.164 format)
     - PUBLIC_BASE_URL (publicly reachable base URL exposing this FastAPI app)
     """
-    user = fetch_user_by_id(req.user_id)
+    user = await async_database.fetch_user_by_id(req.user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
@@ -337,7 +279,7 @@ async def voice_incoming(
     user = None
     probe_numbers = [n for n in [caller, from_num, to_num] if n]
     for num in probe_numbers:
-        user = fetch_user_by_phone(num)
+        user = await async_database.fetch_user_by_phone(num)
         if user:
             break
     is_hindi = _is_hindi_language(user.get("language")) if user else False
@@ -379,7 +321,7 @@ async def voice_process(
     # Determine actual user by trying all provided numbers
     user = None
     for num in [n for n in [caller, from_num, to_num] if n]:
-        user = fetch_user_by_phone(num)
+        user = await async_database.fetch_user_by_phone(num)
         if user:
             break
     is_hindi = _is_hindi_language(user.get("language")) if user else False
@@ -419,20 +361,17 @@ async def voice_process(
                 pass
             processed_question = speech
 
-    # Store pending answer and kick off background thread
-    import threading
+    # Store pending answer and kick off a background task on the running loop
     _pending_answers[call_sid] = {"status": "processing", "answer": None, "user": user, "is_hindi": is_hindi}
 
-    def _run_rag_background(sid, uid, question, hindi):
+    async def _run_rag_background(sid, uid, question, hindi):
         try:
-            ans = _answer_with_rag(user_id=uid, question=question)
+            # The RAG chain is blocking; run it in a worker thread
+            ans = await asyncio.to_thread(_answer_with_rag, user_id=uid, question=question)
             # If Hindi, translate answer
             if hindi:
                 try:
-                    import asyncio as _aio
-                    loop = _aio.new_event_loop()
-                    ans = loop.run_until_complete(translate_text_async(ans, "en", "hi"))
-                    loop.close()
+                    ans = await translate_text_async(ans, "en", "hi")
                 except Exception as te:
                     print(f"[VOICE] Hindi translation failed in background: {te}")
             _pending_answers[sid] = {"status": "done", "answer": ans, "is_hindi": hindi}
@@ -442,9 +381,10 @@ async def voice_process(
             err_msg = "हम आपके प्रश्न का उत्तर नहीं दे सके। कृपया बाद में प्रयास करें।" if hindi else "We faced a technical issue. Please try again later."
             _pending_answers[sid] = {"status": "done", "answer": err_msg, "is_hindi": hindi}
 
-    t = threading.Thread(target=_run_rag_background, args=(call_sid, user["id"], processed_question, is_hindi))
-    t.daemon = True
-    t.start()
+    task = asyncio.create_task(_run_rag_background(call_sid, user["id"], processed_question, is_hindi))
+    # Keep a reference so the task is not garbage-collected before it finishes
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
 
     # Respond immediately — don't block Twilio
     if is_hindi:
@@ -458,6 +398,7 @@ async def voice_process(
 
 # In-memory store for pending answers (keyed by CallSid)
 _pending_answers: dict = {}
+_background_tasks: set = set()
 
 
 @router.post("/voice/answer")
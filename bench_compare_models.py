@@ -0,0 +1,64 @@
+"""
+compare_models wall-time benchmark: sequential fits vs the process pool.
+
+Fits the full model suite (ARIMA, GARCH, EGARCH, GJR-GARCH, EMD+ARIMA,
+ARIMA-GARCH) on a year of synthetic daily prices, first one model after
+another in this process ("0 workers", the legacy behaviour), then in pools of
+increasing size. Each pool is started and warmed before timing, so the numbers
+are per-request wall time once the app is running. The speedup is capped by
+the slowest single fit and by the number of cores.
+
+Usage:
+    python bench_compare_models.py [--crop wheat] [--workers 0,1,2,4,6] [--repeat 3] [--days 30]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.getcwd())
+
+from backend import market_price_prediction as mpp  # noqa: E402
+
+
+def timed(prices, days: int, workers: int, repeat: int):
+    runs, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = mpp.compare_models(prices, days, workers=workers)
+        runs.append(time.perf_counter() - start)
+    return statistics.median(runs), result
+
+
+def main():
+    cores = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--crop", default="wheat")
+    parser.add_argument("--workers", default=",".join(str(w) for w in sorted({0, 1, 2, 4, min(6, cores)})),
+                        help="comma-separated pool sizes; 0 = sequential in-process")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--days", type=int, default=mpp.FORECAST_MAX_DAYS)
+    args = parser.parse_args()
+
+    prices = mpp._generate_synthetic_prices(args.crop)["price_inr"]
+    print(f"{len(prices)} daily prices for {args.crop}, {args.days}-day horizon, {cores} cores, "
+          f"median of {args.repeat} runs")
+    print(f"{'workers':>7}  {'wall s':>7}  {'speedup':>7}  ranked models")
+
+    # Imports the model libraries in this process so the sequential baseline is not charged for them
+    mpp._warm_fit_worker()
+    baseline = None
+    for workers in (int(w) for w in args.workers.split(",")):
+        if workers > 0:
+            mpp.compare_models(prices, args.days, workers=workers)  # start and warm the pool
+        seconds, result = timed(prices, args.days, workers, args.repeat)
+        baseline = baseline or seconds
+        models = ", ".join(m["name"] for m in result["models"])
+        print(f"{workers:>7}  {seconds:>7.2f}  {baseline / seconds:>6.2f}x  {models}")
+    mpp.shutdown_fit_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Micro-benchmark for the SQLite access layer in backend/database.py.
+
+"before" mimics the legacy layer: a fresh sqlite3.connect per call with the
+default rollback journal. "after" uses the pooled thread-local connections
+(WAL, synchronous=NORMAL, tuned cache/mmap, reused prepared statements).
+Both run against a throw-away database, single-threaded and with concurrent
+writer threads, and report conversation inserts/sec and user-lookup reads/sec.
+
+Usage:
+    python bench_database.py [--ops 2000] [--threads 4]
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+# Point the data layer at a scratch database before it is imported
+_TMP_DIR = tempfile.mkdtemp(prefix="agri_bench_db_")
+os.environ["AGRI_DB_PATH"] = os.path.join(_TMP_DIR, "bench.db")
+# Measure SQLite itself, not the in-process user cache
+os.environ["USER_CACHE_TTL_SECONDS"] = "0"
+os.environ["USER_CACHE_NEGATIVE_TTL_SECONDS"] = "0"
+sys.path.append(os.getcwd())
+
+from backend import database  # noqa: E402
+from backend.migrations import migrate  # noqa: E402
+
+USER_ID = "bench-user"
+
+
+def legacy_connection():
+    connection = sqlite3.connect(str(database.DB_PATH))
+    connection.row_factory = sqlite3.Row
+    connection.execute("PRAGMA foreign_keys = ON")
+    return connection
+
+
+def legacy_insert(i: int) -> None:
+    connection = legacy_connection()
+    try:
+        connection.execute(
+            "INSERT INTO conversations (user_id, question, answer, timestamp, conversation_id, title) VALUES (?, ?, ?, ?, ?, ?)",
+            (USER_ID, f"question {i}", "answer", datetime.now(), "bench-conv", None),
+        )
+        connection.commit()
+    finally:
+        connection.close()
+
+
+def legacy_read(i: int) -> None:
+    connection = legacy_connection()
+    try:
+        connection.execute(
+            "SELECT id, name, district, crop, state, email, phone_number, language FROM users WHERE id = ?",
+            (USER_ID,),
+        ).fetchone()
+    finally:
+        connection.close()
+
+
+def pooled_insert(i: int) -> None:
+    database.insert_conversation(USER_ID, f"question {i}", "answer", "bench-conv")
+
+
+def pooled_read(i: int) -> None:
+    database.fetch_user_by_id(USER_ID)
+
+
+def set_journal_mode(mode: str) -> None:
+    # journal_mode is persistent per database file, so switch it explicitly per run
+    database.close_db_connections()
+    connection = sqlite3.connect(str(database.DB_PATH))
+    connection.execute(f"PRAGMA journal_mode = {mode}")
+    connection.close()
+
+
+def run(func, ops: int, threads: int) -> float:
+    errors = []
+
+    def worker(n: int):
+        for i in range(n):
+            try:
+                func(i)
+            except sqlite3.OperationalError as e:
+                errors.append(str(e))
+
+    per_thread = ops // threads
+    workers = [threading.Thread(target=worker, args=(per_thread,)) for _ in range(threads)]
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - start
+    if errors:
+        print(f"    {len(errors)} operations failed (e.g. {errors[0]})")
+    return (per_thread * threads) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ops", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+
+    migrate()
+    database.insert_user("Bench User", user_id=USER_ID)
+
+    rows = []
+    for threads in sorted({1, args.threads}):
+        results = {}
+        for mode, func in [("DELETE", legacy_insert), ("WAL", pooled_insert), ("DELETE", legacy_read), ("WAL", pooled_read)]:
+            set_journal_mode(mode)
+            results[func] = run(func, args.ops, threads)
+        rows.append((threads, results[legacy_insert], results[pooled_insert], results[legacy_read], results[pooled_read]))
+
+    print(f"\n{'threads':<9}{'inserts/s before':>18}{'after':>10}{'reads/s before':>16}{'after':>10}")
+    for threads, bi, ai, br, ar in rows:
+        print(f"{threads:<9}{bi:>18,.0f}{ai:>10,.0f}{br:>16,.0f}{ar:>10,.0f}")
+    print(f"\nScratch database: {database.DB_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Latency benchmark: translate-then-answer vs single-pass Hindi answers for /ask.
+
+Legacy path:  hi->en question translation, English generation, en->hi answer translation.
+Single pass:  hi->en question translation (for retrieval only), generation directly in Hindi.
+
+The translation memory is cleared before every sample so both paths pay the
+translation service; the app databases point at a throw-away directory.
+
+Usage:
+    python bench_hindi_answer.py [--state punjab] [--runs 3]
+
+Requires GOOGLE_API_KEY and a FAISS index under backend/faiss_indexes/.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from dotenv import load_dotenv
+
+# Keep benchmark traffic out of the real documents.db and translation memory
+_TMP_DIR = tempfile.mkdtemp(prefix="agri_bench_hindi_")
+os.environ["AGRI_DB_PATH"] = os.path.join(_TMP_DIR, "bench.db")
+os.environ["TRANSLATION_MEMORY_DB"] = os.path.join(_TMP_DIR, "translation_memory.db")
+sys.path.append(os.getcwd())
+load_dotenv()
+
+from langchain_community.vectorstores import FAISS
+from langchain_huggingface import HuggingFaceEmbeddings
+
+from backend.routes import (
+    _answer_language_instruction,
+    _extract_text_from_response,
+    get_conversational_chain,
+)
+from backend.translation import translate_text
+from backend.translation_memory import translation_memory
+
+QUESTIONS = [
+    "गेहूं की बुवाई का सबसे अच्छा समय क्या है?",
+    "धान में पीला रतुआ रोग से कैसे बचें?",
+    "सरसों की फसल में कितनी सिंचाई करनी चाहिए?",
+]
+
+
+def load_vector_store(state: str):
+    index_dir = os.path.join("backend", "faiss_indexes", f"{state}_faiss_index")
+    embeddings = HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2")
+    return FAISS.load_local(index_dir, embeddings, allow_dangerous_deserialization=True)
+
+
+def retrieve_context(vector_store, query: str) -> str:
+    docs = vector_store.similarity_search(query, k=4)
+    return "\n\n".join(d.page_content for d in docs)
+
+
+def legacy_path(vector_store, question: str) -> float:
+    translation_memory.clear()
+    start = time.perf_counter()
+    english_question = translate_text(question, "hi", "en")
+    context = retrieve_context(vector_store, english_question)
+    response = get_conversational_chain().invoke({"context": context, "question": english_question})
+    translate_text(_extract_text_from_response(response), "en", "hi")
+    return time.perf_counter() - start
+
+
+def single_pass_path(vector_store, question: str) -> float:
+    translation_memory.clear()
+    start = time.perf_counter()
+    english_question = translate_text(question, "hi", "en")
+    context = retrieve_context(vector_store, english_question)
+    chain = get_conversational_chain(_answer_language_instruction("hindi"))
+    _extract_text_from_response(chain.invoke({"context": context, "question": question}))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--state", default="punjab")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    vector_store = load_vector_store(args.state)
+    # Warm up embeddings and HTTP connections so the first sample is not an outlier
+    retrieve_context(vector_store, "wheat sowing")
+
+    results = {"legacy (translate answer)": [], "single pass (answer in Hindi)": []}
+    for _ in range(args.runs):
+        for question in QUESTIONS:
+            results["legacy (translate answer)"].append(legacy_path(vector_store, question))
+            results["single pass (answer in Hindi)"].append(single_pass_path(vector_store, question))
+
+    print(f"\n{'mode':<32}{'median s':>10}{'mean s':>10}{'max s':>10}")
+    for mode, samples in results.items():
+        print(f"{mode:<32}{statistics.median(samples):>10.2f}{statistics.mean(samples):>10.2f}{max(samples):>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Micro-benchmark for /ask routing: legacy keyword scans vs the compiled lexicon.
+
+"legacy" reproduces the old routes.ask logic: one any(kw in question.lower())
+scan per intent list, followed by extract_crop_from_question's per-crop scans.
+"lexicon" is backend.lexicon.analyze, which finds crop and intent in a single
+regex pass. Both run over a mixed Hindi/English question set; the script
+reports microseconds per question and lists questions where the two disagree
+(expected only where the old substring scan was wrong, e.g. "price" -> rice).
+
+Usage:
+    python bench_lexicon.py [--repeat 2000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.getcwd())
+
+from backend.lexicon import analyze  # noqa: E402
+
+QUESTIONS = [
+    "What is the price of wheat in my mandi today?",
+    "गेहूं का भाव क्या है?",
+    "Will price of onion go up next week? price forecast please",
+    "धान की पैदावार कैसे बढ़ाएं?",
+    "How much yield can I expect from cotton this season?",
+    "Best fertilizer schedule for sugarcane ratoon crop",
+    "सरसों में कितना पानी देना चाहिए?",
+    "bajra ka bhav kya hoga agle hafte",
+    "What is the market rate for tomato and potato?",
+    "How do I control stem borer in maize?",
+    "ragi sowing time in Karnataka",
+    "What is the price today?",
+    "मक्का की फसल में कीट नियंत्रण",
+    "Tell me about soil testing",
+    "Expected yield of soybean per acre",
+    "प्याज का दाम क्या होगा?",
+]
+
+LEGACY_FORECAST = ['price prediction', 'price forecast', 'future price', 'price tomorrow',
+                   'price next week', 'predict price', 'price trend', 'will price',
+                   'price hoga', 'bhav kya hoga', 'दाम क्या होगा', 'भाव भविष्य']
+LEGACY_PRICE = ['price', 'market', 'rate', 'mandi', 'cost', 'भाव', 'दाम', 'मंडी', 'कीमत']
+LEGACY_YIELD = ['yield', 'harvest', 'production', 'output', 'predict yield',
+                'expected yield', 'crop yield', 'how much', 'kitna paida',
+                'उपज', 'पैदावार', 'फसल उत्पादन', 'कितना होगा']
+LEGACY_CROPS = {
+    'wheat': ['wheat', 'गेहूं'],
+    'rice': ['rice', 'paddy', 'धान', 'चावल'],
+    'sugarcane': ['sugarcane', 'गन्ना'],
+    'cotton': ['cotton', 'कपास'],
+    'maize': ['maize', 'corn', 'मक्का'],
+    'soybean': ['soybean', 'सोयाबीन'],
+    'mustard': ['mustard', 'सरसों'],
+    'onion': ['onion', 'प्याज'],
+    'potato': ['potato', 'आलू'],
+    'tomato': ['tomato', 'टमाटर'],
+    'ragi': ['ragi', 'finger millet', 'mandua', 'nachni', 'नाचनी', 'मंडुआ'],
+    'millet': ['millet', 'millets', 'bajra', 'pearl millet', 'बाजरा'],
+}
+
+
+def legacy(question: str):
+    if any(kw in question.lower() for kw in LEGACY_FORECAST):
+        intent = "price_forecast"
+    elif any(kw in question.lower() for kw in LEGACY_PRICE):
+        intent = "price"
+    elif any(kw in question.lower() for kw in LEGACY_YIELD):
+        intent = "yield"
+    else:
+        intent = None
+    question_lower = question.lower()
+    crop = ""
+    for name, keywords in LEGACY_CROPS.items():
+        if any(keyword in question_lower for keyword in keywords):
+            crop = name
+            break
+    return crop, intent
+
+
+def timed(func, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for question in QUESTIONS:
+            func(question)
+    return (time.perf_counter() - start) / (repeat * len(QUESTIONS)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    results = {"legacy (keyword scans)": timed(legacy, args.repeat), "lexicon (one regex pass)": timed(analyze, args.repeat)}
+    print(f"\n{'mode':<28}{'us/question':>12}")
+    for mode, micros in results.items():
+        print(f"{mode:<28}{micros:>12.2f}")
+
+    disagreements = [(q, legacy(q), analyze(q)) for q in QUESTIONS if legacy(q) != analyze(q)]
+    print(f"\n{len(disagreements)} of {len(QUESTIONS)} questions routed differently:")
+    for question, old, new in disagreements:
+        print(f"  {question!r}: legacy={old} lexicon={new}")
+
+
+if __name__ == "__main__":
+    main()
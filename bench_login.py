@@ -0,0 +1,96 @@
+"""
+Login throughput benchmark: bcrypt inline on the event loop vs the bounded executor.
+
+"inline" mimics the legacy handler, which called bcrypt.checkpw directly inside
+the async login route. "executor" awaits passwords.verify_password, which
+runs on the PASSWORD_HASH_WORKERS thread pool. Each mode fires N concurrent
+logins while a ticker coroutine measures how late the event loop wakes it up;
+that lag is what every other request on the worker would have waited.
+
+Usage:
+    python bench_login.py [--rounds 12] [--concurrency 32] [--logins 128]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.getcwd())
+
+from backend import database, passwords  # noqa: E402
+
+PASSWORD = "bench-password"
+TICK_SECONDS = 0.005
+
+
+async def _ticker(stop: asyncio.Event, lags: list) -> None:
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + TICK_SECONDS
+        await asyncio.sleep(TICK_SECONDS)
+        lags.append(max(0.0, loop.time() - expected))
+
+
+async def _inline_login(password_hash: str) -> bool:
+    return database.verify_password(PASSWORD, password_hash)
+
+
+async def _executor_login(password_hash: str) -> bool:
+    return await passwords.verify_password(PASSWORD, password_hash)
+
+
+async def run_mode(login, password_hash: str, logins: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            assert await login(password_hash)
+
+    stop = asyncio.Event()
+    lags: list = []
+    ticker = asyncio.create_task(_ticker(stop, lags))
+    await asyncio.sleep(TICK_SECONDS * 2)
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await ticker
+    return elapsed, lags
+
+
+def _p95(samples: list) -> float:
+    if len(samples) < 2:
+        return samples[0] if samples else 0.0
+    return statistics.quantiles(samples, n=20)[-1]
+
+
+async def main_async(args) -> None:
+    database.BCRYPT_ROUNDS = args.rounds
+    password_hash = database.hash_password(PASSWORD)
+    print(f"bcrypt rounds={args.rounds} workers={passwords.PASSWORD_HASH_WORKERS} "
+          f"logins={args.logins} concurrency={args.concurrency}")
+
+    modes = {"inline (legacy)": _inline_login, "executor": _executor_login}
+    print(f"\n{'mode':<20}{'logins/s':>10}{'loop lag p95 ms':>18}{'loop lag max ms':>18}")
+    try:
+        for name, login in modes.items():
+            elapsed, lags = await run_mode(login, password_hash, args.logins, args.concurrency)
+            print(f"{name:<20}{args.logins / elapsed:>10.1f}{_p95(lags) * 1000:>18.1f}{max(lags, default=0.0) * 1000:>18.1f}")
+    finally:
+        passwords.shutdown_password_pool()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=database.BCRYPT_ROUNDS)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--logins", type=int, default=128)
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
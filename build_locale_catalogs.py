@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Build-time generator for backend/locales/<lang>.json catalogs.
+
+backend/locales/en.json is the source of truth for templated content (welcome
+messages, crop-activity calendars, weather-alert templates, price comparison
+text). This script fills in every key that is missing from a target-language
+catalog by machine-translating the English value once, offline, so the API
+never has to call a translation service for templated responses.
+
+Placeholders such as {district} or {max_temp:.1f} are shielded from the
+translator and restored afterwards; entries whose placeholders do not survive
+are left in English and reported for manual review.
+
+Usage:
+    python build_locale_catalogs.py                 # fill missing keys for all targets
+    python build_locale_catalogs.py --lang hi       # a single language
+    python build_locale_catalogs.py --force         # re-translate every key
+    python build_locale_catalogs.py --check         # exit 1 if any catalog is incomplete
+"""
+
+import argparse
+import json
+import re
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+LOCALES_DIR = Path(__file__).resolve().parent / "backend" / "locales"
+SOURCE_LANGUAGE = "en"
+DEFAULT_TARGETS = ["hi"]
+
+PLACEHOLDER = re.compile(r"\{[a-zA-Z_][a-zA-Z0-9_]*(?::[^}]*)?\}")
+
+
+def load_catalog(lang: str) -> Dict[str, Any]:
+    path = LOCALES_DIR / f"{lang}.json"
+    if not path.is_file():
+        return {}
+    with path.open(encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_catalog(lang: str, catalog: Dict[str, Any]) -> None:
+    path = LOCALES_DIR / f"{lang}.json"
+    with path.open("w", encoding="utf-8") as f:
+        json.dump(catalog, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+
+
+def missing_keys(source: Any, target: Any, prefix: str = "") -> List[str]:
+    """Dotted keys present in source but absent (or of a different shape) in target."""
+    if isinstance(source, dict):
+        keys = []
+        for k, v in source.items():
+            sub = target.get(k) if isinstance(target, dict) else None
+            keys.extend(missing_keys(v, sub, f"{prefix}{k}."))
+        return keys
+    if isinstance(source, list):
+        ok = isinstance(target, list) and len(target) == len(source)
+        return [] if ok else [prefix.rstrip(".")]
+    return [] if isinstance(target, str) else [prefix.rstrip(".")]
+
+
+def translate_string(translator, text: str) -> str:
+    placeholders = PLACEHOLDER.findall(text)
+    shielded = text
+    for i, p in enumerate(placeholders):
+        shielded = shielded.replace(p, f"[{i}]", 1)
+    translated = translator.translate(shielded) or shielded
+    for i, p in enumerate(placeholders):
+        if f"[{i}]" not in translated:
+            raise ValueError(f"placeholder {p} lost in translation")
+        translated = translated.replace(f"[{i}]", p, 1)
+    return translated.strip()
+
+
+def build(source: Dict[str, Any], target: Dict[str, Any], translator, force: bool, prefix: str = "") -> int:
+    """Translate missing leaves of ``source`` into ``target`` in place; return the number translated."""
+    count = 0
+    for key, value in source.items():
+        dotted = f"{prefix}{key}"
+        if isinstance(value, dict):
+            if not isinstance(target.get(key), dict):
+                target[key] = {}
+            count += build(value, target[key], translator, force, dotted + ".")
+            continue
+        if not force and not missing_keys(value, target.get(key)):
+            continue
+        try:
+            if isinstance(value, list):
+                target[key] = [translate_string(translator, item) for item in value]
+            else:
+                target[key] = translate_string(translator, value)
+            count += 1
+        except Exception as e:
+            print(f"  ! {dotted}: {e}; keeping English text for review")
+            target[key] = value
+    return count
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lang", action="append", help="target language code (repeatable)")
+    parser.add_argument("--force", action="store_true", help="re-translate keys that already exist")
+    parser.add_argument("--check", action="store_true", help="only report missing keys")
+    args = parser.parse_args()
+
+    source = load_catalog(SOURCE_LANGUAGE)
+    targets = args.lang or DEFAULT_TARGETS
+
+    if args.check:
+        incomplete = False
+        for lang in targets:
+            missing = missing_keys(source, load_catalog(lang))
+            for key in missing:
+                print(f"{lang}: missing {key}")
+            incomplete = incomplete or bool(missing)
+        return 1 if incomplete else 0
+
+    from deep_translator import GoogleTranslator
+
+    for lang in targets:
+        catalog = load_catalog(lang)
+        translator = GoogleTranslator(source=SOURCE_LANGUAGE, target=lang)
+        count = build(source, catalog, translator, args.force)
+        save_catalog(lang, catalog)
+        print(f"{lang}: translated {count} entries -> {LOCALES_DIR / (lang + '.json')}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
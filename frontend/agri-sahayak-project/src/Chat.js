@@ -451,10 +451,17 @@ const Chat = ({
       (async () => {
         try {
           if (!userId) return;
-          const res = await axios.get(
-            `http://127.0.0.1:8000/conversations/${conversationId}`
-          );
-          const history = res?.data?.conversation ?? [];
+          // History is paginated; follow the cursor until the whole conversation is loaded
+          const history = [];
+          let cursor = null;
+          do {
+            const res = await axios.get(
+              `http://127.0.0.1:8000/conversations/${conversationId}`,
+              { params: { limit: 200, ...(cursor ? { cursor } : {}) } }
+            );
+            history.push(...(res?.data?.conversation ?? []));
+            cursor = res?.data?.next_cursor || null;
+          } while (cursor);
           setConversation(history);
           setError(null);
           setSuggestions([]);
@@ -14,6 +14,8 @@ import {
   MoreHorizontal,
 } from "lucide-react";
 
+const PAGE_SIZE = 50;
+
 const ConversationSidebar = ({
   userId,
   selectedConversationId,
@@ -27,6 +29,7 @@ const ConversationSidebar = ({
   const [allConversations, setAllConversations] = useState([]);
   const [query, setQuery] = useState("");
   const [isLoading, setIsLoading] = useState(false);
+  const [nextCursor, setNextCursor] = useState(null);
   const [error, setError] = useState(null);
   const [userProfile, setUserProfile] = useState(null);
   const [showUserMenu, setShowUserMenu] = useState(false);
@@ -54,11 +57,13 @@ const ConversationSidebar = ({
       setError(null);
       try {
         const res = await axios.get(
-          `http://127.0.0.1:8000/users/${userId}/conversations`
+          `http://127.0.0.1:8000/users/${userId}/conversations`,
+          { params: { limit: PAGE_SIZE } }
         );
         const list = res?.data?.conversations || [];
         setAllConversations(list);
         setConversations(list);
+        setNextCursor(res?.data?.next_cursor || null);
       } catch (e) {
         setError(t("failedToLoadConversations"));
       } finally {
@@ -70,6 +75,24 @@ const ConversationSidebar = ({
     fetchConversations();
   }, [userId, t]);
 
+  const loadMoreConversations = async () => {
+    if (!nextCursor || isLoading) return;
+    setIsLoading(true);
+    try {
+      const res = await axios.get(
+        `http://127.0.0.1:8000/users/${userId}/conversations`,
+        { params: { limit: PAGE_SIZE, cursor: nextCursor } }
+      );
+      const list = res?.data?.conversations || [];
+      setAllConversations((prev) => [...prev, ...list]);
+      setNextCursor(res?.data?.next_cursor || null);
+    } catch (e) {
+      setError(t("failedToLoadConversations"));
+    } finally {
+      setIsLoading(false);
+    }
+  };
+
   // Debounced search
   useEffect(() => {
     const id = setTimeout(() => {
@@ -432,6 +455,16 @@ const ConversationSidebar = ({
           );
         })}
 
+        {nextCursor && !query && (
+          <button
+            onClick={loadMoreConversations}
+            disabled={isLoading}
+            className="w-full py-2 text-sm text-blue-600 dark:text-blue-400 hover:underline disabled:opacity-50"
+          >
+            {t("loadMoreConversations")}
+          </button>
+        )}
+
         {conversations.length === 0 && !isLoading && (
           <div className="flex flex-col items-center justify-center py-12 text-center">
             <MessageSquare
@@ -3,7 +3,7 @@ import axios from 'axios';
 import { useTranslation } from 'react-i18next';
 import ReactAnimatedWeather from 'react-animated-weather';
 import { LineChart, Line, ResponsiveContainer, XAxis, YAxis, Tooltip } from 'recharts';
-import { Sun, Cloud, CloudRain, CloudSnow, ArrowUp, ArrowDown, Calendar, AlertTriangle, Info, CheckCircle, Thermometer, Droplets, TrendingUp, Bell, CloudLightning, Wind, Sunrise, Sunset, Trash2, Edit, PlusCircle, PhoneCall } from 'lucide-react';
+import { Sun, Cloud, CloudRain, CloudSnow, ArrowUp, ArrowDown, Minus, Calendar, AlertTriangle, Info, CheckCircle, Thermometer, Droplets, TrendingUp, Bell, CloudLightning, Wind, Sunrise, Sunset, Trash2, Edit, PlusCircle, PhoneCall } from 'lucide-react';
 import PriceTrendChart from './PriceTrendChart';
 // Chat is rendered by App.js at the bottom in embedded mode; avoid duplicating it here.
 
@@ -444,6 +444,7 @@ export const MarketTicker = ({ userId, onOpenChart }) => {
       <div className="space-y-3" >
         {data.nearby_prices.map((item, index) => {
           const isUp = item.trend === 'up';
+          const isDown = item.trend === 'down';
           return (
             <div
               key={index}
@@ -454,8 +455,8 @@ export const MarketTicker = ({ userId, onOpenChart }) => {
                 {item.is_user_district && <p className="text-sm text-agri-success dark:text-agri-success font-medium flex items-center gap-1">📍 {isHi ? 'आपका जिला' : t('YourDistrict')}</p>}
               </div>
               <div className="flex items-center gap-3">
-                <div className={`p-2 rounded-full ${isUp ? 'bg-agri-success/20' : 'bg-red-500/20'}`}>
-                  {isUp ? <ArrowUp size={16} className="text-agri-success" /> : <ArrowDown size={16} className="text-red-500" />}
+                <div className={`p-2 rounded-full ${isUp ? 'bg-agri-success/20' : isDown ? 'bg-red-500/20' : 'bg-gray-500/20'}`}>
+                  {isUp ? <ArrowUp size={16} className="text-agri-success" /> : isDown ? <ArrowDown size={16} className="text-red-500" /> : <Minus size={16} className="text-gray-500" />}
                 </div>
                 <div className="text-right">
                   <p className="font-bold text-lg text-agri-primary dark:text-white">₹{String(item.price).replace(/\B(?=(\d{3})+(?!\d))/g, ',')}</p>
@@ -498,7 +499,7 @@ export const CropActivityCalendar = ({ userId }) => {
       try {
         setLoading(true);
         const monthName = new Date().toLocaleDateString('en-US', { month: 'long' }).toLowerCase();
-        const res = await axios.get(`http://127.0.0.1:8000/crop_activities?crop=${crop}&month=${monthName}`);
+        const res = await axios.get(`http://127.0.0.1:8000/crop_activities?crop=${crop}&month=${monthName}&language=${i18n.language}`);
         console.debug('[CropActivityCalendar] crop, month, response', crop, monthName, res.data);
         setActivities(res.data.activities || []);
       } catch (err) {
@@ -508,7 +509,7 @@ export const CropActivityCalendar = ({ userId }) => {
       }
     })();
 
-  }, [crop]);
+  }, [crop, i18n.language]);
 
   const isHi = i18n.language === 'hi';
   const tTitle = t('cropActivityCalendar');
@@ -37,6 +37,7 @@ i18n
           conversations: 'Conversations',
           noConversationsYet: 'No conversations yet',
           failedToLoadConversations: 'Failed to load conversations',
+          loadMoreConversations: 'Load more',
           askYourQuestion: 'Ask your question...',
           addNoteAboutImage: 'Add a note about the image or press Send...',
           send: 'Send',
@@ -149,6 +150,7 @@ i18n
           conversations: 'बातचीत',
           noConversationsYet: 'अभी तक कोई बातचीत नहीं',
           failedToLoadConversations: 'बातचीत लोड करने में विफल',
+          loadMoreConversations: 'और लोड करें',
           askYourQuestion: 'अपना प्रश्न पूछें...',
           addNoteAboutImage: 'छवि के बारे में नोट जोड़ें या भेजने के लिए दबाएं...',
           send: 'भेजें',
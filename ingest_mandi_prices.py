@@ -0,0 +1,51 @@
+"""
+Load the data.gov.in mandi price dataset into the local price store.
+
+Pages through the whole resource in bulk and upserts every record into the
+`mandi_prices` table of documents.db, which the price endpoints query before
+falling back to live API calls. After the first run only new arrival dates
+are fetched, so it is cheap to schedule nightly, e.g. from cron:
+
+    30 2 * * *  cd /path/to/Agri-Sahayak && python ingest_mandi_prices.py
+
+Usage:
+    python ingest_mandi_prices.py [--full]
+
+Districts seen for the first time are geocoded into the district gazetteer
+used for nearest-mandi lookups (needs OPENWEATHER_API_KEY; skipped otherwise).
+
+Requires DATA_GOV_API_KEY.
+"""
+
+import argparse
+import os
+import sys
+
+from dotenv import load_dotenv
+
+sys.path.append(os.getcwd())
+load_dotenv()
+
+from backend.mandi_geo import geocode_missing_districts
+from backend.mandi_ingest import ingest
+from backend.migrations import migrate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--full", action="store_true", help="page through the whole resource, not just new dates")
+    args = parser.parse_args()
+
+    migrate()
+    report = ingest(full=args.full)
+    print(f"Fetched {report['records']} records in {report['pages']} pages over {report['passes']} passes")
+    print(f"  stored:       {report['stored']}")
+    print(f"  skipped:      {report['skipped']} (missing date, district, commodity or market)")
+    print(f"  latest date:  {report['latest_before']} -> {report['latest_after']}")
+
+    geo = geocode_missing_districts()
+    print(f"Gazetteer: {geo['geocoded']} districts geocoded, {geo['failed']} not found, {geo['errors']} errors")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Precompute market price forecasts into documents.db.
+
+Fits the ARIMA/GARCH model comparison for every crop with a price feed and
+every crop in the profile of a recently active user, and stores the results in
+the `price_forecasts` table that /predict_price, /model_comparison and
+price-forecast questions read. Crops whose price series has no new observation
+since the stored fit are only re-checked, not refitted.
+
+The app runs the same job in a background thread (FORECAST_SCHEDULER=1); use
+this script instead when the scheduler is disabled, e.g. from cron:
+
+    0 */6 * * *  cd /path/to/Agri-Sahayak && python precompute_forecasts.py
+
+Usage:
+    python precompute_forecasts.py [--crop wheat --crop rice] [--force]
+"""
+
+import argparse
+import os
+import sys
+
+from dotenv import load_dotenv
+
+sys.path.append(os.getcwd())
+load_dotenv()
+
+from backend.forecast_scheduler import forecast_crops, precompute
+from backend.migrations import migrate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--crop", action="append", help="only this crop (repeatable; default: all)")
+    parser.add_argument("--force", action="store_true", help="refit even if the stored forecast is current")
+    args = parser.parse_args()
+
+    migrate()
+    crops = [c.strip().lower() for c in args.crop] if args.crop else forecast_crops()
+    print(f"Precomputing forecasts for {len(crops)} crops: {', '.join(crops)}")
+    report = precompute(crops, force=args.force)
+    for outcome in ("fitted", "unchanged", "fresh", "no_data", "failed"):
+        print(f"  {outcome + ':':<11} {', '.join(report[outcome]) or '-'}")
+    print(f"Done in {report['seconds']}s")
+
+
+if __name__ == "__main__":
+    main()